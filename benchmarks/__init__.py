@@ -0,0 +1 @@
+"""Micro-benchmarks for the Smart Travel Planner (run with python -m benchmarks.<name>)."""
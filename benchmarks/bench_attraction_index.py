@@ -0,0 +1,105 @@
+"""
+Offline attraction index benchmark.
+
+Reports the index build time, the time to memory-map a saved index, and the
+p50/p99 latency of search_local_attractions over every PLACES destination
+with each preference tag. Then runs root_agent offline (FakeLlm + fake
+google_search, see benchmarks/offline.py) and reports the plan p50 with
+AttractionAgent searching the web against the same requests answered from
+the index. Caches are off so every request runs its stages.
+
+Usage (from the project root):
+    python -m benchmarks.bench_attraction_index [--queries 20] [--requests 10]
+        [--llm-latency 0.2] [--search-latency 0.1]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from benchmarks.offline import FakeLlm, offline_backends, set_search_latency
+from travel_planner import config
+from travel_planner.agent import root_agent
+from travel_planner.tools.attraction_index import AttractionIndex, load_corpus, search_local_attractions
+from travel_planner.tools.rate_tables import DATA_DIR
+from travel_planner.tools.travel_intent import PLACES, PREFERENCE_KEYWORDS
+
+_TRIP = "Plan a 4 day trip to Goa from Delhi with budget 60000, love beaches and nightlife"
+
+
+async def _p50_ms(runner: InMemoryRunner, requests: int) -> float:
+    elapsed = []
+    for _ in range(requests):
+        user_id = f"user-{uuid.uuid4().hex[:8]}"
+        session = await runner.session_service.create_session(app_name="bench_attraction_index", user_id=user_id)
+        message = types.Content(role="user", parts=[types.Part(text=_TRIP)])
+        started = time.perf_counter()
+        async for _ in runner.run_async(user_id=user_id, session_id=session.id, new_message=message):
+            pass
+        elapsed.append((time.perf_counter() - started) * 1000)
+    return statistics.median(elapsed)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    corpus = os.path.join(DATA_DIR, "attractions.csv")
+    docs = load_corpus(corpus)
+    started = time.perf_counter()
+    AttractionIndex.build(docs)
+    build_ms = (time.perf_counter() - started) * 1000
+    with tempfile.TemporaryDirectory() as index_dir:
+        AttractionIndex.load_or_build(corpus, index_dir)
+        started = time.perf_counter()
+        AttractionIndex.load_or_build(corpus, index_dir)
+        load_ms = (time.perf_counter() - started) * 1000
+
+    queries = [(place, [tag]) for place in PLACES for tag in PREFERENCE_KEYWORDS] + [(place, []) for place in PLACES]
+    search_local_attractions("Goa")  # load the configured index outside the timings
+    latencies = []
+    for _ in range(args.queries):
+        for place, preferences in queries:
+            started = time.perf_counter()
+            search_local_attractions(place, preferences)
+            latencies.append((time.perf_counter() - started) * 1e6)
+    latencies.sort()
+    found = sum(search_local_attractions(place)["found"] for place in PLACES)
+
+    print(f"corpus: {len(docs)} attractions, {found}/{len(PLACES)} PLACES destinations covered")
+    print(f"  build {build_ms:.1f} ms, memory-mapped load {load_ms:.2f} ms")
+    print(
+        f"  {len(latencies)} queries: p50 {latencies[len(latencies) // 2]:.0f} us, "
+        f"p99 {latencies[int(len(latencies) * 0.99)]:.0f} us"
+    )
+
+    config.PLAN_CACHE_ENABLED = False
+    config.ATTRACTION_CACHE_ENABLED = False
+    set_search_latency(args.search_latency)
+    runner = InMemoryRunner(agent=root_agent, app_name="bench_attraction_index")
+    with offline_backends(root_agent, FakeLlm(latency=args.llm_latency)):
+        config.ATTRACTION_INDEX_ENABLED = False
+        searched = await _p50_ms(runner, args.requests)
+        config.ATTRACTION_INDEX_ENABLED = True
+        indexed = await _p50_ms(runner, args.requests)
+
+    print(f"{args.requests} plans, llm latency {args.llm_latency}s, search latency {args.search_latency}s")
+    print(f"  {'':<28}{'p50 ms':>10}")
+    print(f"  {'AttractionAgent + search':<28}{searched:>10.1f}")
+    print(f"  {'offline index':<28}{indexed:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=20, help="passes over the query set")
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per model call")
+    parser.add_argument("--search-latency", type=float, default=0.1, help="seconds per google_search call")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Cold start benchmark.
+
+Runs each scenario in a fresh interpreter, with the pipelines built at import
+(LAZY_AGENT_BUILD=false, the previous behaviour) and on first use (the
+default), and reports the median time from interpreter start to the end of
+the scenario and the peak resident memory:
+
+- intent parser: import travel_planner.tools.travel_intent
+- root agent ready: import root_agent and build the runner
+- first greeting: ... and answer "hi"
+- first plan: ... and answer a complete request offline (FakeLlm with no
+  latency + fake google_search, see benchmarks/offline.py; caches off)
+
+Usage (from the project root):
+    python -m benchmarks.bench_cold_start [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PRELUDE = """
+import time
+_started = time.perf_counter()
+"""
+
+_RUN = """
+import asyncio
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from travel_planner.agent import root_agent
+runner = InMemoryRunner(agent=root_agent, app_name="bench_cold_start")
+
+async def answer(text):
+    session = await runner.session_service.create_session(app_name="bench_cold_start", user_id="user")
+    message = types.Content(role="user", parts=[types.Part(text=text)])
+    async for _ in runner.run_async(user_id="user", session_id=session.id, new_message=message):
+        pass
+"""
+
+_SCENARIOS = {
+    "intent parser": "import travel_planner.tools.travel_intent",
+    "root agent ready": _RUN,
+    "first greeting": _RUN + 'asyncio.run(answer("hi"))',
+    "first plan": _RUN
+    + """
+from benchmarks.offline import FakeLlm, offline_backends
+with offline_backends(root_agent, FakeLlm(latency=0)):
+    asyncio.run(answer("Plan a 3 day trip to Goa from Mumbai with budget 60000"))
+""",
+}
+
+_REPORT = """
+import json, resource
+print(json.dumps({"ms": (time.perf_counter() - _started) * 1000, "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def _run(code: str, lazy: bool) -> dict[str, float]:
+    env = {
+        **os.environ,
+        "LAZY_AGENT_BUILD": "true" if lazy else "false",
+        "PLAN_CACHE_ENABLED": "false",
+        "ATTRACTION_CACHE_ENABLED": "false",
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", _PRELUDE + code + _REPORT], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per scenario and mode")
+    args = parser.parse_args()
+
+    print(f"median of {args.runs} fresh interpreters (peak RSS in MB)")
+    print(f"  {'':<20}{'eager ms':>10}{'lazy ms':>10}{'eager MB':>10}{'lazy MB':>10}")
+    for label, code in _SCENARIOS.items():
+        row = {}
+        for lazy in (False, True):
+            runs = [_run(code, lazy) for _ in range(args.runs)]
+            row[lazy] = (statistics.median(r["ms"] for r in runs), statistics.median(r["rss_mb"] for r in runs))
+        print(f"  {label:<20}{row[False][0]:>10.0f}{row[True][0]:>10.0f}{row[False][1]:>10.1f}{row[True][1]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
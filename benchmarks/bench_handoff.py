@@ -0,0 +1,109 @@
+"""
+Structured hand-off benchmark.
+
+Runs the planning pipeline offline (FakeLlm + fake google_search, see
+benchmarks/offline.py) once with STRUCTURED_HANDOFF=false and once with
+STRUCTURED_HANDOFF=true, each in its own interpreter since the agents read the
+flag at import, and compares per-stage input tokens (from the pipeline
+metrics) and the simulated model time spent on them.
+
+Usage (from the project root):
+    python -m benchmarks.bench_handoff [--requests 20] [--latency-per-1k 0.05]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import uuid
+
+_MESSAGES = (
+    "Plan a 4 day trip to Goa from Mumbai with budget 60000",
+    "Plan a 5 day trip to Kerala from Delhi with budget 90000",
+    "Plan a 3 day trip to Jaipur from Bangalore with budget 40000",
+    "Plan a 6 day trip to Manali from Delhi with budget 75000",
+)
+
+
+async def _measure(requests: int, latency_per_1k: float) -> dict:
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    from benchmarks.offline import FakeLlm, offline_backends, set_search_latency
+    from travel_planner import config
+    from travel_planner.agent import root_agent
+    from travel_planner.metrics import get_metrics
+
+    config.PLAN_CACHE_ENABLED = False
+    config.ATTRACTION_CACHE_ENABLED = False
+    config.ATTRACTION_INDEX_ENABLED = False
+    config.METRICS_JSONL_PATH = config.METRICS_PROMETHEUS_PATH = ""
+    set_search_latency(0.0)
+    llm = FakeLlm(latency=0.0, latency_per_1k_input_tokens=latency_per_1k)
+    runner = InMemoryRunner(agent=root_agent, app_name="bench_handoff")
+    get_metrics().reset()
+
+    stages: dict[str, dict[str, float]] = {}
+    with offline_backends(root_agent, llm):
+        for i in range(requests):
+            user_id = f"user-{uuid.uuid4().hex[:8]}"
+            session = await runner.session_service.create_session(app_name="bench_handoff", user_id=user_id)
+            message = types.Content(role="user", parts=[types.Part(text=_MESSAGES[i % len(_MESSAGES)])])
+            async for _ in runner.run_async(user_id=user_id, session_id=session.id, new_message=message):
+                pass
+            session = await runner.session_service.get_session(
+                app_name="bench_handoff", user_id=user_id, session_id=session.id
+            )
+            for stage, stats in (session.state.get("request_metrics") or {}).get("stages", {}).items():
+                totals = stages.setdefault(stage, {"input_tokens": 0, "model_calls": 0, "wall_ms": 0.0})
+                totals["input_tokens"] += stats.get("input_tokens", 0)
+                totals["model_calls"] += stats.get("model_calls", 0)
+                totals["wall_ms"] += stats.get("wall_ms", 0.0)
+    return {stage: {k: v / requests for k, v in totals.items()} for stage, totals in stages.items()}
+
+
+def _run_mode(structured: bool, args: argparse.Namespace) -> dict:
+    env = dict(os.environ, STRUCTURED_HANDOFF="true" if structured else "false")
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_handoff", "--child", *_forward(args)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _forward(args: argparse.Namespace) -> list[str]:
+    return ["--requests", str(args.requests), "--latency-per-1k", str(args.latency_per_1k)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument(
+        "--latency-per-1k", type=float, default=0.05, help="simulated model seconds per 1k prompt tokens"
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_measure(args.requests, args.latency_per_1k))))
+        return
+
+    free_text, structured = _run_mode(False, args), _run_mode(True, args)
+    print(f"per request, averaged over {args.requests} requests (free text -> structured):")
+    print(f"  {'stage':<22}{'input tokens':>24}{'stage wall ms':>24}")
+    for stage in free_text:
+        before, after = free_text[stage], structured.get(stage, {})
+        tokens = f"{before['input_tokens']:.0f} -> {after.get('input_tokens', 0):.0f}"
+        wall = f"{before['wall_ms']:.1f} -> {after.get('wall_ms', 0):.1f}"
+        print(f"  {stage:<22}{tokens:>24}{wall:>24}")
+    total_before = sum(s["input_tokens"] for s in free_text.values())
+    total_after = sum(s["input_tokens"] for s in structured.values())
+    print(f"total input tokens: {total_before:.0f} -> {total_after:.0f} ({1 - total_after / total_before:.0%} fewer)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Intent classifier throughput benchmark.
+
+Builds a corpus from the test_Cases inputs plus synthetic variations in the same
+style, checks the expected intents from test_Cases (single messages and
+multi-turn conversations with slots carried over), and reports messages/second
+for per-message get_travel_intent calls and for the classify_many batch API.
+
+Usage (from the project root):
+    python -m benchmarks.bench_intent [--messages 50000] [--repeat 3]
+"""
+import argparse
+import itertools
+import random
+import re
+import time
+from pathlib import Path
+
+from travel_planner.tools.travel_intent import classify_many, get_travel_intent, has_slot_values
+
+TEST_CASES = Path(__file__).resolve().parent.parent / "test_Cases"
+
+_DESTINATIONS = ("Goa", "Kerala", "Jaipur", "Manali", "Paris", "Bali", "New York", "Ladakh")
+_TEMPLATES = (
+    "Plan a {days} day trip to {dest} with budget {budget}",
+    "{dest} trip",
+    "{days} nights in {dest} under {k}k, prefer beaches and nightlife",
+    "I want to go to {dest} from Delhi for {days} days, ₹{budget:,} budget",
+    "Trip to {dest} with budget {budget}",
+    "{dest} from 20 dec to {end} dec, {lakh} lakh, family with kids",
+    "hi",
+    "Hey travel planner",
+    "ok thanks",
+)
+
+
+def load_test_cases(path: Path = TEST_CASES) -> list[tuple[str, str]]:
+    """(input, expected intent) pairs from the test_Cases file."""
+    text = path.read_text(encoding="utf-8")
+    return re.findall(r'Input: "(.*?)"\s*\nExpected Intent: (\w+)', text)
+
+
+def load_conversation_cases(path: Path = TEST_CASES) -> list[tuple[list[str], list[str]]]:
+    """(turns, expected intent per turn) for the multi-turn cases in test_Cases."""
+    text = path.read_text(encoding="utf-8")
+    return [
+        (re.findall(r'"(.*?)"', turns), [intent.strip() for intent in intents.split("|")])
+        for turns, intents in re.findall(r"Conversation: (.*)\s*\nExpected Intents: (.*)", text)
+    ]
+
+
+def conversation_intents(turns: list[str]) -> list[str]:
+    """Intent per turn with slots carried between turns, as the router does."""
+    intents, trip_slots = [], None
+    for message in turns:
+        result = get_travel_intent(message, previous_slots=trip_slots)
+        if has_slot_values(result["slots"]):
+            trip_slots = result["slots"]
+        intents.append(result["intent"])
+    return intents
+
+
+def synthetic_corpus(size: int, seed: int = 7) -> list[str]:
+    """Transcript-like messages: test_Cases inputs plus templated variations."""
+    rng = random.Random(seed)
+    base = [message for message, _ in load_test_cases()]
+    messages = []
+    for template in itertools.cycle(_TEMPLATES):
+        if len(messages) >= size:
+            break
+        days = rng.randint(2, 10)
+        messages.append(
+            template.format(
+                days=days,
+                dest=rng.choice(_DESTINATIONS),
+                budget=rng.randrange(5_000, 200_000, 500),
+                k=rng.randint(10, 90),
+                end=20 + days,
+                lakh=rng.choice((1, 1.5, 2)),
+            )
+        )
+        if rng.random() < 0.2:
+            messages.append(rng.choice(base))
+    return messages[:size]
+
+
+def _rate(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = fn()
+        best = min(best, time.perf_counter() - started)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = load_test_cases()
+    wrong = [(m, e) for m, e in cases if get_travel_intent(m)["intent"] != e]
+    print(f"test_Cases: {len(cases) - len(wrong)}/{len(cases)} intents as expected")
+    for message, expected in wrong:
+        print(f"  MISMATCH {message!r}: expected {expected}")
+    conversations = load_conversation_cases()
+    wrong_turns = [(t, e) for t, e in conversations if conversation_intents(t) != e]
+    print(f"test_Cases conversations: {len(conversations) - len(wrong_turns)}/{len(conversations)} as expected")
+    for turns, expected in wrong_turns:
+        print(f"  MISMATCH {turns!r}: expected {expected}, got {conversation_intents(turns)}")
+
+    corpus = synthetic_corpus(args.messages)
+    unique = len({m.strip().lower() for m in corpus})
+
+    def loop() -> int:
+        for message in corpus:
+            get_travel_intent(message)
+        return len(corpus)
+
+    def batch() -> int:
+        return len(classify_many(corpus))
+
+    print(f"corpus: {len(corpus)} messages ({unique} unique)")
+    print(f"get_travel_intent loop: {_rate(loop, args.repeat):>12,.0f} msgs/s")
+    print(f"classify_many batch:    {_rate(batch, args.repeat):>12,.0f} msgs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Itinerary optimizer benchmark.
+
+Generates synthetic city datasets (attractions scattered around a few
+neighbourhoods, with mixed visit lengths and opening hours) and, for each size,
+reports optimize_itinerary latency, attractions scheduled, and km travelled
+against the old input-order chunking of the same scheduled attractions.
+
+Usage (from the project root):
+    python -m benchmarks.bench_itinerary [--sizes 20 100 300 600] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from travel_planner.tools.itinerary_optimizer import Attraction, distance_matrix, optimize_itinerary
+
+# (name, latitude, longitude) city centres for the synthetic datasets
+_CITIES = (("Goa", 15.50, 73.83), ("Jaipur", 26.91, 75.79), ("Paris", 48.86, 2.35))
+
+
+def synthetic_city(size: int, center: tuple[float, float], seed: int = 7) -> list[Attraction]:
+    """Attractions clustered around 3-6 neighbourhoods within ~15 km of the centre."""
+    rng = random.Random(seed)
+    hubs = [
+        (center[0] + rng.uniform(-0.12, 0.12), center[1] + rng.uniform(-0.12, 0.12))
+        for _ in range(rng.randint(3, 6))
+    ]
+    attractions = []
+    for i in range(size):
+        lat, lon = rng.choice(hubs)
+        attractions.append(
+            Attraction(
+                name=f"Attraction {i}",
+                latitude=lat + rng.gauss(0, 0.015),
+                longitude=lon + rng.gauss(0, 0.015),
+                visit_minutes=rng.choice((45, 60, 90, 120, 180)),
+                opens=rng.choice((None, None, 10 * 60)),
+                closes=rng.choice((None, None, None, 17 * 60, 18 * 60)),
+            )
+        )
+    return attractions
+
+
+def chunked_km(attractions: list[Attraction], days: int) -> float:
+    """Travel of the old itinerary_generator: input order, ceil(n / days) per day."""
+    if not attractions:
+        return 0.0
+    dist = distance_matrix([a.latitude for a in attractions], [a.longitude for a in attractions])
+    per_day = max(1, (len(attractions) + days - 1) // days)
+    total = 0.0
+    for start in range(0, len(attractions), per_day):
+        idx = np.arange(start, min(start + per_day, len(attractions)))
+        total += float(dist[idx[:-1], idx[1:]].sum())
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 300, 600])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'city':<8}{'size':>6}{'days':>6}{'ms':>10}{'scheduled':>11}{'km':>9}{'chunked km':>12}")
+    for name, lat, lon in _CITIES:
+        for size in args.sizes:
+            attractions = synthetic_city(size, (lat, lon))
+            days = max(2, min(14, size // 6))
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                plan = optimize_itinerary(attractions, days)
+                best = min(best, time.perf_counter() - started)
+            scheduled = {stop["name"] for day in plan["days"] for stop in day}
+            baseline = chunked_km([a for a in attractions if a.name in scheduled], days)
+            print(
+                f"{name:<8}{size:>6}{days:>6}{best * 1000:>10.1f}{len(scheduled):>11}"
+                f"{plan['travel_km']:>9.1f}{baseline:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
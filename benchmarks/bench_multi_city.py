@@ -0,0 +1,85 @@
+"""
+Multi-city planning benchmark.
+
+Runs root_agent offline (FakeLlm + fake google_search, see
+benchmarks/offline.py) on the same trip with 1 to 4 cities and reports the
+wall-clock p50 per city count: one city goes through the single-destination
+pipeline, two or more through MultiCityPipeline, whose per-city attraction
+stages run concurrently. The three-city trip is also run with the multi-city
+pipeline switched off (all cities squeezed into one destination) for
+comparison. Caches are off so every request runs its stages.
+
+Usage (from the project root):
+    python -m benchmarks.bench_multi_city [--requests 10] [--llm-latency 0.2]
+        [--search-latency 0.1]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from benchmarks.offline import FakeLlm, offline_backends, set_search_latency
+from travel_planner import config
+from travel_planner.agent import root_agent
+
+_CITIES = ("Jaipur", "Udaipur", "Delhi", "Agra")
+
+
+def _message(count: int) -> str:
+    cities = _CITIES[:count]
+    listed = cities[0] if count == 1 else ", ".join(cities[:-1]) + f" and {cities[-1]}"
+    return f"Plan a trip to {listed} from Mumbai for 8 days with budget 120000"
+
+
+async def _p50_ms(runner: InMemoryRunner, text: str, requests: int) -> float:
+    elapsed = []
+    for _ in range(requests):
+        user_id = f"user-{uuid.uuid4().hex[:8]}"
+        session = await runner.session_service.create_session(app_name="bench_multi_city", user_id=user_id)
+        message = types.Content(role="user", parts=[types.Part(text=text)])
+        started = time.perf_counter()
+        async for _ in runner.run_async(user_id=user_id, session_id=session.id, new_message=message):
+            pass
+        elapsed.append((time.perf_counter() - started) * 1000)
+    return statistics.median(elapsed)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    config.PLAN_CACHE_ENABLED = False
+    config.ATTRACTION_CACHE_ENABLED = False
+    config.ATTRACTION_INDEX_ENABLED = False
+    set_search_latency(args.search_latency)
+    runner = InMemoryRunner(agent=root_agent, app_name="bench_multi_city")
+    multi_city_pipeline = root_agent.multi_city_pipeline
+
+    with offline_backends(root_agent, FakeLlm(latency=args.llm_latency)):
+        rows = [(count, await _p50_ms(runner, _message(count), args.requests)) for count in range(1, len(_CITIES) + 1)]
+        root_agent.multi_city_pipeline = None
+        try:
+            squeezed = await _p50_ms(runner, _message(3), args.requests)
+        finally:
+            root_agent.multi_city_pipeline = multi_city_pipeline
+
+    print(f"{args.requests} requests per row, llm latency {args.llm_latency}s, search latency {args.search_latency}s")
+    print(f"  {'cities':<34}{'p50 ms':>10}{'vs 1 city':>12}")
+    single = rows[0][1]
+    for count, p50 in rows:
+        label = "1 (single-destination pipeline)" if count == 1 else f"{count} (multi-city fan-out)"
+        print(f"  {label:<34}{p50:>10.1f}{p50 / single:>11.2f}x")
+    print(f"  {'3 (as one destination)':<34}{squeezed:>10.1f}{squeezed / single:>11.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per model call")
+    parser.add_argument("--search-latency", type=float, default=0.1, help="seconds per google_search call")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Batch quoting throughput benchmark.
+
+Builds a what-if sweep (destinations x origins x day counts x budgets), checks
+that batch_trip_quotes matches the scalar hotel_cost_estimator,
+transport_cost_estimator and budget_allocator row for row, and reports
+scenarios/second for a loop over the scalar tools and for the batch API.
+
+Usage (from the project root):
+    python -m benchmarks.bench_quotes [--scenarios 20000] [--repeat 3]
+"""
+import argparse
+import itertools
+import random
+import time
+
+from travel_planner.tools import budget_allocator, hotel_cost_estimator, transport_cost_estimator
+from travel_planner.tools.batch_quotes import batch_trip_quotes
+
+_DESTINATIONS = ("Goa", "Kerala", "Jaipur", "Manali", "Darjeeling", "Paris", "Bali", "Leh", "Atlantis")
+_ORIGINS = ("Mumbai", "Delhi", "Bangalore", "Pune", "Chennai", "Kolkata")
+
+
+def sweep(size: int, seed: int = 7) -> list[tuple[str, str, int, float]]:
+    """(destination, origin, days, budget) scenarios covering every pair, then random fill."""
+    rng = random.Random(seed)
+    scenarios = [
+        (dest, origin, days, float(budget))
+        for dest, origin, days, budget in itertools.product(
+            _DESTINATIONS, _ORIGINS, (3, 5, 7), (20_000, 60_000, 150_000)
+        )
+    ]
+    while len(scenarios) < size:
+        scenarios.append(
+            (
+                rng.choice(_DESTINATIONS),
+                rng.choice(_ORIGINS),
+                rng.randint(1, 14),
+                float(rng.randrange(5_000, 300_000, 500)),
+            )
+        )
+    return scenarios[:size]
+
+
+def scalar_quote(dest: str, origin: str, days: int, budget: float) -> dict:
+    hotel = hotel_cost_estimator(dest, days, budget)
+    transport = transport_cost_estimator(origin, dest)
+    allocation = budget_allocator(budget, hotel["total_estimated_cost"], transport["total_transport_estimate"])
+    return {**hotel, **transport, **allocation}
+
+
+def _check(scenarios: list[tuple[str, str, int, float]]) -> int:
+    """Number of scenarios where batch and scalar results disagree."""
+    dests, origins, days, budgets = map(list, zip(*scenarios))
+    batch = batch_trip_quotes(dests, origins, days, budgets)
+    columns = (
+        "tier",
+        "estimated_per_night",
+        "total_estimated_cost",
+        "flight_estimate_round_trip",
+        "total_transport_estimate",
+        "remaining_budget",
+        "suggested_food",
+        "within_budget",
+    )
+    mismatches = 0
+    for row, scenario in enumerate(scenarios):
+        expected = scalar_quote(*scenario)
+        if any(batch[c][row] != expected[c] for c in columns):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  MISMATCH {scenario}")
+    return mismatches
+
+
+def _rate(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = fn()
+        best = min(best, time.perf_counter() - started)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scenarios = sweep(args.scenarios)
+    mismatches = _check(scenarios[:2_000])
+    print(f"batch vs scalar: {min(len(scenarios), 2_000) - mismatches}/{min(len(scenarios), 2_000)} scenarios match")
+
+    dests, origins, days, budgets = map(list, zip(*scenarios))
+
+    def loop() -> int:
+        for scenario in scenarios:
+            scalar_quote(*scenario)
+        return len(scenarios)
+
+    def batch() -> int:
+        return len(batch_trip_quotes(dests, origins, days, budgets)["tier"])
+
+    print(f"sweep: {len(scenarios)} scenarios")
+    print(f"scalar tools loop:  {_rate(loop, args.repeat):>12,.0f} scenarios/s")
+    print(f"batch_trip_quotes:  {_rate(batch, args.repeat):>12,.0f} scenarios/s")
+
+
+if __name__ == "__main__":
+    main()
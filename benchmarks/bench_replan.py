@@ -0,0 +1,98 @@
+"""
+Incremental re-planning benchmark.
+
+Runs conversations offline (FakeLlm + fake google_search, see
+benchmarks/offline.py): a complete request followed by follow-ups that change
+one detail ("make it 4 days instead", "change budget to 30k", "fly from
+Delhi"). Each run happens in its own interpreter, with INCREMENTAL_REPLANNING
+false and then true, since the pipeline reads the flag at import. Reports
+follow-up latency and model calls per follow-up.
+
+Usage (from the project root):
+    python -m benchmarks.bench_replan [--sessions 5] [--llm-latency 0.2] [--search-latency 0.3]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+_CONVERSATION = (
+    "Plan a 3 day trip to Goa from Mumbai with budget 60000",
+    "make it 4 days instead",
+    "change budget to 30k",
+    "fly from Delhi",
+)
+
+
+async def _measure(args: argparse.Namespace) -> dict:
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    from benchmarks.offline import FakeLlm, offline_backends, set_search_latency
+    from travel_planner import config
+    from travel_planner.agent import root_agent
+
+    config.PLAN_CACHE_ENABLED = False
+    config.ATTRACTION_CACHE_ENABLED = False
+    config.ATTRACTION_INDEX_ENABLED = False
+    set_search_latency(args.search_latency)
+    runner = InMemoryRunner(agent=root_agent, app_name="bench_replan")
+    turns: dict[str, dict[str, float]] = {message: {"ms": 0.0, "model_calls": 0} for message in _CONVERSATION}
+
+    with offline_backends(root_agent, FakeLlm(latency=args.llm_latency)):
+        for _ in range(args.sessions):
+            user_id = f"user-{uuid.uuid4().hex[:8]}"
+            session = await runner.session_service.create_session(app_name="bench_replan", user_id=user_id)
+            for message in _CONVERSATION:
+                started = time.perf_counter()
+                async for event in runner.run_async(
+                    user_id=user_id,
+                    session_id=session.id,
+                    new_message=types.Content(role="user", parts=[types.Part(text=message)]),
+                ):
+                    if event.usage_metadata:
+                        turns[message]["model_calls"] += 1
+                turns[message]["ms"] += (time.perf_counter() - started) * 1000
+    return {message: {k: v / args.sessions for k, v in stats.items()} for message, stats in turns.items()}
+
+
+def _run_mode(incremental: bool, args: argparse.Namespace) -> dict:
+    env = dict(os.environ, INCREMENTAL_REPLANNING="true" if incremental else "false")
+    command = [
+        sys.executable, "-m", "benchmarks.bench_replan", "--child",
+        "--sessions", str(args.sessions),
+        "--llm-latency", str(args.llm_latency),
+        "--search-latency", str(args.search_latency),
+    ]  # fmt: skip
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per fake model call")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="seconds per fake search call")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_measure(args))))
+        return
+
+    full, incremental = _run_mode(False, args), _run_mode(True, args)
+    print(f"per turn, averaged over {args.sessions} sessions (full re-run -> incremental):")
+    print(f"  {'turn':<58}{'latency ms':>22}{'model calls':>16}")
+    for message in _CONVERSATION:
+        before, after = full[message], incremental[message]
+        latency = f"{before['ms']:.0f} -> {after['ms']:.0f}"
+        calls = f"{before['model_calls']:.0f} -> {after['model_calls']:.0f}"
+        print(f"  {message!r:<58}{latency:>22}{calls:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+LLM call scheduler benchmark against a rate-limited fake endpoint.
+
+Runs complete planning requests from the load-test corpus offline (see benchmarks/offline.py) with FakeLlm
+behind a FakeQuota that answers 429 beyond --quota-rps calls per second, in
+three setups: direct calls (no scheduler, no retries), retries only
+(unbounded scheduler), and the full scheduler (token bucket just under the
+quota, bounded concurrency, priorities, retries). Reports completed
+requests, 429s seen by the endpoint, retries and request latency percentiles.
+
+Usage (from the project root):
+    python -m benchmarks.bench_scheduler [--requests 60] [--concurrency 20]
+        [--quota-rps 20] [--llm-latency 0.2]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from benchmarks.load_test import load_corpus
+from benchmarks.offline import FakeLlm, FakeQuota, offline_backends, set_search_latency
+from travel_planner import config
+from travel_planner.agent import root_agent
+from travel_planner.metrics import Histogram, get_metrics
+from travel_planner.scheduler import LlmScheduler, apply_scheduler
+from travel_planner.tools import get_travel_intent
+
+
+async def _run(corpus: list[str], concurrency: int) -> tuple[float, Histogram, int]:
+    runner = InMemoryRunner(agent=root_agent, app_name="bench_scheduler")
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for message in corpus:
+        queue.put_nowait(message)
+    latencies = Histogram(max_samples=len(corpus))
+    failed = 0
+
+    async def worker() -> None:
+        nonlocal failed
+        while not queue.empty():
+            text = queue.get_nowait()
+            user_id = f"user-{uuid.uuid4().hex[:8]}"
+            session = await runner.session_service.create_session(app_name="bench_scheduler", user_id=user_id)
+            started = time.perf_counter()
+            try:
+                async for _ in runner.run_async(
+                    user_id=user_id,
+                    session_id=session.id,
+                    new_message=types.Content(role="user", parts=[types.Part(text=text)]),
+                ):
+                    pass
+                latencies.observe((time.perf_counter() - started) * 1000)
+            except Exception:
+                failed += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, failed
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    config.PLAN_CACHE_ENABLED = False
+    config.ATTRACTION_CACHE_ENABLED = False
+    config.ATTRACTION_INDEX_ENABLED = False
+    config.LLM_RETRY_BASE_SECONDS = args.retry_base
+    set_search_latency(0.05)
+    # Only requests that run the pipeline; greetings never reach the model
+    corpus = [m for m in load_corpus(args.requests * 2) if get_travel_intent(m)["intent"] == "complete"]
+    corpus = corpus[: args.requests]
+    setups = {
+        "direct": None,
+        "retries only": LlmScheduler(max_concurrency=1_000_000, rate=0, burst=1),
+        "scheduler": LlmScheduler(
+            max_concurrency=args.max_concurrency, rate=args.quota_rps * 0.9, burst=max(1.0, args.quota_rps / 4)
+        ),
+    }
+    print(
+        f"{len(corpus)} requests, concurrency {args.concurrency}, endpoint quota {args.quota_rps:g} calls/s, "
+        f"model latency {args.llm_latency:g} s"
+    )
+    for name, scheduler in setups.items():
+        quota = FakeQuota(rps=args.quota_rps)
+        llm = FakeLlm(latency=args.llm_latency, quota=quota)
+        get_metrics().reset()
+        with offline_backends(root_agent, llm):
+            if scheduler is not None:
+                apply_scheduler(root_agent, scheduler)
+            elapsed, latencies, failed = await _run(corpus, args.concurrency)
+        retries = sum(row["value"] for row in get_metrics().summary().get("scheduler_retries_total", []))
+        q = latencies.quantiles()
+        print(
+            f"  {name:<13} ok {latencies.count:>4}  failed {failed:>3}  429s {quota.rejected:>5}  "
+            f"retries {retries:>5.0f}  p50 {q[0.5]:>7.0f}  p95 {q[0.95]:>7.0f}  p99 {q[0.99]:>7.0f} ms  "
+            f"({elapsed:.1f} s)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--quota-rps", type=float, default=20, help="endpoint calls/second before 429")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per fake model call")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="scheduler concurrency limit")
+    parser.add_argument("--retry-base", type=float, default=0.25, help="backoff base seconds")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Attraction selection benchmark.
+
+Generates synthetic candidate lists (entry costs from free to a few thousand
+INR, mixed visit lengths and preference scores) and, for each size, reports
+select_attractions latency and the score it reaches against the greedy
+score-per-rupee pick it replaces, under the same activities budget and days.
+Small instances are also solved by brute force to show how close the grid
+rounding keeps the result to the true optimum.
+
+Usage (from the project root):
+    python -m benchmarks.bench_selection [--sizes 20 100 300 600] [--repeat 5]
+        [--budget 15000] [--days 4]
+"""
+import argparse
+import itertools
+import random
+import time
+from typing import Any
+
+from travel_planner.tools.attraction_selector import candidate_from_dict, select_attractions, sightseeing_minutes
+
+
+def synthetic_candidates(size: int, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Attraction {i}",
+            "entry_cost": rng.choice((0, 0, 50, 200, 500, 1000, 2500, 4000)),
+            "visit_minutes": rng.choice((45, 60, 90, 120, 180, 240)),
+            "score": round(rng.uniform(0.5, 5.0), 2),
+        }
+        for i in range(size)
+    ]
+
+
+def greedy(candidates: list[dict[str, Any]], budget: float, minutes: float) -> float:
+    """Score of taking candidates by score per rupee (free first) while they fit."""
+    parsed = sorted(
+        (candidate_from_dict(c) for c in candidates),
+        key=lambda c: c.score / c.entry_cost if c.entry_cost else float("inf"),
+        reverse=True,
+    )
+    spent = used = total = 0.0
+    for c in parsed:
+        if spent + c.entry_cost <= budget and used + c.visit_minutes <= minutes:
+            spent += c.entry_cost
+            used += c.visit_minutes
+            total += c.score
+    return total
+
+
+def brute_force(candidates: list[dict[str, Any]], budget: float, minutes: float) -> float:
+    parsed = [candidate_from_dict(c) for c in candidates]
+    best = 0.0
+    for size in range(len(parsed) + 1):
+        for subset in itertools.combinations(parsed, size):
+            if sum(c.entry_cost for c in subset) <= budget and sum(c.visit_minutes for c in subset) <= minutes:
+                best = max(best, sum(c.score for c in subset))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 300, 600])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=15000, help="activities budget (INR)")
+    parser.add_argument("--days", type=int, default=4)
+    args = parser.parse_args()
+    minutes = sightseeing_minutes(args.days)
+
+    print(f"activities budget {args.budget:.0f} INR, {args.days} days ({minutes:.0f} visiting minutes)")
+    print(f"  {'candidates':>10}{'solve ms':>10}{'score':>9}{'greedy':>9}{'chosen':>8}")
+    for size in args.sizes:
+        candidates = synthetic_candidates(size)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            result = select_attractions(candidates, args.budget, minutes)
+        elapsed = (time.perf_counter() - started) * 1000 / args.repeat
+        print(
+            f"  {size:>10}{elapsed:>10.2f}{result['total_score']:>9.1f}"
+            f"{greedy(candidates, args.budget, minutes):>9.1f}{len(result['selected']):>8}"
+        )
+
+    ratios = []
+    for seed in range(20):
+        candidates = synthetic_candidates(14, seed=seed)
+        optimum = brute_force(candidates, args.budget / 3, minutes / 3)
+        if optimum:
+            ratios.append(select_attractions(candidates, args.budget / 3, minutes / 3)["total_score"] / optimum)
+    print(f"  14 candidates x 20 seeds vs brute force: worst {min(ratios):.1%}, mean {sum(ratios) / len(ratios):.1%} of optimum")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Model tiering benchmark.
+
+Runs the pipeline offline (FakeLlm + fake google_search, see
+benchmarks/offline.py) twice: once with every agent on the strong stand-in
+model, once with the TIERED_AGENTS on a TieredLlm whose light stand-in is
+faster but emits bad tool arguments at --light-error-rate. Reports per-stage
+wall p50 for both runs and the escalation rate / estimated savings from the
+tiering metrics.
+
+Usage (from the project root):
+    python -m benchmarks.bench_tiering [--requests 40] [--strong-latency 0.25]
+        [--light-latency 0.08] [--light-error-rate 0.1]
+"""
+import argparse
+import asyncio
+import uuid
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from benchmarks.offline import FakeLlm, offline_backends, set_search_latency
+from travel_planner import config
+from travel_planner.agent import root_agent
+from travel_planner.metrics import get_metrics
+from travel_planner.model_tiering import TieredLlm
+from travel_planner.sub_agents import accommodation_agent, attraction_agent, itinerary_agent, transport_agent
+
+_MESSAGES = (
+    "Plan a 4 day trip to Goa from Mumbai with budget 60000",
+    "Plan a 5 day trip to Kerala from Delhi with budget 90000",
+    "Plan a 3 day trip to Jaipur from Bangalore with budget 40000",
+)
+
+
+async def _run(requests: int, concurrency: int) -> dict[str, float]:
+    """Run the requests; returns stage -> p50 wall ms."""
+    runner = InMemoryRunner(agent=root_agent, app_name="bench_tiering")
+    get_metrics().reset()
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(_MESSAGES[i % len(_MESSAGES)])
+
+    async def worker() -> None:
+        while not queue.empty():
+            text = queue.get_nowait()
+            user_id = f"user-{uuid.uuid4().hex[:8]}"
+            session = await runner.session_service.create_session(app_name="bench_tiering", user_id=user_id)
+            message = types.Content(role="user", parts=[types.Part(text=text)])
+            async for _ in runner.run_async(user_id=user_id, session_id=session.id, new_message=message):
+                pass
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {row["labels"]["stage"]: row["p50"] for row in get_metrics().summary().get("stage_duration_ms", [])}
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    config.PLAN_CACHE_ENABLED = False
+    config.ATTRACTION_CACHE_ENABLED = False
+    config.ATTRACTION_INDEX_ENABLED = False
+    set_search_latency(0.05)
+    strong = FakeLlm(model="fake-strong", latency=args.strong_latency)
+    light = FakeLlm(model="fake-light", latency=args.light_latency, bad_args_rate=args.light_error_rate)
+
+    with offline_backends(root_agent, strong):
+        baseline = await _run(args.requests, args.concurrency)
+        for agent in (attraction_agent, accommodation_agent, transport_agent, itinerary_agent):
+            if agent.name in config.TIERED_AGENTS:
+                agent.model = TieredLlm(model=light.model, light=light, strong=strong, stage=agent.name)
+        tiered = await _run(args.requests, args.concurrency)
+        tiering = get_metrics().tiering_summary()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, tiered agents: {', '.join(sorted(config.TIERED_AGENTS))}")
+    print(f"  {'stage':<22}{'strong p50 ms':>16}{'tiered p50 ms':>16}")
+    for stage, p50 in baseline.items():
+        print(f"  {stage:<22}{p50:>16.1f}{tiered.get(stage, 0.0):>16.1f}")
+    for stage, row in sorted(tiering.items()):
+        strong_p50 = "-" if row["strong_p50_ms"] is None else f"{row['strong_p50_ms']:.1f} ms"
+        saved = "-" if row["saved_ms_estimate"] is None else f"{row['saved_ms_estimate'] / 1000:.1f} s"
+        print(
+            f"  {stage}: {row['light_calls']} light / {row['strong_calls']} strong calls, "
+            f"escalation rate {row['escalation_rate']:.1%}, light p50 {row['light_p50_ms']:.1f} ms, "
+            f"strong p50 {strong_p50}, est. model time saved {saved}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--strong-latency", type=float, default=0.25, help="seconds per strong-model call")
+    parser.add_argument("--light-latency", type=float, default=0.08, help="seconds per light-model call")
+    parser.add_argument("--light-error-rate", type=float, default=0.1, help="fraction of light tool calls with bad args")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
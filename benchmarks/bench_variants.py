@@ -0,0 +1,78 @@
+"""
+Plan variants benchmark.
+
+Runs root_agent offline (FakeLlm + fake google_search, see
+benchmarks/offline.py) and reports the wall-clock p50 of: one single plan,
+one tier comparison through TierVariantsPipeline ("cheap vs comfortable vs
+luxury"), and the same three tiers asked as three separate single-plan
+requests, which is what a comparison cost before. Caches are off so every
+request runs its stages.
+
+Usage (from the project root):
+    python -m benchmarks.bench_variants [--requests 10] [--llm-latency 0.2]
+        [--search-latency 0.1]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from benchmarks.offline import FakeLlm, offline_backends, set_search_latency
+from travel_planner import config
+from travel_planner.agent import root_agent
+
+_TRIP = "Plan a 4 day trip to Goa from Delhi with budget 60000"
+_VARIANTS = f"{_TRIP}, cheap vs comfortable vs luxury options"
+_SEPARATE = (f"{_TRIP}, cheap stay", f"{_TRIP}, comfortable stay", f"{_TRIP}, luxury stay")
+
+
+async def _p50_ms(runner: InMemoryRunner, messages: tuple[str, ...], requests: int) -> float:
+    """p50 over requests of the time to answer messages one after another, each in a new session."""
+    elapsed = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        for text in messages:
+            user_id = f"user-{uuid.uuid4().hex[:8]}"
+            session = await runner.session_service.create_session(app_name="bench_variants", user_id=user_id)
+            message = types.Content(role="user", parts=[types.Part(text=text)])
+            async for _ in runner.run_async(user_id=user_id, session_id=session.id, new_message=message):
+                pass
+        elapsed.append((time.perf_counter() - started) * 1000)
+    return statistics.median(elapsed)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    config.PLAN_CACHE_ENABLED = False
+    config.ATTRACTION_CACHE_ENABLED = False
+    config.ATTRACTION_INDEX_ENABLED = False
+    set_search_latency(args.search_latency)
+    runner = InMemoryRunner(agent=root_agent, app_name="bench_variants")
+
+    with offline_backends(root_agent, FakeLlm(latency=args.llm_latency)):
+        rows = [
+            ("single plan", await _p50_ms(runner, (_TRIP,), args.requests)),
+            ("3 tiers, variants pipeline", await _p50_ms(runner, (_VARIANTS,), args.requests)),
+            ("3 tiers, 3 separate requests", await _p50_ms(runner, _SEPARATE, args.requests)),
+        ]
+
+    print(f"{args.requests} requests per row, llm latency {args.llm_latency}s, search latency {args.search_latency}s")
+    print(f"  {'':<32}{'p50 ms':>10}{'vs single':>12}")
+    single = rows[0][1]
+    for label, p50 in rows:
+        print(f"  {label:<32}{p50:>10.1f}{p50 / single:>11.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per model call")
+    parser.add_argument("--search-latency", type=float, default=0.1, help="seconds per google_search call")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Offline load test of the root agent.
+
+Drives root_agent with a corpus (test_Cases inputs plus synthetic complete
+requests) from N concurrent sessions, with FakeLlm and the fake google_search
+standing in for Gemini and Google Search (see benchmarks/offline.py). Reports
+requests/second, request latency percentiles, per-stage latency percentiles
+from the pipeline metrics, and event-loop lag as a saturation signal.
+
+With --cassette, model calls go through a record/replay cassette instead of
+the stand-ins (travel_planner/cassette.py): replay serves recorded Gemini
+responses (search results included) with no network; record/auto call the
+real model for anything not yet recorded.
+
+Usage (from the project root):
+    python -m benchmarks.load_test [--requests 200] [--concurrency 20]
+        [--llm-latency 0.2] [--search-latency 0.3] [--jitter 0.05] [--cache]
+        [--cassette PATH [--cassette-mode replay] [--replay-latency-scale 1.0]]
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from benchmarks.bench_intent import load_test_cases
+from benchmarks.offline import FakeLlm, offline_backends, set_search_latency
+from travel_planner import config
+from travel_planner.agent import root_agent
+from travel_planner.cassette import use_cassette
+from travel_planner.metrics import Histogram, get_metrics
+
+_DESTINATIONS = ("Goa", "Kerala", "Jaipur", "Manali", "Paris", "Bali", "Leh", "Darjeeling")
+_ORIGINS = ("Mumbai", "Delhi", "Bangalore", "Chennai")
+
+
+def load_corpus(size: int, seed: int = 7) -> list[str]:
+    """test_Cases inputs, topped up with complete requests so most turns run the pipeline."""
+    rng = random.Random(seed)
+    messages = [message for message, _ in load_test_cases()]
+    while len(messages) < size:
+        messages.append(
+            f"Plan a {rng.randint(2, 8)} day trip to {rng.choice(_DESTINATIONS)} "
+            f"from {rng.choice(_ORIGINS)} with budget {rng.randrange(20_000, 200_000, 1_000)}"
+        )
+    rng.shuffle(messages)
+    return messages[:size]
+
+
+class LoopLagMonitor:
+    """Samples how late a periodic sleep wakes up; sustained lag means the event loop is saturated."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lag_ms = Histogram(max_samples=100_000)
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag_ms.observe(max(0.0, (loop.time() - expected) * 1000))
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+async def run_load(corpus: list[str], concurrency: int) -> tuple[float, Histogram, int]:
+    """Run every message once across `concurrency` workers; returns (elapsed s, latency ms, errors)."""
+    runner = InMemoryRunner(agent=root_agent, app_name="load_test")
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for message in corpus:
+        queue.put_nowait(message)
+    latencies = Histogram(max_samples=len(corpus))
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            message = queue.get_nowait()
+            user_id = f"user-{uuid.uuid4().hex[:8]}"
+            session = await runner.session_service.create_session(app_name="load_test", user_id=user_id)
+            started = time.perf_counter()
+            try:
+                async for _ in runner.run_async(
+                    user_id=user_id,
+                    session_id=session.id,
+                    new_message=types.Content(role="user", parts=[types.Part(text=message)]),
+                ):
+                    pass
+            except Exception as exc:  # keep the load going; report the count
+                errors += 1
+                print(f"  ERROR {message!r}: {exc}")
+            latencies.observe((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, errors
+
+
+def _fmt(histogram: Histogram) -> str:
+    q = histogram.quantiles()
+    return f"p50 {q[0.5]:>8.1f}  p95 {q[0.95]:>8.1f}  p99 {q[0.99]:>8.1f}  n={histogram.count}"
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    config.PLAN_CACHE_ENABLED = args.cache
+    config.ATTRACTION_CACHE_ENABLED = args.cache
+    config.ATTRACTION_INDEX_ENABLED = args.cache
+    set_search_latency(args.search_latency, args.jitter)
+    llm = FakeLlm(latency=args.llm_latency, jitter=args.jitter)
+    corpus = load_corpus(args.requests)
+    get_metrics().reset()
+
+    if args.cassette:
+        backends = use_cassette(root_agent, args.cassette, args.cassette_mode, args.replay_latency_scale)
+    else:
+        backends = offline_backends(root_agent, llm)
+
+    monitor = LoopLagMonitor()
+    with backends as backend:
+        monitor.start()
+        elapsed, latencies, errors = await run_load(corpus, args.concurrency)
+        await monitor.stop()
+
+    print(f"requests: {len(corpus)} ({errors} errors), concurrency {args.concurrency}, mode {config.PIPELINE_MODE}")
+    if args.cassette:
+        print(f"cassette: {args.cassette} ({args.cassette_mode}), {backend.hits} hits, {backend.misses} misses")
+    print(f"throughput: {len(corpus) / elapsed:,.1f} req/s over {elapsed:.2f} s")
+    print(f"request latency ms:   {_fmt(latencies)}")
+    print("stage latency ms:")
+    for row in get_metrics().summary().get("stage_duration_ms", []):
+        print(f"  {row['labels']['stage']:<22}p50 {row['p50']:>8.1f}  p95 {row['p95']:>8.1f}  p99 {row['p99']:>8.1f}  n={row['count']}")
+    lag = monitor.lag_ms.quantiles()
+    print(f"event-loop lag ms:    p50 {lag[0.5]:>8.1f}  p99 {lag[0.99]:>8.1f}  max {max(monitor.lag_ms.samples, default=0):.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per fake model call")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="seconds per fake search call")
+    parser.add_argument("--jitter", type=float, default=0.05, help="+/- seconds on both latencies")
+    parser.add_argument("--cache", action="store_true", help="keep the plan and attraction caches and the offline attraction index enabled")
+    parser.add_argument("--cassette", help="record/replay model calls through this cassette file")
+    parser.add_argument("--cassette-mode", default="replay", choices=("record", "replay", "auto"))
+    parser.add_argument(
+        "--replay-latency-scale", type=float, default=1.0, help="replayed calls sleep recorded time x this"
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Offline stand-ins for Gemini and google_search.
+
+FakeLlm answers like the real sub-agents would, with injectable latency: it
+calls each of the agent's tools once with arguments taken from the trip details
+in its instruction, then returns a canned summary. fake_google_search replaces
+the built-in (server-side) search with a local function tool. A FakeQuota
+makes FakeLlm behave like a rate-limited endpoint that answers 429. Use
+offline_backends(agent) to swap both into an agent tree for the duration of a
+with-block.
+"""
+import asyncio
+import contextlib
+import random
+import re
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, Iterator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools import FunctionTool
+from google.genai import errors, types
+
+from travel_planner.agent_tree import llm_agents
+
+_DETAIL_RE = {
+    "destination": re.compile(r"- Destination: *([^\n{]+)"),
+    "origin": re.compile(r"- Origin: *([^\n{]+)"),
+    "days": re.compile(r"- Days: *(\d+)"),
+    "budget": re.compile(r"budget: *([\d.]+)", re.IGNORECASE),
+}
+
+SEARCH_LATENCY = 0.3  # seconds, see set_search_latency()
+_search_latency = {"mean": SEARCH_LATENCY, "jitter": 0.0}
+
+
+def set_search_latency(mean: float, jitter: float = 0.0) -> None:
+    """Latency of fake_google_search calls (seconds, uniform +/- jitter)."""
+    _search_latency.update(mean=mean, jitter=jitter)
+
+
+async def google_search(query: str) -> dict[str, Any]:
+    """Search the web (offline stand-in): returns canned results for the query."""
+    await asyncio.sleep(max(0.0, _search_latency["mean"] + random.uniform(-1, 1) * _search_latency["jitter"]))
+    topic = re.sub(r"^(top )?(attractions|things to do)( in)? ", "", query.strip(), flags=re.IGNORECASE) or query
+    return {
+        "query": query,
+        "results": [
+            {"title": f"{topic} highlight {i}", "snippet": f"Popular spot {i} in {topic}."} for i in range(1, 9)
+        ],
+    }
+
+
+fake_google_search = FunctionTool(google_search)
+
+
+def _trip_details(instruction: str) -> dict[str, Any]:
+    details: dict[str, Any] = {"destination": "Goa", "origin": "Mumbai", "days": 3, "budget": 50000.0}
+    for key, pattern in _DETAIL_RE.items():
+        match = pattern.search(instruction)
+        if match and match.group(1).strip():
+            value = match.group(1).strip()
+            details[key] = int(value) if key == "days" else float(value) if key == "budget" else value
+    return details
+
+
+def _tool_args(name: str, trip: dict[str, Any]) -> dict[str, Any]:
+    budget, days = trip["budget"], trip["days"]
+    return {
+        "google_search": {"query": f"top attractions in {trip['destination']}"},
+        "hotel_cost_estimator": {"city": trip["destination"], "days": days, "budget": budget},
+        "transport_cost_estimator": {"origin": trip["origin"], "destination": trip["destination"]},
+        "budget_allocator": {
+            "total_budget": budget,
+            "hotel_cost": round(budget * 0.4),
+            "transport_cost": round(budget * 0.3),
+        },
+        "itinerary_generator": {
+            "destination": trip["destination"],
+            "attractions": [f"{trip['destination']} highlight {i}" for i in range(1, 6)],
+            "days": days,
+        },
+    }.get(name, {})
+
+
+class FakeQuota:
+    """
+    Server-side quota of the fake endpoint: at most rps calls started per
+    rolling second and max_concurrent in flight; calls beyond either get the
+    429 RESOURCE_EXHAUSTED error the Gemini client raises.
+    """
+
+    def __init__(self, rps: float, max_concurrent: int = 0):
+        self.rps = rps
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.accepted = 0
+        self.rejected = 0
+        self._started: deque[float] = deque()
+
+    def admit(self) -> None:
+        now = time.monotonic()
+        while self._started and now - self._started[0] >= 1.0:
+            self._started.popleft()
+        if len(self._started) >= self.rps or (self.max_concurrent and self.in_flight >= self.max_concurrent):
+            self.rejected += 1
+            raise errors.ClientError(
+                429, {"error": {"code": 429, "message": "Resource has been exhausted", "status": "RESOURCE_EXHAUSTED"}}
+            )
+        self._started.append(now)
+        self.in_flight += 1
+        self.accepted += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+
+class FakeLlm(BaseLlm):
+    """
+    Deterministic stand-in model with injectable latency.
+
+    Each call sleeps latency +/- jitter seconds (plus latency_per_1k_input_tokens
+    per thousand prompt tokens, to model prompt processing time), then either
+    requests the next tool the agent has not called yet in this turn or returns
+    a summary of output_words words with a "Top Attractions" list.
+    usage_metadata approximates tokens as chars / 4 of the instruction and the
+    contents' JSON so the token metrics are exercised. With bad_args_rate, that
+    fraction of tool calls carries numbers as text (e.g. budget="60000 INR")
+    or misses an argument, the kind of output model tiering escalates on.
+    With a quota, calls over it fail with 429 like a rate-limited endpoint.
+    """
+
+    model: str = "fake-llm"
+    latency: float = 0.2
+    jitter: float = 0.0
+    output_words: int = 120
+    latency_per_1k_input_tokens: float = 0.0
+    bad_args_rate: float = 0.0
+    quota: Optional[FakeQuota] = None
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.quota is not None:
+            self.quota.admit()
+            try:
+                async for response in self._generate(llm_request):
+                    yield response
+            finally:
+                self.quota.release()
+        else:
+            async for response in self._generate(llm_request):
+                yield response
+
+    async def _generate(self, llm_request: LlmRequest) -> AsyncGenerator[LlmResponse, None]:
+        instruction = str(llm_request.config.system_instruction or "") if llm_request.config else ""
+        prompt_tokens = (
+            sum(len(c.model_dump_json(exclude_none=True)) for c in llm_request.contents) + len(instruction)
+        ) // 4
+        delay = self.latency + random.uniform(-1, 1) * self.jitter
+        await asyncio.sleep(max(0.0, delay + prompt_tokens / 1000 * self.latency_per_1k_input_tokens))
+        trip = _trip_details(instruction)
+        # Tools already called in this turn: function responses after the latest user message
+        turn_start = max(
+            (
+                i
+                for i, content in enumerate(llm_request.contents)
+                if content.role == "user" and any(part.text for part in content.parts or ())
+            ),
+            default=0,
+        )
+        called = {
+            part.function_response.name
+            for content in llm_request.contents[turn_start:]
+            for part in content.parts or ()
+            if part.function_response
+        }
+
+        pending = [name for name in llm_request.tools_dict if name not in called]
+        if pending:
+            args = _tool_args(pending[0], trip)
+            if args and random.random() < self.bad_args_rate:
+                if any(isinstance(v, (int, float)) for v in args.values()):
+                    args = {k: f"{v} INR" if isinstance(v, (int, float)) else v for k, v in args.items()}
+                else:
+                    args = dict(list(args.items())[:-1])  # drop a required argument
+            part = types.Part(function_call=types.FunctionCall(name=pending[0], args=args))
+            output_tokens = 20
+        else:
+            destination = trip["destination"]
+            lines = [f"{i}. {destination} highlight {i} – popular spot" for i in range(1, 9)]
+            words = " ".join("plan" for _ in range(max(0, self.output_words - 6 * len(lines))))
+            text = f"Destination: {destination}\nTop Attractions:\n" + "\n".join(lines) + f"\n{words}"
+            part = types.Part(text=text)
+            output_tokens = self.output_words
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+        )
+
+
+@contextlib.contextmanager
+def offline_backends(agent: BaseAgent, llm: BaseLlm) -> Iterator[BaseAgent]:
+    """
+    Swap every LlmAgent's model for llm and google_search for fake_google_search
+    (building lazy pipelines first); restore on exit.
+    """
+    originals = []
+    for llm_agent in llm_agents(agent):
+        originals.append((llm_agent, llm_agent.model, llm_agent.tools))
+        llm_agent.model = llm
+        llm_agent.tools = [
+            fake_google_search if getattr(tool, "name", None) == "google_search" else tool
+            for tool in llm_agent.tools
+        ]
+    try:
+        yield agent
+    finally:
+        for llm_agent, model, tools in originals:
+            llm_agent.model = model
+            llm_agent.tools = tools
@@ -1,4 +1,18 @@
 """Smart Travel Planner - Multi-Agent System using Google ADK."""
-from . import agent
+import importlib
+
+from travel_planner import config
 
 __all__ = ["agent"]
+
+
+def __getattr__(name: str):
+    # travel_planner.agent (and google.adk with it) is imported on first access,
+    # so importing e.g. travel_planner.tools.travel_intent does not build the root agent
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if not config.LAZY_AGENT_BUILD:
+    from . import agent  # noqa: E402,F401
@@ -1,58 +1,203 @@
 """
 Root Agent (Orchestrator) for the Smart Travel Planner.
-Handles greeting/incomplete requests without sub-agents; triggers pipeline only when
-destination, days/dates, and budget are present.
+Handles greeting/incomplete requests deterministically (no model call); triggers the
+pipeline only when destination, days/dates, and budget are present.
+The pipelines, and the sub-agents and tools they import, are built on the first
+complete request that needs them (see lazy.py) unless LAZY_AGENT_BUILD=false.
 """
+from typing import Callable
+
 # Load env before any Gemini/API usage (config loads dotenv)
 from travel_planner import config  # noqa: F401
 
-from google.adk.agents import LlmAgent, SequentialAgent
-from google.adk.tools import agent_tool
+from google.adk.agents import BaseAgent, SequentialAgent
 
-from travel_planner.sub_agents import (
-    accommodation_agent,
-    attraction_agent,
-    itinerary_agent,
-    transport_agent,
-)
-from travel_planner.tools import get_travel_intent
+from travel_planner.lazy import LazyStage
+from travel_planner.router import TravelPlannerRouter
 
-# Sequential pipeline: Attraction → Accommodation → Transport → Itinerary
-# Invoked only when the user request is complete (has destination, days, budget).
-travel_planner_pipeline = SequentialAgent(
-    name="TravelPlannerPipeline",
-    description="Generates full travel plan: attractions, accommodation, transport, budget allocation, day-by-day itinerary. Call this only when the user has provided destination, number of days (or dates), and budget.",
-    sub_agents=[
-        attraction_agent,
+PIPELINE_DESCRIPTION = "Generates full travel plan: attractions, accommodation, transport, budget allocation, day-by-day itinerary. Runs only when the user has provided destination, number of days (or dates), and budget."
+
+
+def _build_pipeline(mode: str) -> SequentialAgent:
+    """
+    Build the planning pipeline for the given mode.
+
+    "parallel": Attraction → (Accommodation ∥ Transport) → Itinerary.
+        AccommodationAgent and TransportAgent never read each other's output and
+        write separate keys (hotel_estimate, transport_estimate), so they fan out
+        after AttractionAgent and join before ItineraryAgent.
+    "sequential": Attraction → Accommodation → Transport → Itinerary.
+
+    The attraction stage is the cached wrapper around AttractionAgent. With
+    INCREMENTAL_REPLANNING each stage is wrapped in a ReusableStage, so a
+    follow-up turn only re-runs the stages whose inputs changed.
+    """
+    from google.adk.agents import ParallelAgent
+
+    from travel_planner.replanning import ReusableStage
+    from travel_planner.sub_agents import accommodation_agent, attraction_stage, itinerary_agent, transport_agent
+    from travel_planner.timing import publish_stage_timings, start_stage_timer, stop_stage_timer
+
+    attractions, accommodation, transport, itinerary = (
+        attraction_stage,
         accommodation_agent,
         transport_agent,
         itinerary_agent,
-    ],
-)
+    )
+    if config.INCREMENTAL_REPLANNING:
+        attractions = ReusableStage(attraction_stage, "attractions_result")
+        accommodation = ReusableStage(accommodation_agent, "hotel_estimate")
+        transport = ReusableStage(transport_agent, "transport_estimate")
+        itinerary = ReusableStage(itinerary_agent, "final_plan")
+    if mode == "sequential":
+        stages = [attractions, accommodation, transport, itinerary]
+    else:
+        cost_estimation = ParallelAgent(
+            name="CostEstimationStage",
+            description="Runs accommodation and transport estimation concurrently.",
+            sub_agents=[accommodation, transport],
+            before_agent_callback=start_stage_timer,
+            after_agent_callback=stop_stage_timer,
+        )
+        stages = [attractions, cost_estimation, itinerary]
+    return SequentialAgent(
+        name="TravelPlannerPipeline",
+        description=PIPELINE_DESCRIPTION,
+        sub_agents=stages,
+        before_agent_callback=start_stage_timer,
+        after_agent_callback=publish_stage_timings,
+    )
 
-pipeline_tool = agent_tool.AgentTool(agent=travel_planner_pipeline)
 
-# Root agent: intent detection first, then respond or run pipeline
-root_agent = LlmAgent(
-    name="TravelPlannerRootAgent",
-    model=config.GEMINI_MODEL,
-    description="Smart Travel Planner. Handles greetings and incomplete requests; generates full travel plans when destination, dates, and budget are provided.",
-    instruction="""You are the Smart Travel Planner. Follow these rules strictly.
+def _build_multi_city_pipeline() -> SequentialAgent:
+    """
+    MultiCityStage (per-city attractions fanned out concurrently, per-city
+    hotels, inter-city legs, merged budget and itinerary) → MultiCityItineraryAgent.
+    """
+    from travel_planner.multi_city import MultiCityStage
+    from travel_planner.sub_agents import attraction_agent, multi_city_itinerary_agent
+    from travel_planner.timing import publish_stage_timings, start_stage_timer, stop_stage_timer
+
+    return SequentialAgent(
+        name="MultiCityPipeline",
+        description="Generates a multi-city travel plan: days split across the cities, each city planned concurrently, merged into one itinerary and budget.",
+        sub_agents=[
+            MultiCityStage(
+                name="MultiCityStage",
+                description="Plans every city of the trip side by side and merges the results.",
+                attraction_agent=attraction_agent.clone(),
+                before_agent_callback=start_stage_timer,
+                after_agent_callback=stop_stage_timer,
+            ),
+            multi_city_itinerary_agent,
+        ],
+        before_agent_callback=start_stage_timer,
+        after_agent_callback=publish_stage_timings,
+    )
+
+
+def _build_variants_pipeline() -> SequentialAgent:
+    """
+    Attraction stage (its own cached copy, shared by every tier) →
+    TierVariantsStage (per-tier quotes and budget, tier plans written concurrently).
+    """
+    from travel_planner.replanning import ReusableStage
+    from travel_planner.sub_agents import attraction_agent, tier_itinerary_agents
+    from travel_planner.sub_agents.attraction_agent import CachedAttractionAgent
+    from travel_planner.timing import publish_stage_timings, start_stage_timer, stop_stage_timer
+    from travel_planner.variants import TierVariantsStage
 
-**Step 1 – Always call the tool first**
-Call get_travel_intent with the user's latest message (the last thing the user said in this conversation). Use that tool result to decide what to do next.
+    attractions = CachedAttractionAgent(
+        name="AttractionStage",
+        description="Finds top attractions, serving repeated requests from the attraction cache.",
+        agent=attraction_agent.clone(),
+        before_agent_callback=start_stage_timer,
+        after_agent_callback=stop_stage_timer,
+    )
+    if config.INCREMENTAL_REPLANNING:
+        attractions = ReusableStage(attractions, "attractions_result")
+    return SequentialAgent(
+        name="TierVariantsPipeline",
+        description="Generates one trip at several hotel tiers and compares them side by side.",
+        sub_agents=[
+            attractions,
+            TierVariantsStage(
+                name="TierVariantsStage",
+                description="Quotes each requested tier and writes the tier plans concurrently.",
+                tier_agents=tier_itinerary_agents,
+                before_agent_callback=start_stage_timer,
+                after_agent_callback=stop_stage_timer,
+            ),
+        ],
+        before_agent_callback=start_stage_timer,
+        after_agent_callback=publish_stage_timings,
+    )
 
-**Step 2 – Act based on intent**
-- If the tool returns intent "greeting": Respond with exactly the text in greeting_response. Do NOT call any other tool. Be brief and friendly.
-- If the tool returns intent "incomplete": Respond by asking the user for the missing information. Use missing_fields and clarifying_suggestion from the tool result. Do NOT call the travel planning pipeline. Ask one short, polite message.
-- If the tool returns intent "complete": Call the TravelPlannerPipeline tool (the travel planning pipeline) so it can generate the full plan. Do not summarize or reply before calling it; let the pipeline run and then its output will be the response.
 
-**Required fields for "complete"**
-The pipeline may only be run when the user has provided: destination, number of days or travel dates, and budget. If any of these are missing, treat as incomplete and ask for them.
+def _configured(build: Callable[[], BaseAgent]) -> BaseAgent:
+    """
+    build()'s pipeline with the configured model wrappers: calls go through the
+    shared scheduler (rate limit, concurrency, retries), and the cassette wraps
+    outside it so replayed calls are not throttled.
+    """
+    from travel_planner.cassette import apply_configured_cassette
+    from travel_planner.scheduler import apply_configured_scheduler
 
-**Do not**
-- Do not call the pipeline for greetings (e.g. Hi, Hello, Hey, Good evening).
-- Do not call the pipeline when the request is incomplete (e.g. "Plan a trip", "Goa trip" without days and budget).
-- Do not skip calling get_travel_intent; always use it first with the user's message.""",
-    tools=[get_travel_intent, pipeline_tool],
+    pipeline = build()
+    apply_configured_scheduler(pipeline)
+    # LLM_CASSETTE_MODE=record/replay/auto: serve model calls through the cassette
+    apply_configured_cassette(pipeline)
+    _check_wrapped(pipeline)
+    return pipeline
+
+
+def _check_wrapped(pipeline: BaseAgent) -> None:
+    """Raise if an LlmAgent reachable from pipeline kept a model outside the configured wrapper."""
+    from travel_planner.agent_tree import llm_agents
+    from travel_planner.cassette import CassetteLlm
+    from travel_planner.scheduler import ScheduledLlm
+
+    if config.LLM_CASSETTE_MODE:
+        wrapper = CassetteLlm
+    elif config.LLM_SCHEDULER_ENABLED:
+        wrapper = ScheduledLlm
+    else:
+        return
+    unwrapped = [agent.name for agent in llm_agents(pipeline) if not isinstance(agent.model, wrapper)]
+    if unwrapped:
+        raise RuntimeError(f"{pipeline.name}: {', '.join(unwrapped)} not wrapped in {wrapper.__name__}")
+
+
+def _pipeline_stage(name: str, build: Callable[[], BaseAgent]) -> BaseAgent:
+    """The configured pipeline build() returns, built on first run unless LAZY_AGENT_BUILD=false."""
+    if not config.LAZY_AGENT_BUILD:
+        return _configured(build)
+    return LazyStage(
+        name=name,
+        description=f"Builds and runs {name.removeprefix('Lazy')} on first use.",
+        factory=lambda: _configured(build),
+    )
+
+
+# Invoked only when the user request is complete (has destination, days, budget).
+# Per-stage timings of each run are written to state["stage_timings"] (ms).
+travel_planner_pipeline = _pipeline_stage("LazyTravelPlannerPipeline", lambda: _build_pipeline(config.PIPELINE_MODE))
+
+# Complete requests naming several cities ("Jaipur, Udaipur and Delhi")
+multi_city_pipeline = (
+    _pipeline_stage("LazyMultiCityPipeline", _build_multi_city_pipeline) if config.MULTI_CITY_ENABLED else None
+)
+
+# Complete requests comparing hotel tiers ("cheap vs comfortable")
+variants_pipeline = (
+    _pipeline_stage("LazyTierVariantsPipeline", _build_variants_pipeline) if config.PLAN_VARIANTS_ENABLED else None
+)
+
+# Root agent: rule-based intent routing in-process, pipeline only for complete requests
+root_agent = TravelPlannerRouter(
+    name="TravelPlannerRootAgent",
+    description="Smart Travel Planner. Handles greetings and incomplete requests; generates full travel plans when destination, dates, and budget are provided.",
+    pipeline=travel_planner_pipeline,
+    multi_city_pipeline=multi_city_pipeline,
+    variants_pipeline=variants_pipeline,
 )
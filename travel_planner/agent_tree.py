@@ -0,0 +1,60 @@
+"""
+Walks over the agent tree.
+The scheduler, the cassette and the offline benchmarks all swap the model of
+every LlmAgent under an agent. They share these walks, which also follow
+agents held in fields rather than in sub_agents (e.g. a stage's template
+agent) and build LazyStages on the way, so no LlmAgent is missed.
+"""
+from typing import Iterator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+
+from travel_planner.lazy import LazyStage
+
+# Fields that never hold a child agent
+_NOT_CHILDREN = frozenset({"sub_agents", "parent_agent"})
+
+# (parent, index among the parent's children, number of children) per ancestor, root first
+Ancestry = tuple[tuple[BaseAgent, int, int], ...]
+
+
+def child_agents(agent: BaseAgent) -> list[BaseAgent]:
+    """agent's sub_agents, then agents held in its other fields (alone, in a list or in a dict), each once."""
+    children: dict[int, BaseAgent] = {id(a): a for a in agent.sub_agents}
+    for name in type(agent).model_fields:
+        if name in _NOT_CHILDREN:
+            continue
+        value = getattr(agent, name, None)
+        values = value.values() if isinstance(value, dict) else value if isinstance(value, (list, tuple)) else (value,)
+        for item in values:
+            if isinstance(item, BaseAgent):
+                children.setdefault(id(item), item)
+    return list(children.values())
+
+
+def walk_agents(agent: BaseAgent, ancestry: Ancestry = (), seen: Optional[set[int]] = None) -> Iterator[tuple[BaseAgent, Ancestry]]:
+    """Every agent under agent (itself included) with its ancestry, depth first, each once; LazyStages are built."""
+    seen = set() if seen is None else seen
+    if id(agent) in seen:
+        return
+    seen.add(id(agent))
+    if isinstance(agent, LazyStage):
+        agent.build()
+    yield agent, ancestry
+    children = child_agents(agent)
+    for index, child in enumerate(children):
+        yield from walk_agents(child, (*ancestry, (agent, index, len(children))), seen)
+
+
+def llm_agents(agent: BaseAgent) -> Iterator[LlmAgent]:
+    """Every LlmAgent under agent, each once."""
+    for node, _ in walk_agents(agent):
+        if isinstance(node, LlmAgent):
+            yield node
+
+
+def build_lazy_stages(agent: BaseAgent) -> BaseAgent:
+    """Build every LazyStage under agent so tree walks see the whole tree; returns agent."""
+    for _ in walk_agents(agent):
+        pass
+    return agent
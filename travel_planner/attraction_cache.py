@@ -0,0 +1,155 @@
+"""
+Persistent attraction cache for the AttractionAgent stage.
+Stores attraction summaries in SQLite keyed by normalized destination +
+preference tags, with a TTL and size-bounded LRU eviction, so popular requests
+("Goa, beaches") skip the google_search round trip.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from travel_planner import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attractions (
+    cache_key   TEXT PRIMARY KEY,
+    result      TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attractions_last_access ON attractions (last_access);
+"""
+
+
+def make_cache_key(destination: str, preferences: Iterable[str] = ()) -> str:
+    """Normalized key: "goa|adventure,beaches" (case, spacing and tag order ignored)."""
+    dest = " ".join(destination.lower().split())
+    tags = sorted({" ".join(str(p).lower().split()) for p in preferences or () if p})
+    return f"{dest}|{','.join(tags)}"
+
+
+class AttractionCache:
+    """
+    SQLite-backed attraction cache with TTL and LRU eviction.
+
+    Args:
+        path: SQLite file path (":memory:" for a process-local cache).
+        ttl_seconds: Entries older than this are treated as misses and deleted.
+        max_entries: When exceeded, least recently used entries are evicted.
+
+    Counters hits, misses and evictions are kept per instance (see stats()).
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, destination: str, preferences: Iterable[str] = ()) -> Optional[str]:
+        """Cached attraction summary, or None on miss/expiry."""
+        key = make_cache_key(destination, preferences)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM attractions WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM attractions WHERE cache_key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE attractions SET last_access = ? WHERE cache_key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, destination: str, preferences: Iterable[str], result: str) -> None:
+        """Store a summary and evict least recently used entries beyond max_entries."""
+        key = make_cache_key(destination, preferences)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO attractions (cache_key, result, created_at, last_access)"
+                " VALUES (?, ?, ?, ?)",
+                (key, result, now, now),
+            )
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM attractions").fetchone()
+            overflow = size - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM attractions WHERE cache_key IN ("
+                    " SELECT cache_key FROM attractions ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def get_or_search(
+        self,
+        destination: str,
+        preferences: Iterable[str],
+        search: Callable[[str, list[str]], str],
+    ) -> str:
+        """Return the cached summary, or call search(destination, preferences) and cache it."""
+        preferences = list(preferences or ())
+        cached = self.get(destination, preferences)
+        if cached is not None:
+            return cached
+        result = search(destination, preferences)
+        if result:
+            self.put(destination, preferences, result)
+        return result
+
+    def stats(self) -> dict[str, float]:
+        """Hit/miss counters, hit rate and current number of entries."""
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM attractions").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": size,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM attractions")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[AttractionCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_attraction_cache() -> Optional[AttractionCache]:
+    """Process-wide cache built from config on first use (None when disabled)."""
+    global _default_cache
+    if not config.ATTRACTION_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = AttractionCache(
+                config.ATTRACTION_CACHE_PATH,
+                ttl_seconds=config.ATTRACTION_CACHE_TTL_SECONDS,
+                max_entries=config.ATTRACTION_CACHE_MAX_ENTRIES,
+            )
+        return _default_cache
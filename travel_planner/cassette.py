@@ -0,0 +1,237 @@
+"""
+Record/replay cassettes for model calls.
+CassetteLlm wraps an agent's model: in "record" mode every request is sent to
+the real model and its responses (including google_search grounding results,
+which Gemini returns inside the response) are appended to a gzip-compressed
+JSON-lines cassette; in "replay" mode responses are served back from the
+cassette by request hash with no network access; "auto" replays hits and
+records misses.
+"""
+import asyncio
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, AsyncGenerator, Iterator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from travel_planner import config
+from travel_planner.agent_tree import llm_agents
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("record", "replay", "auto")
+
+
+class CassetteMiss(LookupError):
+    """Replay mode got a request that is not in the cassette."""
+
+
+def _strip_ids(value: Any) -> Any:
+    """Drop per-run identifiers (function call ids) so identical requests hash identically."""
+    if isinstance(value, dict):
+        return {k: _strip_ids(v) for k, v in value.items() if k != "id"}
+    if isinstance(value, list):
+        return [_strip_ids(v) for v in value]
+    return value
+
+
+_CONTEXT_AGENT_RE = re.compile(r"^\[([^\]]+)\]")
+
+
+def _context_agent(content: dict[str, Any]) -> Optional[str]:
+    """Author of an ADK "For context: ..." transcript entry from another agent, else None."""
+    parts = content.get("parts") or []
+    if content.get("role") != "user" or len(parts) < 2:
+        return None
+    if not (parts[0].get("text") or "").startswith("For context:"):
+        return None
+    match = _CONTEXT_AGENT_RE.match(parts[1].get("text") or "")
+    return match.group(1) if match else None
+
+
+def _canonical_contents(contents: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Concurrent branches (the ParallelAgent cost stage) show up in later agents'
+    context in completion order, which varies run to run. Each run of
+    consecutive context entries is stably sorted by agent, so the order within
+    one agent is kept but the interleaving no longer affects the key.
+    """
+    result, run = [], []
+    for content in contents:
+        if _context_agent(content) is None:
+            result.extend(sorted(run, key=_context_agent))
+            run = []
+            result.append(content)
+        else:
+            run.append(content)
+    result.extend(sorted(run, key=_context_agent))
+    return result
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """Stable hash of model, system instruction, tools and conversation contents."""
+    cfg = llm_request.config
+    tools = sorted(llm_request.tools_dict)
+    # Built-in tools (e.g. google_search) have no function declaration
+    for tool in (cfg.tools or []) if cfg else []:
+        tools.extend(sorted(k for k in tool.model_dump(exclude_none=True) if k != "function_declarations"))
+    payload = {
+        "model": llm_request.model,
+        "system_instruction": str(cfg.system_instruction or "") if cfg else "",
+        "tools": tools,
+        "contents": _canonical_contents(
+            _strip_ids([c.model_dump(mode="json", exclude_none=True) for c in llm_request.contents])
+        ),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class Cassette:
+    """
+    On-disk store of model interactions: key -> list of calls, each call the
+    list of LlmResponses it yielded plus its duration. Identical requests made
+    several times are replayed in recorded order (the last one repeats).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._calls: dict[str, list[dict[str, Any]]] = {}
+        self._cursor: dict[str, int] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._calls.setdefault(record["key"], []).append(record)
+
+    def __len__(self) -> int:
+        return sum(len(calls) for calls in self._calls.values())
+
+    def lookup(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            calls = self._calls.get(key)
+            if not calls:
+                self.misses += 1
+                return None
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            self.hits += 1
+            return calls[min(index, len(calls) - 1)]
+
+    def record(self, key: str, responses: list[LlmResponse], elapsed_ms: float) -> None:
+        record = {
+            "key": key,
+            "elapsed_ms": round(elapsed_ms, 1),
+            "responses": [r.model_dump(mode="json", exclude_none=True) for r in responses],
+        }
+        with self._lock:
+            self._calls.setdefault(key, []).append(record)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # gzip members can be appended; readers see one continuous stream
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class CassetteLlm(BaseLlm):
+    """
+    Model wrapper that records to / replays from a Cassette.
+
+    latency_scale: in replay, sleep recorded duration x this factor
+    (0 = instant, 1 = as recorded) so replays keep realistic timing if wanted.
+    """
+
+    inner: BaseLlm
+    cassette: Cassette
+    mode: str = "replay"
+    latency_scale: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        key = request_key(llm_request)
+        if self.mode in ("replay", "auto"):
+            call = self.cassette.lookup(key)
+            if call is not None:
+                if self.latency_scale > 0:
+                    await asyncio.sleep(call["elapsed_ms"] / 1000 * self.latency_scale)
+                for response in call["responses"]:
+                    yield LlmResponse.model_validate(response)
+                return
+            if self.mode == "replay":
+                raise CassetteMiss(f"No recorded response for request {key[:12]} in {self.cassette.path}")
+
+        started = time.perf_counter()
+        responses = []
+        async for response in self.inner.generate_content_async(llm_request, stream=stream):
+            responses.append(response)
+            yield response
+        if responses and not any(r.error_code for r in responses):
+            self.cassette.record(key, responses, (time.perf_counter() - started) * 1000)
+
+
+def apply_cassette(agent: BaseAgent, cassette: Cassette, mode: str, latency_scale: float = 0.0) -> list:
+    """
+    Wrap the model of every LlmAgent under agent in a CassetteLlm (lazy stages
+    are built first).
+    Returns [(agent, original_model), ...] for restoring.
+    """
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"Cassette mode must be one of {CASSETTE_MODES}, got {mode!r}")
+    originals = []
+    for llm_agent in llm_agents(agent):
+        inner = llm_agent.canonical_model
+        if isinstance(inner, CassetteLlm):
+            inner = inner.inner
+        originals.append((llm_agent, llm_agent.model))
+        llm_agent.model = CassetteLlm(
+            model=inner.model, inner=inner, cassette=cassette, mode=mode, latency_scale=latency_scale
+        )
+    return originals
+
+
+@contextlib.contextmanager
+def use_cassette(agent: BaseAgent, path: str, mode: str = "replay", latency_scale: float = 0.0) -> Iterator[Cassette]:
+    """Record or replay all model calls under agent for the duration of a with-block."""
+    cassette = Cassette(path)
+    originals = apply_cassette(agent, cassette, mode, latency_scale)
+    try:
+        yield cassette
+    finally:
+        for llm_agent, model in originals:
+            llm_agent.model = model
+
+
+_configured_cassette: Optional[Cassette] = None
+
+
+def apply_configured_cassette(agent: BaseAgent) -> None:
+    """
+    Wrap agent's models per LLM_CASSETTE_MODE / LLM_CASSETTE_PATH (no-op when
+    the mode is unset). Agents wrapped separately (the lazily built pipelines)
+    share one process-wide cassette.
+    """
+    global _configured_cassette
+    if config.LLM_CASSETTE_MODE:
+        if _configured_cassette is None:
+            _configured_cassette = Cassette(config.LLM_CASSETTE_PATH)
+            logger.info(
+                "LLM cassette %s (%s, %d recorded calls)",
+                config.LLM_CASSETTE_PATH,
+                config.LLM_CASSETTE_MODE,
+                len(_configured_cassette),
+            )
+        apply_cassette(agent, _configured_cassette, config.LLM_CASSETTE_MODE)
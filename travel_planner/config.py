@@ -10,5 +10,112 @@ load_dotenv()
 # Gemini model - stable only (no -exp). Use 1.5-flash or 1.5-pro.
 GEMINI_MODEL = "gemini-2.5-flash"
 
+# Per-agent models (each defaults to GEMINI_MODEL)
+ATTRACTION_MODEL = os.getenv("ATTRACTION_MODEL", GEMINI_MODEL)
+ACCOMMODATION_MODEL = os.getenv("ACCOMMODATION_MODEL", GEMINI_MODEL)
+TRANSPORT_MODEL = os.getenv("TRANSPORT_MODEL", GEMINI_MODEL)
+ITINERARY_MODEL = os.getenv("ITINERARY_MODEL", GEMINI_MODEL)
+
+# Model tiering: agents in TIERED_AGENTS (extraction-style stages that only fill
+# tool arguments from parsed slots) try LIGHT_MODEL first and escalate to their
+# own model above only when the light response fails validation (unknown tool,
+# arguments that don't fit the tool's signature, empty answer). "" disables.
+LIGHT_MODEL = os.getenv("LIGHT_MODEL", "gemini-2.5-flash-lite").strip()
+TIERED_AGENTS = frozenset(
+    name.strip() for name in os.getenv("TIERED_AGENTS", "AccommodationAgent,TransportAgent").split(",") if name.strip()
+)
+
 # API key loaded from .env; never hardcode
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+
+# Pipeline mode: "parallel" runs AccommodationAgent and TransportAgent concurrently
+# (both only depend on AttractionAgent); "sequential" keeps the original strict order.
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "parallel").strip().lower()
+
+# Structured hand-off between stages: downstream prompts read compact records
+# (attraction_shortlist, hotel_quote, transport_quote) instead of the previous
+# stages' free-text outputs and transcripts. "false" gives ItineraryAgent the
+# free-text prompt (the three stage outputs pasted in) and lets ItineraryAgent,
+# AccommodationAgent and TransportAgent see the other agents' transcripts again;
+# the prompts keep the parsed trip details and the records are still published.
+STRUCTURED_HANDOFF = os.getenv("STRUCTURED_HANDOFF", "true").strip().lower() in ("1", "true", "yes")
+
+# Incremental re-planning: a follow-up in the same session ("make it 4 days
+# instead") re-runs only the stages whose inputs changed and reuses the rest.
+INCREMENTAL_REPLANNING = os.getenv("INCREMENTAL_REPLANNING", "true").strip().lower() in ("1", "true", "yes")
+
+# Lazy agent construction: the planning pipelines (their LlmAgents and tools)
+# are built on the first complete request instead of at import, so a cold
+# process starts faster and greetings never build them. "false" builds
+# everything when travel_planner is imported, e.g. to pay it before serving.
+LAZY_AGENT_BUILD = os.getenv("LAZY_AGENT_BUILD", "true").strip().lower() in ("1", "true", "yes")
+
+# Multi-city trips ("Jaipur, Udaipur and Delhi in 8 days"): days are split
+# across the cities and each city's attractions are found concurrently, then
+# merged into one itinerary and budget. "false" plans them as one destination.
+MULTI_CITY_ENABLED = os.getenv("MULTI_CITY_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+
+# Plan variants ("cheap vs comfortable", "all tiers"): attractions are found
+# once, then each requested hotel tier is quoted, budgeted and written up
+# concurrently and returned as one side-by-side comparison.
+PLAN_VARIANTS_ENABLED = os.getenv("PLAN_VARIANTS_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+
+# Attraction cache (SQLite) in front of AttractionAgent's google_search.
+# Keyed by destination + preference tags; entries expire after the TTL and the
+# least recently used are evicted beyond the max size.
+ATTRACTION_CACHE_ENABLED = os.getenv("ATTRACTION_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+ATTRACTION_CACHE_PATH = os.getenv("ATTRACTION_CACHE_PATH", os.path.join(".cache", "attractions.sqlite3"))
+ATTRACTION_CACHE_TTL_SECONDS = float(os.getenv("ATTRACTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+ATTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("ATTRACTION_CACHE_MAX_ENTRIES", "5000"))
+
+# Offline attraction index: destinations covered by the bundled corpus
+# (travel_planner/data/attractions.csv, or ATTRACTION_CORPUS_PATH in the same
+# format) are answered from a local BM25 index over preference tags and
+# descriptions before AttractionAgent searches the web. The index is built once
+# per corpus version and memory-mapped from ATTRACTION_INDEX_DIR ("" keeps it
+# in memory only).
+ATTRACTION_INDEX_ENABLED = os.getenv("ATTRACTION_INDEX_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+ATTRACTION_CORPUS_PATH = os.getenv("ATTRACTION_CORPUS_PATH", "")
+ATTRACTION_INDEX_DIR = os.getenv("ATTRACTION_INDEX_DIR", ".cache")
+
+# Whole-plan cache: final plans keyed by destination, days, budget bucket,
+# preferences and origin; identical concurrent requests share one pipeline run.
+# Budgets within PLAN_CACHE_BUDGET_STEP (fraction, 0.1 = 10%) share a bucket.
+PLAN_CACHE_ENABLED = os.getenv("PLAN_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+PLAN_CACHE_TTL_SECONDS = float(os.getenv("PLAN_CACHE_TTL_SECONDS", "3600"))
+PLAN_CACHE_MAX_ENTRIES = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "1000"))
+PLAN_CACHE_BUDGET_STEP = float(os.getenv("PLAN_CACHE_BUDGET_STEP", "0.1"))
+
+# Directory with cities.csv and routes.csv for the cost estimators
+# (defaults to the tables bundled in travel_planner/data).
+RATE_TABLES_DIR = os.getenv("RATE_TABLES_DIR", "")
+
+# Where the precomputed all-pairs route matrix is cached ("" disables the disk cache)
+ROUTE_MATRIX_CACHE_DIR = os.getenv("ROUTE_MATRIX_CACHE_DIR", ".cache")
+
+# Pipeline metrics: per-stage wall time, model tokens and tool calls/durations,
+# aggregated into p50/p95/p99. Set a path to export after every pipeline run
+# (JSON lines: one record per request; Prometheus: text exposition, rewritten).
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+METRICS_JSONL_PATH = os.getenv("METRICS_JSONL_PATH", "")
+METRICS_PROMETHEUS_PATH = os.getenv("METRICS_PROMETHEUS_PATH", "")
+METRICS_MAX_SAMPLES = int(os.getenv("METRICS_MAX_SAMPLES", "10000"))
+
+# Model call scheduler shared by all agents: at most LLM_MAX_CONCURRENCY calls in
+# flight, started at up to LLM_RATE_PER_SECOND (token bucket holding LLM_RATE_BURST;
+# 0 = no rate limit). 429/503 responses are retried up to LLM_MAX_RETRIES times
+# with full-jitter exponential backoff (base LLM_RETRY_BASE_SECONDS, capped at
+# LLM_RETRY_MAX_SECONDS).
+LLM_SCHEDULER_ENABLED = os.getenv("LLM_SCHEDULER_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_RATE_PER_SECOND = float(os.getenv("LLM_RATE_PER_SECOND", "10"))
+LLM_RATE_BURST = float(os.getenv("LLM_RATE_BURST", "20"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "1.0"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "30"))
+
+# Record/replay of model calls: "record" saves every model response to the
+# cassette, "replay" serves them back by request hash (no network), "auto"
+# replays hits and records misses; "" (default) calls the model normally.
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "").strip().lower()
+LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", os.path.join(".cache", "cassettes", "llm.jsonl.gz"))
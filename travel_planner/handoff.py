@@ -0,0 +1,143 @@
+"""
+Structured hand-off records between pipeline stages.
+Each stage publishes a compact, schema'd record into session state next to its
+free-text output: hotel_quote and transport_quote from the cost tools' results
+(after_tool_callback), attraction_shortlist from the attraction summary.
+Downstream prompts read only the fields they need from these records instead
+of re-extracting numbers and names from prose. Multi-city trips publish one
+CityStop per city and a TripLeg per journey between them instead.
+"""
+import re
+from typing import Any, Optional
+
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from pydantic import BaseModel
+
+# Longest attraction shortlist handed to the itinerary stage
+MAX_ATTRACTIONS = 12
+
+
+class HotelQuote(BaseModel):
+    city: str
+    matched_city: Optional[str] = None
+    tier: str
+    per_night: int
+    total: int
+    currency: str = "INR"
+
+
+class TransportQuote(BaseModel):
+    origin: str
+    destination: str
+    mode: str
+    round_trip: int
+    local: int
+    total: int
+    currency: str = "INR"
+    route: Optional[str] = None
+
+
+class AttractionShortlist(BaseModel):
+    destination: Optional[str] = None
+    names: list[str]
+
+
+class TripLeg(BaseModel):
+    origin: str
+    destination: str
+    mode: str
+    fare: int
+    currency: str = "INR"
+    route: Optional[str] = None
+
+
+class CityStop(BaseModel):
+    city: str
+    days: int
+    hotel: HotelQuote
+    local_transport: int
+    attractions: list[str] = []
+
+
+def hotel_quote_record(result: dict[str, Any]) -> HotelQuote:
+    return HotelQuote(
+        city=result["city"],
+        matched_city=result.get("matched_city"),
+        tier=result["tier"],
+        per_night=result["estimated_per_night"],
+        total=result["total_estimated_cost"],
+        currency=result.get("currency", "INR"),
+    )
+
+
+def transport_quote_record(result: dict[str, Any]) -> TransportQuote:
+    return TransportQuote(
+        origin=result["origin"],
+        destination=result["destination"],
+        mode=result.get("mode", "flight"),
+        round_trip=result["flight_estimate_round_trip"],
+        local=result["local_transport_estimate"],
+        total=result["total_transport_estimate"],
+        currency=result.get("currency", "INR"),
+        route=result.get("route"),
+    )
+
+
+# tool name -> (state key, record builder from the tool's result dict)
+_TOOL_RECORDS = {
+    "hotel_cost_estimator": ("hotel_quote", hotel_quote_record),
+    "transport_cost_estimator": ("transport_quote", transport_quote_record),
+}
+
+
+def publish_tool_record(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext, tool_response: Any
+) -> Optional[dict]:
+    """after_tool_callback: store the compact record for a cost tool's result in state."""
+    entry = _TOOL_RECORDS.get(tool.name)
+    if entry is None or not isinstance(tool_response, dict):
+        return None
+    key, build = entry
+    try:
+        tool_context.state[key] = build(tool_response).model_dump(exclude_none=True)
+    except (KeyError, TypeError, ValueError):
+        pass  # downstream prompts fall back to the free-text estimate
+    return None
+
+
+_LIST_ITEM_RE = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s+(.+)$")
+_NAME_SPLIT_RE = re.compile(r"\s+[–—-]\s+|:\s|\s\(")
+
+
+def parse_attraction_names(text: str, limit: int = MAX_ATTRACTIONS) -> list[str]:
+    """
+    Attraction names from an attraction summary: list items after the
+    "Top Attractions" label (or anywhere if there is no label), cut at the
+    first " – ", ": " or " (" and stripped of markdown emphasis.
+    """
+    lines = (text or "").splitlines()
+    for i, line in enumerate(lines):
+        if "top attractions" in line.lower():
+            lines = lines[i + 1 :]
+            break
+    names: list[str] = []
+    for line in lines:
+        match = _LIST_ITEM_RE.match(line)
+        if not match:
+            continue
+        name = _NAME_SPLIT_RE.split(match.group(1).replace("**", "").replace("__", ""), maxsplit=1)[0]
+        name = name.strip(" *_.,")
+        if name and name.lower() not in {n.lower() for n in names}:
+            names.append(name)
+        if len(names) >= limit:
+            break
+    return names
+
+
+def attraction_shortlist(text: str, destination: Optional[str]) -> Optional[dict[str, Any]]:
+    """Shortlist record for state, or None when no names could be parsed."""
+    names = parse_attraction_names(text)
+    if not names:
+        return None
+    return AttractionShortlist(destination=destination, names=names).model_dump(exclude_none=True)
@@ -0,0 +1,49 @@
+"""
+Lazily built stages.
+A LazyStage stands in for an agent in the tree and builds it on first run.
+The root agent can then be constructed without building the planning
+pipelines, with their LlmAgents, tools and NumPy, until a complete request
+needs one. A cold process answers greetings and clarifying questions without
+ever building them.
+"""
+import threading
+from typing import AsyncGenerator, Callable
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+
+_build_lock = threading.RLock()
+
+
+class LazyStage(BaseAgent):
+    """
+    Runs factory()'s agent, built on first use, as its only sub-agent.
+
+    sub_agents stays empty until the agent is built; the walks in
+    agent_tree.py build it first, so code that swaps models (scheduler,
+    cassette, offline benchmarks) sees the whole tree.
+    """
+
+    factory: Callable[[], BaseAgent]
+
+    def __init__(self, name: str, factory: Callable[[], BaseAgent], **kwargs):
+        super().__init__(name=name, factory=factory, **kwargs)
+
+    @property
+    def built(self) -> bool:
+        return bool(self.sub_agents)
+
+    def build(self) -> BaseAgent:
+        """The stage's agent, built (once) now if it was not yet."""
+        with _build_lock:
+            if not self.sub_agents:
+                agent = self.factory()
+                agent.parent_agent = self
+                self.sub_agents = [agent]
+        return self.sub_agents[0]
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        async for event in self.build().run_async(ctx):
+            yield event
+
@@ -0,0 +1,34 @@
+"""
+Lazy re-exports for package __init__ modules.
+A package's public names are imported from their submodules on first access,
+so importing the package, or one light submodule of it, does not import the
+rest (the tools' NumPy, the sub-agents' LlmAgents).
+"""
+import importlib
+import sys
+import types
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> None:
+    """
+    Resolve package.<name> from package.<exports[name]> on first access.
+
+    Importing a submodule binds it on the package under its own name. Where
+    that name is also an export (tools.hotel_cost_estimator is the function,
+    not the module), the export keeps the name, as with eager re-exports.
+    """
+
+    class LazyExports(types.ModuleType):
+        def __getattr__(self, name: str):
+            if name not in exports:
+                raise AttributeError(f"module {package!r} has no attribute {name!r}")
+            value = getattr(importlib.import_module(f"{package}.{exports[name]}"), name)
+            types.ModuleType.__setattr__(self, name, value)
+            return value
+
+        def __setattr__(self, name: str, value) -> None:
+            if name in exports and isinstance(value, types.ModuleType):
+                return
+            super().__setattr__(name, value)
+
+    sys.modules[package].__class__ = LazyExports
@@ -0,0 +1,371 @@
+"""
+Pipeline instrumentation for the Smart Travel Planner.
+Model and tool callbacks record, per stage and per request, model input/output
+tokens, model calls, tool invocation counts (google_search from the model's
+grounding metadata) and tool durations; stage wall
+times come from timing.py. Values are aggregated into p50/p95/p99 summaries and
+exported as Prometheus text and/or JSON lines (one record per pipeline run).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+from travel_planner import config
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Count, sum and a bounded window of recent samples for quantiles."""
+
+    def __init__(self, max_samples: int):
+        self.count = 0
+        self.sum = 0.0
+        self.samples: deque[float] = deque(maxlen=max_samples)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+
+    def quantiles(self, qs: tuple[float, ...] = QUANTILES) -> dict[float, float]:
+        """Nearest-rank quantiles over the sample window."""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in qs}
+        return {q: ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))] for q in qs}
+
+
+class MetricsRegistry:
+    """
+    Labelled histograms and counters plus per-request accumulators.
+
+    Histograms (ms or tokens): stage_duration_ms{stage}, request_duration_ms,
+    tool_duration_ms{stage,tool}, stage_input_tokens{stage},
+    stage_output_tokens{stage}.
+    Counters: model_calls_total{stage}, tool_calls_total{stage,tool},
+    tokens_total{stage,direction}, requests_total.
+    Model tiering (model_tiering.py): tier_call_ms{stage,tier} histogram,
+    tier_calls_total{stage,tier} and model_escalations_total{stage,reason}.
+    Gauges hold current values, e.g. the LLM scheduler's queue depth
+    (scheduler.py).
+    """
+
+    def __init__(self, max_samples: int = 10_000, prefix: str = "travel_planner"):
+        self.max_samples = max_samples
+        self.prefix = prefix
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.gauges: dict[tuple[str, Labels], float] = {}
+        # invocation_id -> stage -> per-request stats
+        self._requests: dict[str, dict[str, dict[str, Any]]] = {}
+        # (invocation_id, function_call_id) -> perf_counter at tool start
+        self._tool_starts: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.max_samples)
+            histogram.observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.gauges[key] = value
+
+    def _stage(self, invocation_id: str, stage: str) -> dict[str, Any]:
+        return self._requests.setdefault(invocation_id, {}).setdefault(stage, _empty_stage())
+
+    # --- recording -------------------------------------------------------
+
+    def record_model_call(self, invocation_id: str, stage: str, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            stats = self._stage(invocation_id, stage)
+            stats["model_calls"] += 1
+            stats["input_tokens"] += input_tokens
+            stats["output_tokens"] += output_tokens
+        self.inc("model_calls_total", stage=stage)
+        self.inc("tokens_total", input_tokens, stage=stage, direction="input")
+        self.inc("tokens_total", output_tokens, stage=stage, direction="output")
+
+    def start_tool(self, invocation_id: str, call_id: str) -> None:
+        self._tool_starts[(invocation_id, call_id)] = time.perf_counter()
+
+    def stop_tool(self, invocation_id: str, call_id: str, stage: str, tool: str) -> None:
+        started = self._tool_starts.pop((invocation_id, call_id), None)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3) if started is not None else 0.0
+        with self._lock:
+            stats = self._stage(invocation_id, stage)
+            stats["tool_calls"][tool] = stats["tool_calls"].get(tool, 0) + 1
+            stats["tool_ms"][tool] = round(stats["tool_ms"].get(tool, 0.0) + elapsed_ms, 3)
+        self.inc("tool_calls_total", stage=stage, tool=tool)
+        self.observe("tool_duration_ms", elapsed_ms, stage=stage, tool=tool)
+
+    def record_grounded_search(self, invocation_id: str, stage: str, searches: int) -> None:
+        """Searches google_search ran inside a model call (server-side: no tool callbacks, no duration)."""
+        with self._lock:
+            stats = self._stage(invocation_id, stage)
+            stats["tool_calls"]["google_search"] = stats["tool_calls"].get("google_search", 0) + searches
+        self.inc("tool_calls_total", searches, stage=stage, tool="google_search")
+
+    def record_stage(self, stage: str, elapsed_ms: float) -> None:
+        self.observe("stage_duration_ms", elapsed_ms, stage=stage)
+
+    def finish_request(self, invocation_id: str, stage_timings: dict[str, float], pipeline: str) -> dict[str, Any]:
+        """
+        Close the accumulators of one pipeline run and return its record:
+        {"ts", "invocation_id", "wall_ms", "stages": {stage: {wall_ms, tokens,
+        model_calls, tool_calls, tool_ms}}, "totals": {...}}.
+        """
+        with self._lock:
+            stages = self._requests.pop(invocation_id, {})
+            for key in [k for k in self._tool_starts if k[0] == invocation_id]:
+                del self._tool_starts[key]
+        record_stages = {}
+        for stage in sorted((set(stages) | set(stage_timings)) - {pipeline}):
+            stats = stages.get(stage) or _empty_stage()
+            record_stages[stage] = {"wall_ms": stage_timings.get(stage), **stats}
+            if stats["model_calls"]:
+                self.observe("stage_input_tokens", stats["input_tokens"], stage=stage)
+                self.observe("stage_output_tokens", stats["output_tokens"], stage=stage)
+        wall_ms = stage_timings.get(pipeline)
+        if wall_ms is not None:
+            self.observe("request_duration_ms", wall_ms)
+        self.inc("requests_total")
+        return {
+            "ts": time.time(),
+            "invocation_id": invocation_id,
+            "wall_ms": wall_ms,
+            "stages": record_stages,
+            "totals": {
+                "input_tokens": sum(s["input_tokens"] for s in record_stages.values()),
+                "output_tokens": sum(s["output_tokens"] for s in record_stages.values()),
+                "model_calls": sum(s["model_calls"] for s in record_stages.values()),
+                "tool_calls": sum(sum(s["tool_calls"].values()) for s in record_stages.values()),
+            },
+        }
+
+    def discard_request(self, invocation_id: str) -> None:
+        """Drop the accumulators of a run that ended without finish_request (failed or cancelled)."""
+        with self._lock:
+            self._requests.pop(invocation_id, None)
+            for key in [k for k in self._tool_starts if k[0] == invocation_id]:
+                del self._tool_starts[key]
+
+    def record_tier_call(self, stage: str, tier: str, elapsed_ms: float, escalation: Optional[str] = None) -> None:
+        """One call of a tiered model; escalation is the reason its answer was rejected, if it was."""
+        self.inc("tier_calls_total", stage=stage, tier=tier)
+        self.observe("tier_call_ms", elapsed_ms, stage=stage, tier=tier)
+        if escalation is not None:
+            self.inc("model_escalations_total", stage=stage, reason=escalation)
+
+    def tiering_summary(self) -> dict[str, dict[str, Any]]:
+        """
+        Per tiered stage: light/strong calls, escalations, escalation rate, p50
+        call latency per tier and the estimated time saved versus sending every
+        call to the strong model: accepted light calls x (strong p50 - light p50)
+        minus the light time spent on escalated calls. The saving is None until
+        the stage has strong-tier samples to compare against.
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = dict(self.histograms)
+        stages: dict[str, dict[str, Any]] = {}
+        for (name, labels), value in counters.items():
+            if name == "tier_calls_total":
+                label = dict(labels)
+                stages.setdefault(label["stage"], {})[f"{label['tier']}_calls"] = int(value)
+        for stage, row in stages.items():
+            light = histograms.get(("tier_call_ms", (("stage", stage), ("tier", "light"))))
+            strong = histograms.get(("tier_call_ms", (("stage", stage), ("tier", "strong"))))
+            light_calls = row.setdefault("light_calls", 0)
+            row.setdefault("strong_calls", 0)
+            escalations = int(
+                sum(
+                    value
+                    for (name, labels), value in counters.items()
+                    if name == "model_escalations_total" and dict(labels)["stage"] == stage
+                )
+            )
+            light_p50 = light.quantiles()[0.5] if light else 0.0
+            strong_p50 = strong.quantiles()[0.5] if strong else None
+            row.update(
+                escalations=escalations,
+                escalation_rate=round(escalations / light_calls, 4) if light_calls else 0.0,
+                light_p50_ms=round(light_p50, 3),
+                strong_p50_ms=None if strong_p50 is None else round(strong_p50, 3),
+                saved_ms_estimate=None
+                if strong_p50 is None
+                else round((light_calls - escalations) * (strong_p50 - light_p50) - escalations * light_p50, 1),
+            )
+        return stages
+
+    # --- export ----------------------------------------------------------
+
+    def summary(self) -> dict[str, list[dict[str, Any]]]:
+        """{metric: [{labels, count, sum, p50, p95, p99}, ...]} for histograms, plus counters and gauges."""
+        result: dict[str, list[dict[str, Any]]] = {}
+        with self._lock:
+            histograms = list(self.histograms.items())
+            counters = list(self.counters.items())
+            gauges = list(self.gauges.items())
+        for (name, labels), histogram in sorted(histograms):
+            qs = histogram.quantiles()
+            result.setdefault(name, []).append(
+                {
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "sum": round(histogram.sum, 3),
+                    **{f"p{int(q * 100)}": round(v, 3) for q, v in qs.items()},
+                }
+            )
+        for (name, labels), value in sorted(counters) + sorted(gauges):
+            result.setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return result
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition: histograms as summaries with quantile labels."""
+
+        def fmt(labels: Labels, extra: tuple[tuple[str, str], ...] = ()) -> str:
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{str(v)}"' for k, v in pairs) + "}"
+
+        lines: list[str] = []
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+        typed: set[str] = set()
+        for (name, labels), histogram in histograms:
+            metric = f"{self.prefix}_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} summary")
+                typed.add(metric)
+            for q, value in histogram.quantiles().items():
+                lines.append(f"{metric}{fmt(labels, (('quantile', str(q)),))} {value}")
+            lines.append(f"{metric}_sum{fmt(labels)} {round(histogram.sum, 3)}")
+            lines.append(f"{metric}_count{fmt(labels)} {histogram.count}")
+        for (name, labels), value in counters:
+            metric = f"{self.prefix}_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{fmt(labels)} {value}")
+        for (name, labels), value in gauges:
+            metric = f"{self.prefix}_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} gauge")
+                typed.add(metric)
+            lines.append(f"{metric}{fmt(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, record: dict[str, Any]) -> None:
+        """Append record to METRICS_JSONL_PATH and rewrite METRICS_PROMETHEUS_PATH (if set)."""
+        try:
+            if config.METRICS_JSONL_PATH:
+                _ensure_parent(config.METRICS_JSONL_PATH)
+                with open(config.METRICS_JSONL_PATH, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if config.METRICS_PROMETHEUS_PATH:
+                _ensure_parent(config.METRICS_PROMETHEUS_PATH)
+                tmp = f"{config.METRICS_PROMETHEUS_PATH}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(self.to_prometheus())
+                os.replace(tmp, config.METRICS_PROMETHEUS_PATH)
+        except OSError:
+            logger.warning("Could not write pipeline metrics", exc_info=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.gauges.clear()
+            self._requests.clear()
+            self._tool_starts.clear()
+
+
+def _empty_stage() -> dict[str, Any]:
+    return {"input_tokens": 0, "output_tokens": 0, "model_calls": 0, "tool_calls": {}, "tool_ms": {}}
+
+
+def _ensure_parent(path: str) -> None:
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+
+
+_registry = MetricsRegistry(max_samples=config.METRICS_MAX_SAMPLES)
+
+
+def get_metrics() -> MetricsRegistry:
+    """Process-wide metrics registry."""
+    return _registry
+
+
+# --- ADK callbacks ---------------------------------------------------------
+
+
+def record_model_usage(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+    """
+    after_model_callback: count the model call and its input/output tokens for
+    this stage, and the google_search queries the model ran while grounding the
+    answer (google_search runs server-side, so the tool callbacks never see it).
+    """
+    if not config.METRICS_ENABLED or llm_response.partial:
+        return None
+    usage = llm_response.usage_metadata
+    _registry.record_model_call(
+        callback_context.invocation_id,
+        callback_context.agent_name,
+        (usage.prompt_token_count or 0) if usage else 0,
+        (usage.candidates_token_count or 0) if usage else 0,
+    )
+    grounding = llm_response.grounding_metadata
+    if grounding is not None and (grounding.web_search_queries or grounding.grounding_chunks):
+        _registry.record_grounded_search(
+            callback_context.invocation_id, callback_context.agent_name, len(grounding.web_search_queries or ()) or 1
+        )
+    return None
+
+
+def start_tool_timer(tool: BaseTool, args: dict[str, Any], tool_context: ToolContext) -> Optional[dict]:
+    """before_tool_callback: remember when this tool call started."""
+    if config.METRICS_ENABLED:
+        _registry.start_tool(tool_context.invocation_id, tool_context.function_call_id or tool.name)
+    return None
+
+
+def stop_tool_timer(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext, tool_response: Any
+) -> Optional[dict]:
+    """after_tool_callback: count the tool call and record its duration for this stage."""
+    if config.METRICS_ENABLED:
+        _registry.stop_tool(
+            tool_context.invocation_id,
+            tool_context.function_call_id or tool.name,
+            tool_context.agent_name,
+            tool.name,
+        )
+    return None
@@ -0,0 +1,148 @@
+"""
+Per-agent model selection with light-first tiering.
+TieredLlm sends each request to a light model first and validates the answer:
+every function call must name one of the agent's tools with arguments that fit
+the tool's signature (required parameters present, numbers for numeric
+parameters), and the answer must not be empty. Invalid answers are discarded
+and the request is re-sent to the agent's own (strong) model. Quota and
+overload errors (429/503) are raised instead, for the scheduler to retry: the
+light model's answer was never seen, and the strong model shares the quota.
+Calls, latency per tier and escalations are recorded in the pipeline metrics.
+"""
+import inspect
+import time
+import typing
+from typing import Any, AsyncGenerator, Optional, Union
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.adk.tools import FunctionTool
+
+from travel_planner import config
+from travel_planner.metrics import get_metrics
+from travel_planner.scheduler import RETRYABLE_CODES
+
+# Python annotation -> accepted JSON value types for argument validation
+_ACCEPTED_TYPES: dict[Any, tuple[type, ...]] = {
+    int: (int, float),
+    float: (int, float),
+    str: (str,),
+    bool: (bool,),
+    list: (list,),
+    dict: (dict,),
+}
+
+
+def _arg_fits(annotation: Any, value: Any) -> bool:
+    """Loose JSON type check; annotations it doesn't understand accept anything."""
+    if annotation is inspect.Parameter.empty or value is None:
+        return True
+    candidates = typing.get_args(annotation) if typing.get_origin(annotation) is Union else (annotation,)
+    accepted: tuple[type, ...] = ()
+    for candidate in candidates:
+        origin = typing.get_origin(candidate) or candidate
+        if origin not in _ACCEPTED_TYPES:
+            return True
+        accepted += _ACCEPTED_TYPES[origin]
+    if isinstance(value, bool) and bool not in accepted:
+        return False  # JSON true/false is not a number here
+    return isinstance(value, accepted)
+
+
+def _invalid_args(tool: Any, args: dict[str, Any]) -> Optional[str]:
+    """Why args don't fit the function tool's signature, or None."""
+    if not isinstance(tool, FunctionTool):
+        return None
+    parameters = {
+        name: p for name, p in inspect.signature(tool.func).parameters.items() if name != "tool_context"
+    }
+    hints = typing.get_type_hints(tool.func)
+    for name, parameter in parameters.items():
+        if name not in args and parameter.default is inspect.Parameter.empty:
+            return f"missing {name}"
+    for name, value in args.items():
+        if name not in parameters:
+            return f"unexpected {name}"
+        if not _arg_fits(hints.get(name, parameters[name].annotation), value):
+            return f"{name}={value!r}"
+    return None
+
+
+def validate_response(llm_request: LlmRequest, responses: list[LlmResponse]) -> Optional[str]:
+    """
+    Reason the light model's answer is unusable ("error", "empty",
+    "unknown_tool", "bad_args"), or None if it can be passed on.
+    """
+    final = [r for r in responses if not r.partial] or responses
+    if not final or any(r.error_code for r in final):
+        return "error"
+    parts = [part for r in final if r.content for part in r.content.parts or ()]
+    if not any(part.function_call or (part.text or "").strip() for part in parts):
+        return "empty"
+    for part in parts:
+        call = part.function_call
+        if call is None:
+            continue
+        tool = llm_request.tools_dict.get(call.name)
+        if tool is None:
+            return "unknown_tool"
+        if _invalid_args(tool, dict(call.args or {})) is not None:
+            return "bad_args"
+    return None
+
+
+class TieredLlm(BaseLlm):
+    """
+    Light-first model: answers from `light` when they validate, otherwise
+    re-sends the request to `strong`. `stage` labels the metrics.
+    Responses are buffered until validated, so partial streaming output of the
+    light model is never shown.
+    """
+
+    light: BaseLlm
+    strong: BaseLlm
+    stage: str
+
+    async def _collect(self, llm: BaseLlm, llm_request: LlmRequest, stream: bool) -> tuple[list[LlmResponse], float]:
+        started = time.perf_counter()
+        llm_request.model = llm.model
+        responses = [r async for r in llm.generate_content_async(llm_request, stream=stream)]
+        return responses, (time.perf_counter() - started) * 1000
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        metrics = get_metrics() if config.METRICS_ENABLED else None
+        try:
+            responses, elapsed_ms = await self._collect(self.light, llm_request, stream)
+            reason = validate_response(llm_request, responses)
+        except Exception as error:
+            if getattr(error, "code", None) in RETRYABLE_CODES:
+                raise
+            # Any other failure of the light model escalates like an invalid answer
+            responses, elapsed_ms, reason = [], 0.0, "error"
+        if metrics is not None:
+            metrics.record_tier_call(self.stage, "light", elapsed_ms, escalation=reason)
+        if reason is not None:
+            responses, elapsed_ms = await self._collect(self.strong, llm_request, stream)
+            if metrics is not None:
+                metrics.record_tier_call(self.stage, "strong", elapsed_ms)
+        for response in responses:
+            yield response
+
+
+def agent_model(agent_name: str, model: str) -> Union[str, BaseLlm]:
+    """
+    The model for an agent: its configured model name, or a TieredLlm over
+    LIGHT_MODEL and that model when the agent is listed in TIERED_AGENTS.
+    """
+    if not config.LIGHT_MODEL or agent_name not in config.TIERED_AGENTS or config.LIGHT_MODEL == model:
+        return model
+    return TieredLlm(
+        model=config.LIGHT_MODEL,
+        light=LLMRegistry.new_llm(config.LIGHT_MODEL),
+        strong=LLMRegistry.new_llm(model),
+        stage=agent_name,
+    )
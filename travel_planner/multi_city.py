@@ -0,0 +1,242 @@
+"""
+Multi-city trips.
+A request naming several cities ("Jaipur, Udaipur and Delhi in 8 days") is
+planned per city instead of as one destination: the days are split across the
+cities, each city's attractions are found concurrently (one cached attraction
+stage per city under a ParallelAgent), hotels are quoted per city for its
+share of the days and budget, and the journeys origin → first city → ... →
+last city → origin are priced with transport_cost_estimator. budget_allocator
+and itinerary_generator turn the merged totals and per-city shortlists into
+one budget and one day-by-day itinerary, which MultiCityItineraryAgent writes
+up as the plan. Only the attraction searches scale with the number of cities,
+and they run side by side, so a three-city plan takes about as long as a
+single-city one.
+"""
+import logging
+import re
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from travel_planner.handoff import CityStop, TripLeg, hotel_quote_record
+from travel_planner.replanning import STAGE_DEPENDENCIES, STAGE_RECORDS, inputs_key
+from travel_planner.sub_agents.attraction_agent import CachedAttractionAgent
+from travel_planner.timing import start_stage_timer, stop_stage_timer
+from travel_planner.tools import budget_allocator, hotel_cost_estimator, itinerary_generator, transport_cost_estimator
+from travel_planner.tools.transport_cost_estimator import LOCAL_TRANSPORT_DAYS
+
+logger = logging.getLogger(__name__)
+
+# Start and end of the trip when the request names no origin (as TransportAgent assumes)
+DEFAULT_ORIGIN = "Mumbai"
+
+# Days per city when the request gives only a loose date ("next month")
+DEFAULT_DAYS_PER_CITY = 2
+
+_DAY_HEADING_RE = re.compile(r"^## Day (\d+)", re.MULTILINE)
+
+
+def city_key(city: str) -> str:
+    """State key / agent name suffix for a city: "New Delhi" -> "new_delhi"."""
+    return re.sub(r"\W+", "_", city.lower()).strip("_")
+
+
+def split_days(days: int, count: int) -> list[int]:
+    """Days per city: an even split with the remainder going to the earlier cities, at least 1 each."""
+    base, extra = divmod(max(days, count), count)
+    return [base + (1 if i < extra else 0) for i in range(count)]
+
+
+def trip_legs(origin: Optional[str], cities: list[str]) -> list[tuple[str, str]]:
+    """Journeys of the round trip: origin → first city, each city → the next, last city → origin."""
+    home = origin or DEFAULT_ORIGIN
+    stops = [home, *cities, home]
+    return list(zip(stops, stops[1:]))
+
+
+def quote_trip(
+    cities: list[str], days: int, budget: float, origin: Optional[str] = None
+) -> tuple[list[CityStop], list[TripLeg]]:
+    """
+    Per-city hotel quotes for each city's share of the days (and of the
+    budget, which picks the hotel tier), plus one-way fares for every leg.
+    Local transport is the estimator's daily rate for the city times its days.
+    """
+    city_days = split_days(days, len(cities))
+    total_days = sum(city_days)
+    stops, legs = [], []
+    for index, (start, end) in enumerate(trip_legs(origin, cities)):
+        quote = transport_cost_estimator(start, end)
+        legs.append(
+            TripLeg(
+                origin=start,
+                destination=end,
+                mode=quote["mode"],
+                fare=quote["flight_estimate_round_trip"] // 2,
+                currency=quote["currency"],
+                route=quote.get("route"),
+            )
+        )
+        if index < len(cities):
+            stay = city_days[index]
+            hotel = hotel_cost_estimator(end, stay, budget * stay / total_days)
+            stops.append(
+                CityStop(
+                    city=end,
+                    days=stay,
+                    hotel=hotel_quote_record(hotel),
+                    local_transport=quote["local_transport_estimate"] * stay // LOCAL_TRANSPORT_DAYS,
+                )
+            )
+    return stops, legs
+
+
+def merged_itinerary(stops: list[CityStop], legs: list[TripLeg]) -> str:
+    """itinerary_generator per city, days numbered across the whole trip, with the legs in between."""
+    sections, offset = [], 0
+    for stop, leg in zip(stops, legs):
+        plan = itinerary_generator(stop.city, stop.attractions, stop.days)
+        body = plan.split("\n", 1)[1].strip() if "\n" in plan else ""  # drop the per-city title
+        body = _DAY_HEADING_RE.sub(lambda m: f"### Day {int(m.group(1)) + offset}", body)
+        sections.append(
+            f"## {stop.city} (Day {offset + 1}–{offset + stop.days})\n"
+            f"Arrive from {leg.origin} by {leg.mode} (~{leg.fare} {leg.currency}).\n\n{body}"
+        )
+        offset += stop.days
+    home = legs[-1]
+    sections.append(f"Return: {home.origin} → {home.destination} by {home.mode} (~{home.fare} {home.currency}).")
+    return "\n\n".join(sections)
+
+
+def _hotel_summary(stops: list[CityStop]) -> str:
+    lines = [
+        f"- {s.city}: {s.hotel.tier} tier @ ~{s.hotel.per_night} {s.hotel.currency}/night x {s.days} nights = {s.hotel.total} {s.hotel.currency}"
+        for s in stops
+    ]
+    return "Hotels:\n" + "\n".join(lines) + f"\nTotal: {sum(s.hotel.total for s in stops)} INR"
+
+
+def _transport_summary(stops: list[CityStop], legs: list[TripLeg]) -> str:
+    lines = [f"- {leg.origin} → {leg.destination}: {leg.mode} ~{leg.fare} {leg.currency}" for leg in legs]
+    lines += [f"- Local transport in {s.city}: ~{s.local_transport} INR" for s in stops]
+    total = sum(leg.fare for leg in legs) + sum(s.local_transport for s in stops)
+    return "Transport:\n" + "\n".join(lines) + f"\nTotal: {total} INR"
+
+
+class MultiCityStage(BaseAgent):
+    """
+    Plans the cities of state["destinations"] side by side.
+
+    Publishes hotel_estimate / transport_estimate (text) and the city_stops /
+    trip_legs records first (the cost tools are local and instant), then runs
+    one attraction stage per city concurrently, each a clone of
+    attraction_agent (AttractionAgent_<city>) with the city in its prompt
+    behind the attraction cache,
+    and finally publishes the merged attractions_result, the cities'
+    shortlists in city_stops, budget_allocation and multi_city_itinerary for
+    MultiCityItineraryAgent.
+
+    Single-city stage fingerprints are cleared so a later single-city
+    follow-up never reuses these outputs (see replanning.py).
+    """
+
+    attraction_agent: LlmAgent
+
+    def __init__(self, name: str, attraction_agent: LlmAgent, **kwargs):
+        # The template is a sub-agent (never run itself) so the scheduler, the
+        # cassette and the offline backends wrap its model before it is cloned
+        super().__init__(name=name, attraction_agent=attraction_agent, sub_agents=[attraction_agent], **kwargs)
+
+    def find_sub_agent(self, name: str) -> Optional[BaseAgent]:
+        # A per-city clone's events keep its name (AttractionAgent_<city>) so it
+        # reads its own tool calls back as its own; on later turns the runner
+        # resolves that name to the template, which it never transfers to
+        if name.startswith(f"{self.attraction_agent.name}_"):
+            return self.attraction_agent
+        return super().find_sub_agent(name)
+
+    def _city_stage(self, city: str) -> CachedAttractionAgent:
+        key = city_key(city)
+        agent = self.attraction_agent.clone(
+            update={
+                "name": f"{self.attraction_agent.name}_{key}",
+                "instruction": str(self.attraction_agent.instruction).replace("{destination?}", city),
+                "output_key": f"attractions_result_{key}",
+                # Timed as part of the fan-out: concurrent runs under one agent name would share a timer
+                "before_agent_callback": None,
+                "after_agent_callback": None,
+            }
+        )
+        return CachedAttractionAgent(
+            name=f"AttractionStage_{key}",
+            agent=agent,
+            destination=city,
+            output_key=agent.output_key,
+            shortlist_key=f"attraction_shortlist_{key}",
+        )
+
+    def _event(self, ctx: InvocationContext, state_delta: dict[str, Any]) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        cities = list(state.get("destinations") or [])
+        days = int(state.get("days") or DEFAULT_DAYS_PER_CITY * len(cities))
+        budget = float(state.get("budget") or 0)
+        stops, legs = quote_trip(cities, days, budget, state.get("origin"))
+
+        stale = {inputs_key(key): None for key in STAGE_DEPENDENCIES}
+        stale.update({record: None for records in STAGE_RECORDS.values() for record in records})
+        yield self._event(
+            ctx,
+            {
+                **stale,
+                "hotel_estimate": _hotel_summary(stops),
+                "transport_estimate": _transport_summary(stops, legs),
+                "city_stops": [s.model_dump(exclude_none=True) for s in stops],
+                "trip_legs": [leg.model_dump(exclude_none=True) for leg in legs],
+            },
+        )
+
+        fan_out = ParallelAgent(
+            name="CityFanOut",
+            description="Finds each city's attractions concurrently.",
+            sub_agents=[self._city_stage(city) for city in cities],
+            before_agent_callback=start_stage_timer,
+            after_agent_callback=stop_stage_timer,
+        )
+        # The per-city stages exist for this run only; their events are attributed
+        # to this stage so the runner can resolve every author on later turns
+        # (the clones' own events resolve through find_sub_agent)
+        transient = {fan_out.name} | {stage.name for stage in fan_out.sub_agents}
+        async for event in fan_out.run_async(ctx):
+            if event.author in transient:
+                event.author = self.name
+            yield event
+
+        state = ctx.session.state
+        summaries = []
+        for stop in stops:
+            key = city_key(stop.city)
+            shortlist = state.get(f"attraction_shortlist_{key}")
+            stop.attractions = shortlist["names"] if shortlist else []
+            summaries.append(f"## {stop.city}\n{state.get(f'attractions_result_{key}') or ''}".strip())
+        hotel_total = sum(s.hotel.total for s in stops)
+        transport_total = sum(leg.fare for leg in legs) + sum(s.local_transport for s in stops)
+        logger.debug("Multi-city plan for %s: hotels %d, transport %d", cities, hotel_total, transport_total)
+        yield self._event(
+            ctx,
+            {
+                "attractions_result": "\n\n".join(summaries),
+                "city_stops": [s.model_dump(exclude_none=True) for s in stops],
+                "budget_allocation": budget_allocator(budget, hotel_total, transport_total),
+                "multi_city_itinerary": merged_itinerary(stops, legs),
+            },
+        )
@@ -0,0 +1,138 @@
+"""
+Whole-plan result cache for the Smart Travel Planner.
+Stores final_plan keyed by a canonical request fingerprint (destination, days,
+budget bucket, preferences, origin, compared tiers) with LRU/TTL eviction,
+and coalesces concurrent identical requests so only one pipeline run happens
+at a time per fingerprint while the others await its result (single-flight).
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from travel_planner import config
+
+
+def budget_bucket(budget: Optional[float], step: float) -> Optional[int]:
+    """
+    Geometric budget bucket: budgets within ~step (e.g. 10%) of each other share
+    a bucket, so 50,000 and 51,000 INR reuse one plan in any currency scale.
+    """
+    if not budget or budget <= 0:
+        return None
+    return int(math.floor(math.log(budget) / math.log1p(step)))
+
+
+def plan_fingerprint(slots: dict[str, Any], budget_step: float = 0.1) -> str:
+    """Canonical request key from parsed slots (see travel_intent.extract_slots)."""
+
+    def norm(value: Any) -> str:
+        return " ".join(str(value).lower().split()) if value else ""
+
+    preferences = ",".join(sorted({norm(p) for p in slots.get("preferences") or ()}))
+    return "|".join(
+        (
+            norm(slots.get("destination")),
+            str(slots.get("days") or ""),
+            f"{norm(slots.get('currency'))}{budget_bucket(slots.get('budget'), budget_step)}",
+            preferences,
+            norm(slots.get("origin")),
+            ",".join(slots.get("variants") or ()),
+        )
+    )
+
+
+class PlanCache:
+    """
+    In-memory LRU/TTL cache of final plans with single-flight coalescing.
+
+    Usage from an async caller:
+        plan = cache.get(key)                  # cached plan or None
+        waiter = cache.join(key)               # future of an in-flight run, or None
+        cache.begin(key) ... cache.finish(key, plan)   # leader side
+
+    A leader that fails calls finish(key, None); its followers then see None
+    and run the pipeline themselves.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached plan for key (refreshing its LRU position), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, plan: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), plan)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def join(self, key: str) -> Optional[asyncio.Future]:
+        """Future of an identical in-flight run (counted as coalesced), or None."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        return future
+
+    def begin(self, key: str) -> None:
+        """Mark key as in flight; later identical requests join() this run."""
+        self._inflight[key] = asyncio.get_running_loop().create_future()
+
+    def finish(self, key: str, plan: Optional[str]) -> None:
+        """Resolve the in-flight run; a non-empty plan is also cached."""
+        future = self._inflight.pop(key, None)
+        if plan:
+            self.put(key, plan)
+        if future is not None and not future.done():
+            future.set_result(plan)
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_default_cache: Optional[PlanCache] = None
+
+
+def get_plan_cache() -> Optional[PlanCache]:
+    """Process-wide plan cache built from config on first use (None when disabled)."""
+    global _default_cache
+    if not config.PLAN_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        _default_cache = PlanCache(
+            ttl_seconds=config.PLAN_CACHE_TTL_SECONDS,
+            max_entries=config.PLAN_CACHE_MAX_ENTRIES,
+        )
+    return _default_cache
@@ -0,0 +1,120 @@
+"""
+Incremental re-planning.
+Each pipeline stage declares the slots and upstream stage outputs it is
+computed from. After a stage runs, a fingerprint of those inputs is stored
+next to its output in session state; on a later turn in the same session
+(e.g. "make it 4 days instead") the stage is skipped and its previous output
+reused when the fingerprint still matches. A days change therefore reuses the
+attractions and transport estimate and re-runs accommodation and itinerary.
+"""
+import hashlib
+import json
+import logging
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from travel_planner import config
+from travel_planner.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Stage output key -> (slots it reads, upstream stage outputs it reads).
+# ItineraryAgent reads the records of all three earlier stages.
+STAGE_DEPENDENCIES: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "attractions_result": (("destination", "preferences"), ()),
+    "hotel_estimate": (("destination", "days", "budget", "currency", "variants"), ()),
+    "transport_estimate": (("destination", "origin"), ()),
+    "final_plan": (
+        ("destination", "days", "budget", "currency", "variants"),
+        ("attractions_result", "hotel_estimate", "transport_estimate"),
+    ),
+}
+
+# Structured records a stage publishes besides its output (see handoff.py)
+STAGE_RECORDS = {
+    "attractions_result": ("attraction_shortlist",),
+    "hotel_estimate": ("hotel_quote",),
+    "transport_estimate": ("transport_quote",),
+    "final_plan": (),
+}
+
+
+def inputs_key(output_key: str) -> str:
+    """State key holding the input fingerprint an output was computed from."""
+    return f"{output_key}_inputs"
+
+
+def _norm(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, (list, tuple)):
+        return sorted(_norm(v) for v in value)
+    return value
+
+
+def input_fingerprint(output_key: str, state: Any) -> str:
+    """Hash of the slots and upstream outputs output_key depends on, as currently in state."""
+    slots, upstream = STAGE_DEPENDENCIES[output_key]
+    payload = {
+        "slots": {key: _norm(state.get(key)) for key in slots},
+        # An upstream stage's own fingerprint changes whenever it is re-run on new inputs
+        "upstream": {key: state.get(inputs_key(key)) for key in upstream},
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ReusableStage(BaseAgent):
+    """
+    Runs a stage only when its output is missing or was computed from other
+    inputs; otherwise re-publishes the previous output as the stage's message
+    (so the reply and streaming clients still receive it) without running it.
+
+    Before a re-run, the output, its fingerprint and structured records are
+    cleared so a failed run never leaves a stale output behind; the new
+    fingerprint is stored only once this run has produced its output.
+    """
+
+    agent: BaseAgent
+    output_key: str
+
+    def __init__(self, agent: BaseAgent, output_key: str, **kwargs):
+        super().__init__(
+            name=f"Reusable{agent.name}", agent=agent, output_key=output_key, sub_agents=[agent], **kwargs
+        )
+
+    def _event(self, ctx: InvocationContext, state_delta: dict[str, Any], text: Optional[str] = None) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]) if text else None,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        fingerprint = input_fingerprint(self.output_key, state)
+        previous = state.get(self.output_key)
+        if previous and state.get(inputs_key(self.output_key)) == fingerprint:
+            if config.METRICS_ENABLED:
+                get_metrics().inc("stage_reused_total", stage=self.agent.name)
+            logger.debug("%s: inputs unchanged, reusing %s", self.agent.name, self.output_key)
+            yield self._event(ctx, {self.output_key: previous}, text=previous)
+            return
+
+        yield self._event(
+            ctx,
+            {
+                self.output_key: None,
+                inputs_key(self.output_key): None,
+                **{key: None for key in STAGE_RECORDS[self.output_key]},
+            },
+        )
+        async for event in self.agent.run_async(ctx):
+            yield event
+        if ctx.session.state.get(self.output_key):
+            yield self._event(ctx, {inputs_key(self.output_key): fingerprint})
@@ -0,0 +1,173 @@
+"""
+Deterministic front-door agent for the Smart Travel Planner.
+Runs rule-based intent detection in-process on the latest user message
+(merged onto the trip already being discussed, if any):
+greetings and incomplete requests are answered directly from the tool output
+(no model call); only complete requests are handed to the planning pipeline.
+"""
+import asyncio
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from travel_planner import config
+from travel_planner.plan_cache import PlanCache, get_plan_cache, plan_fingerprint
+from travel_planner.replanning import inputs_key
+from travel_planner.timing import discard_stage_timers
+from travel_planner.tools import get_travel_intent
+from travel_planner.tools.travel_intent import has_slot_values
+
+
+def _latest_user_text(ctx: InvocationContext) -> str:
+    """Text of the user message that started this invocation ("" if none)."""
+    content = ctx.user_content
+    if not content or not content.parts:
+        return ""
+    return "\n".join(p.text for p in content.parts if p.text).strip()
+
+
+async def _cached_or_in_flight_plan(cache: PlanCache, key: str) -> Optional[str]:
+    """
+    Cached plan for key, or the result of an identical run already in flight.
+    None means this caller should run the pipeline (no entry, or the run it
+    waited on failed and nobody else has taken over yet).
+    """
+    while True:
+        plan = cache.get(key)
+        if plan:
+            return plan
+        in_flight = cache.join(key)
+        if in_flight is None:
+            return None
+        plan = await asyncio.shield(in_flight)
+        if plan:
+            return plan
+
+
+class TravelPlannerRouter(BaseAgent):
+    """
+    Root agent that routes on get_travel_intent without calling the LLM.
+
+    - greeting: replies with greeting_response.
+    - incomplete: replies with clarifying_suggestion.
+    - complete: runs the pipeline sub-agent; its final_plan is the response.
+
+    The intent result is written to state["travel_intent"] and the message to
+    state["user_request"] in every case, and the parsed slots (destination, origin, days, nights, start_date, end_date,
+    date_hint, budget, currency, preferences) are written as top-level state
+    keys so the sub-agent instructions can use them directly.
+
+    The trip details seen so far are kept in state["trip_slots"] and each new
+    message is merged onto them (see get_travel_intent): "Goa trip", "5 days",
+    "40k" becomes complete on the third turn without asking again for what
+    was already given, and after a plan "make it 4 days instead" is a change
+    to that trip, for which the pipeline's reusable stages re-run only what
+    the change affects.
+
+    A complete request naming several cities (slots["destinations"]) runs
+    multi_city_pipeline instead, and one comparing hotel tiers
+    (slots["variants"], e.g. "cheap vs comfortable") runs variants_pipeline,
+    when those are set; multi-city takes precedence.
+
+    Complete requests go through the plan cache: a cached final_plan for the
+    same fingerprint is returned directly, and a request identical to one that
+    is already running waits for that run instead of starting another.
+    """
+
+    pipeline: BaseAgent
+    multi_city_pipeline: Optional[BaseAgent] = None
+    variants_pipeline: Optional[BaseAgent] = None
+    plan_cache: Optional[PlanCache] = None
+
+    def __init__(
+        self,
+        name: str,
+        pipeline: BaseAgent,
+        description: str = "",
+        plan_cache: Optional[PlanCache] = None,
+        multi_city_pipeline: Optional[BaseAgent] = None,
+        variants_pipeline: Optional[BaseAgent] = None,
+    ):
+        super().__init__(
+            name=name,
+            description=description,
+            pipeline=pipeline,
+            multi_city_pipeline=multi_city_pipeline,
+            variants_pipeline=variants_pipeline,
+            plan_cache=plan_cache,
+            sub_agents=[p for p in (pipeline, multi_city_pipeline, variants_pipeline) if p is not None],
+        )
+
+    def _select_pipeline(self, slots: dict) -> BaseAgent:
+        if self.multi_city_pipeline is not None and len(slots.get("destinations") or ()) > 1:
+            return self.multi_city_pipeline
+        if self.variants_pipeline is not None and len(slots.get("variants") or ()) > 1:
+            return self.variants_pipeline
+        return self.pipeline
+
+    def _plan_event(self, ctx: InvocationContext, plan: str, state_delta: dict) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=plan)]),
+            # The plan did not come from this session's stage outputs
+            actions=EventActions(state_delta={**state_delta, "final_plan": plan, inputs_key("final_plan"): None}),
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        user_request = _latest_user_text(ctx)
+        intent = get_travel_intent(user_request, previous_slots=ctx.session.state.get("trip_slots"))
+        state_delta = {"travel_intent": intent, "user_request": user_request, **intent["slots"]}
+        if has_slot_values(intent["slots"]):
+            # Carried into the next turn: details accumulate until the request is complete
+            state_delta["trip_slots"] = intent["slots"]
+
+        if intent["intent"] != "complete":
+            if intent["intent"] == "greeting":
+                reply = intent["greeting_response"]
+            else:
+                reply = intent["clarifying_suggestion"]
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                content=types.Content(role="model", parts=[types.Part(text=reply)]),
+                actions=EventActions(state_delta=state_delta),
+            )
+            return
+
+        cache = self.plan_cache or get_plan_cache()
+        if cache is not None:
+            key = plan_fingerprint(intent["slots"], config.PLAN_CACHE_BUDGET_STEP)
+            plan = await _cached_or_in_flight_plan(cache, key)
+            if plan:
+                yield self._plan_event(ctx, plan, state_delta)
+                return
+            cache.begin(key)
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+        pipeline = self._select_pipeline(intent["slots"])
+        plan = None
+        try:
+            async for event in pipeline.run_async(ctx):
+                # Only a plan this run publishes is cached: state may still hold the previous turn's
+                written = event.actions.state_delta.get("final_plan") if event.actions else None
+                if written:
+                    plan = written
+                yield event
+        finally:
+            # A failed or cancelled run never reaches publish_stage_timings
+            discard_stage_timers(ctx.invocation_id)
+            if cache is not None:
+                cache.finish(key, plan)
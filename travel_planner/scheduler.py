@@ -0,0 +1,286 @@
+"""
+Process-wide scheduler for model calls.
+Every LlmAgent's model is wrapped in a ScheduledLlm that takes a slot from one
+shared LlmScheduler before calling the model. The scheduler enforces a token
+bucket (requests/second with a burst allowance) and a concurrency limit, and
+admits waiters by priority, FIFO within a priority. Calls rejected with 429
+(quota) or 503 (overloaded) are retried with exponential backoff and full
+jitter; a 429 also empties the shared bucket so every caller backs off, not
+just the one that was rejected. Queue depth, in-flight calls, admission wait
+and retries are recorded in the pipeline metrics.
+"""
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import AsyncGenerator, Iterator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent, SequentialAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from travel_planner import config
+from travel_planner.agent_tree import walk_agents
+from travel_planner.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Calls from agents outside the planning pipeline (user-facing turns)
+PRIORITY_INTERACTIVE = 0
+
+# HTTP status codes worth retrying: quota exhausted, model overloaded
+RETRYABLE_CODES = (429, 503)
+
+
+class TokenBucket:
+    """rate tokens per second, holding at most burst; rate <= 0 means unlimited. Thread-safe."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def drain(self) -> None:
+        """Drop all tokens (after a 429: the quota is spent, whatever the local count says)."""
+        if self.rate > 0:
+            with self._lock:
+                self._refill()
+                self.tokens = min(self.tokens, 0.0)
+
+
+class _LoopQueue:
+    """Admission state of one event loop: its calls in flight, queued waiters and pending pump."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.waiters: list[tuple[int, int, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class LlmScheduler:
+    """
+    Admission control for model calls: at most max_concurrency in flight,
+    started no faster than the token bucket allows, lowest priority value
+    first. Use as `async with scheduler.slot(priority): ...`.
+
+    Waiters are futures of their own event loop, so each loop that uses the
+    scheduler (e.g. one per server worker thread, or a fresh asyncio.run per
+    benchmark) gets its own queue and concurrency limit, keyed by
+    asyncio.get_running_loop(); the token bucket, and so the request rate,
+    is shared by all of them.
+    """
+
+    def __init__(self, max_concurrency: int, rate: float, burst: float):
+        self.max_concurrency = max(1, max_concurrency)
+        self.bucket = TokenBucket(rate, burst)
+        self._loops: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopQueue] = weakref.WeakKeyDictionary()
+        self._loops_lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def _queue(self) -> _LoopQueue:
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            queue = self._loops.get(loop)
+            if queue is None:
+                queue = self._loops[loop] = _LoopQueue()
+        return queue
+
+    @property
+    def in_flight(self) -> int:
+        return sum(queue.in_flight for queue in list(self._loops.values()))
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(
+            1 for queue in list(self._loops.values()) for _, _, future in list(queue.waiters) if not future.done()
+        )
+
+    def _publish(self) -> None:
+        if config.METRICS_ENABLED:
+            metrics = get_metrics()
+            metrics.set_gauge("scheduler_queue_depth", self.queue_depth)
+            metrics.set_gauge("scheduler_in_flight", self.in_flight)
+
+    def _pump(self, queue: _LoopQueue) -> None:
+        """Admit queue's waiters in priority order while a slot and a token are available."""
+        queue.timer = None
+        while queue.waiters and queue.in_flight < self.max_concurrency:
+            if queue.waiters[0][2].done():  # cancelled while queued
+                heapq.heappop(queue.waiters)
+                continue
+            wait = self.bucket.try_take()
+            if wait > 0:
+                queue.timer = asyncio.get_running_loop().call_later(wait, self._pump, queue)
+                break
+            _, _, future = heapq.heappop(queue.waiters)
+            queue.in_flight += 1
+            future.set_result(None)
+        self._publish()
+
+    async def acquire(self, priority: int) -> None:
+        queue = self._queue()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(queue.waiters, (priority, next(self._seq), future))
+        if config.METRICS_ENABLED:
+            get_metrics().observe("scheduler_queue_depth_on_arrival", self.queue_depth - 1)
+        if queue.timer is None:
+            self._pump(queue)
+        started = time.perf_counter()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # admitted just as the caller was cancelled
+            raise
+        if config.METRICS_ENABLED:
+            get_metrics().observe("scheduler_wait_ms", (time.perf_counter() - started) * 1000, priority=str(priority))
+
+    def release(self) -> None:
+        queue = self._queue()
+        queue.in_flight -= 1
+        if queue.timer is None:
+            self._pump(queue)
+        else:
+            self._publish()
+
+    def throttled(self) -> None:
+        """The backend rejected a call for quota: stop admitting until the bucket refills."""
+        self.bucket.drain()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_INTERACTIVE) -> AsyncGenerator[None, None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def _retryable_code(error: Exception) -> Optional[int]:
+    """429/503 from google.genai.errors.APIError (or anything with a .code), else None."""
+    code = getattr(error, "code", None)
+    return code if code in RETRYABLE_CODES else None
+
+
+class ScheduledLlm(BaseLlm):
+    """
+    Model wrapper that runs each call inside a scheduler slot and retries
+    429/503 up to LLM_MAX_RETRIES times with jittered backoff (the slot is
+    released while backing off). Responses are collected inside the slot and
+    yielded after it is released, so tool calls never hold a slot.
+    scheduler=None uses the process-wide get_scheduler().
+    """
+
+    inner: BaseLlm
+    priority: int = PRIORITY_INTERACTIVE
+    stage: str = ""
+    scheduler: Optional[LlmScheduler] = None
+
+    async def _call(self, scheduler: LlmScheduler, llm_request: LlmRequest, stream: bool) -> list[LlmResponse]:
+        async with scheduler.slot(self.priority):
+            return [r async for r in self.inner.generate_content_async(llm_request, stream=stream)]
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        scheduler = self.scheduler or get_scheduler()
+        attempt = 0
+        while True:
+            try:
+                responses = await self._call(scheduler, llm_request, stream)
+                break
+            except Exception as error:
+                code = _retryable_code(error)
+                if code is None or attempt >= config.LLM_MAX_RETRIES:
+                    raise
+                if code == 429:
+                    scheduler.throttled()
+                delay = backoff_delay(attempt, config.LLM_RETRY_BASE_SECONDS, config.LLM_RETRY_MAX_SECONDS)
+                if config.METRICS_ENABLED:
+                    get_metrics().inc("scheduler_retries_total", stage=self.stage, code=str(code))
+                logger.info("%s: model returned %d, retry %d in %.2fs", self.stage, code, attempt + 1, delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+        for response in responses:
+            yield response
+
+
+_scheduler: Optional[LlmScheduler] = None
+
+
+def get_scheduler() -> LlmScheduler:
+    """Process-wide scheduler from LLM_MAX_CONCURRENCY / LLM_RATE_PER_SECOND / LLM_RATE_BURST."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = LlmScheduler(config.LLM_MAX_CONCURRENCY, config.LLM_RATE_PER_SECOND, config.LLM_RATE_BURST)
+    return _scheduler
+
+
+def _stage_priorities(agent: BaseAgent) -> Iterator[tuple[LlmAgent, int]]:
+    """
+    (LlmAgent, priority) for every LlmAgent under agent. Stages of a
+    SequentialAgent rank by position from the end (last stage 1, the one
+    before it 2, ...), so calls of requests closer to finishing are admitted
+    first; agents below a stage inherit its rank, and agents outside any
+    sequence keep PRIORITY_INTERACTIVE.
+    """
+    for node, ancestry in walk_agents(agent):
+        if isinstance(node, LlmAgent):
+            priority = PRIORITY_INTERACTIVE
+            for parent, index, count in ancestry:
+                if isinstance(parent, SequentialAgent):
+                    priority = count - index
+            yield node, priority
+
+
+def apply_scheduler(agent: BaseAgent, scheduler: Optional[LlmScheduler] = None) -> list:
+    """
+    Wrap the model of every LlmAgent under agent in a ScheduledLlm (lazy stages
+    are built first).
+    Returns [(agent, original_model), ...] for restoring.
+    """
+    originals = []
+    for llm_agent, priority in _stage_priorities(agent):
+        inner = llm_agent.canonical_model
+        if isinstance(inner, ScheduledLlm):
+            inner = inner.inner
+        originals.append((llm_agent, llm_agent.model))
+        llm_agent.model = ScheduledLlm(
+            model=inner.model, inner=inner, priority=priority, stage=llm_agent.name, scheduler=scheduler
+        )
+    return originals
+
+
+def apply_configured_scheduler(agent: BaseAgent) -> None:
+    """Route agent's model calls through the process-wide scheduler (unless LLM_SCHEDULER_ENABLED=false)."""
+    if config.LLM_SCHEDULER_ENABLED:
+        apply_scheduler(agent)
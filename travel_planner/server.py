@@ -0,0 +1,55 @@
+"""
+HTTP server with a Server-Sent Events endpoint for progressive travel plans.
+
+Run from the project root:
+    uvicorn travel_planner.server:app --port 8080
+
+Then, e.g.:
+    curl -N "http://localhost:8080/plan/stream?message=Plan%20a%204-day%20trip%20to%20Goa%20with%20budget%2050000"
+"""
+import json
+import logging
+from typing import Any, AsyncGenerator, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from travel_planner.metrics import get_metrics
+from travel_planner.streaming import stream_plan
+
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="Smart Travel Planner")
+
+# Sent to the client when a plan fails; the details go to the server log only
+STREAM_ERROR_MESSAGE = "Sorry, something went wrong while planning your trip. Please try again."
+
+
+def sse_event(event: dict[str, Any]) -> str:
+    """One SSE frame: the event type as the SSE event name, the dict as JSON data."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+async def _sse(events: AsyncGenerator[dict[str, Any], None]) -> AsyncGenerator[str, None]:
+    try:
+        async for event in events:
+            yield sse_event(event)
+    except Exception:  # surface failures to the client instead of a cut stream
+        logger.exception("Plan stream failed")
+        yield sse_event({"type": "error", "error": STREAM_ERROR_MESSAGE})
+
+
+@app.get("/plan/stream")
+async def plan_stream(message: str, user_id: str = "user", session_id: Optional[str] = None) -> StreamingResponse:
+    """Stream stage outputs for one user message as text/event-stream."""
+    return StreamingResponse(
+        _sse(stream_plan(message, user_id=user_id, session_id=session_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> str:
+    """Pipeline latency, token and tool-call metrics in Prometheus text format."""
+    return get_metrics().to_prometheus()
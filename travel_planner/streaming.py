@@ -0,0 +1,102 @@
+"""
+Progressive streaming of travel plans.
+Runs the root agent and yields each pipeline stage's output as soon as the
+stage writes it to state (attractions_result, then hotel_estimate and
+transport_estimate, then final_plan), so clients can render the attractions
+while the remaining stages are still running.
+"""
+import time
+import uuid
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.runners import InMemoryRunner, Runner
+from google.genai import types
+
+APP_NAME = "travel_planner"
+
+# State keys written by the pipeline stages, in the order they complete
+STAGE_OUTPUT_KEYS = {
+    "attractions_result": "attractions",
+    "hotel_estimate": "accommodation",
+    "transport_estimate": "transport",
+    "final_plan": "itinerary",
+}
+
+_default_runner: Optional[Runner] = None
+
+
+def get_runner() -> Runner:
+    """Process-wide in-memory runner for the root agent, built on first use."""
+    global _default_runner
+    if _default_runner is None:
+        from travel_planner.agent import root_agent
+
+        _default_runner = InMemoryRunner(agent=root_agent, app_name=APP_NAME)
+    return _default_runner
+
+
+async def _session_id(runner: Runner, user_id: str, session_id: Optional[str]) -> str:
+    """Existing session id, or a newly created session (with session_id if given)."""
+    if session_id:
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+        if session is not None:
+            return session.id
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session_id or str(uuid.uuid4())
+    )
+    return session.id
+
+
+async def stream_plan(
+    message: str,
+    user_id: str = "user",
+    session_id: Optional[str] = None,
+    runner: Optional[Runner] = None,
+) -> AsyncGenerator[dict[str, Any], None]:
+    """
+    Run one user turn and yield progress events as dicts:
+
+    - {"type": "session", "session_id"}: first, so clients can continue the conversation.
+    - {"type": "stage", "stage", "key", "author", "text", "elapsed_ms"}: a stage
+      output (key in STAGE_OUTPUT_KEYS) as soon as it is written; a cached plan
+      arrives as a single "itinerary" stage.
+    - {"type": "message", "author", "text", "elapsed_ms"}: a direct reply
+      (greeting or clarifying question) when no plan is generated.
+    - {"type": "done", "stage_timings", "elapsed_ms"}: last, once the turn ends.
+    """
+    runner = runner or get_runner()
+    session_id = await _session_id(runner, user_id, session_id)
+    yield {"type": "session", "session_id": session_id}
+
+    started = time.perf_counter()
+    emitted: set[str] = set()
+    new_message = types.Content(role="user", parts=[types.Part(text=message)])
+    async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=new_message):
+        delta = event.actions.state_delta if event.actions else {}
+        stage_keys = [key for key in STAGE_OUTPUT_KEYS if key in delta and key not in emitted]
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        for key in stage_keys:
+            emitted.add(key)
+            yield {
+                "type": "stage",
+                "stage": STAGE_OUTPUT_KEYS[key],
+                "key": key,
+                "author": event.author,
+                "text": delta[key],
+                "elapsed_ms": elapsed_ms,
+            }
+        if not stage_keys and not emitted and event.is_final_response() and event.content and event.content.parts:
+            text = "".join(part.text or "" for part in event.content.parts).strip()
+            if text:
+                yield {"type": "message", "author": event.author, "text": text, "elapsed_ms": elapsed_ms}
+
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session_id
+    )
+    yield {
+        "type": "done",
+        "stage_timings": (session.state.get("stage_timings") if session else None) or {},
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -1,12 +1,25 @@
-"""Sub-agents for the Travel Planner pipeline."""
-from .attraction_agent import attraction_agent
-from .accommodation_agent import accommodation_agent
-from .transport_agent import transport_agent
-from .itinerary_agent import itinerary_agent
+"""Sub-agents for the Travel Planner pipeline, each built when first imported."""
+from travel_planner.lazy_imports import lazy_exports
 
 __all__ = [
     "attraction_agent",
+    "attraction_stage",
     "accommodation_agent",
     "transport_agent",
     "itinerary_agent",
+    "multi_city_itinerary_agent",
+    "tier_itinerary_agents",
 ]
+
+lazy_exports(
+    __name__,
+    {
+        "attraction_agent": "attraction_agent",
+        "attraction_stage": "attraction_agent",
+        "accommodation_agent": "accommodation_agent",
+        "transport_agent": "transport_agent",
+        "itinerary_agent": "itinerary_agent",
+        "multi_city_itinerary_agent": "itinerary_agent",
+        "tier_itinerary_agents": "itinerary_agent",
+    },
+)
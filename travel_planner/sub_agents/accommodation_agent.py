@@ -1,24 +1,41 @@
 """
-Accommodation sub-agent: estimates hotel cost using custom tool.
+Accommodation sub-agent: estimates hotel cost using custom tool, at the
+hotel tier the user asked for ("make it luxury") when there is one.
+The tool result is also published as the structured hotel_quote record.
 """
 from google.adk.agents import LlmAgent
 
-from travel_planner.config import GEMINI_MODEL
+from travel_planner import config
+from travel_planner.config import ACCOMMODATION_MODEL
+from travel_planner.handoff import publish_tool_record
+from travel_planner.metrics import record_model_usage, start_tool_timer, stop_tool_timer
+from travel_planner.model_tiering import agent_model
+from travel_planner.timing import start_stage_timer, stop_stage_timer
 from travel_planner.tools import hotel_cost_estimator
 
 accommodation_agent = LlmAgent(
     name="AccommodationAgent",
-    model=GEMINI_MODEL,
+    model=agent_model("AccommodationAgent", ACCOMMODATION_MODEL),
     description="Estimates accommodation cost for the trip.",
     instruction="""You are an accommodation expert.
-Use the output from the previous step (attractions_result) to get: destination (city), number of days, and budget.
+Trip details already parsed from the user's request (blank = not stated):
+- Destination: {destination?}
+- Days: {days?}
+- Budget: {budget?} {currency?}
+- Hotel tier asked for: {variants?}
+User request: {user_request?}
 
-Previous step output:
-{attractions_result}
-
-Extract the destination city, days, and budget (as a number in INR). If budget is not clearly in INR, assume INR.
-Call the hotel_cost_estimator tool with: city=<destination>, days=<days>, budget=<total budget>.
+Only if a value is blank, take it from the user request. If budget is not clearly in INR, assume INR.
+Call the hotel_cost_estimator tool with: city=<destination>, days=<days>, budget=<total budget>,
+and tier=<tier> when a hotel tier (budget, mid or luxury) was asked for above.
 Then summarize the accommodation estimate in one short paragraph: tier, per-night and total cost in INR.""",
+    # Needs only the parsed trip details above, not the other agents' transcripts
+    include_contents="none" if config.STRUCTURED_HANDOFF else "default",
     tools=[hotel_cost_estimator],
     output_key="hotel_estimate",
+    before_agent_callback=start_stage_timer,
+    after_agent_callback=stop_stage_timer,
+    after_model_callback=record_model_usage,
+    before_tool_callback=start_tool_timer,
+    after_tool_callback=[stop_tool_timer, publish_tool_record],
 )
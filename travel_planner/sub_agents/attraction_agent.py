@@ -1,26 +1,143 @@
 """
 Attraction sub-agent: finds top attractions using Google Search.
+The pipeline runs it behind the offline attraction index and a persistent
+cache (AttractionStage), so covered destinations and repeated destination +
+preference requests skip the search.
 """
-from google.adk.agents import LlmAgent
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 from google.adk.tools import google_search
+from google.genai import types
 
-from travel_planner.config import GEMINI_MODEL
+from travel_planner.attraction_cache import AttractionCache, get_attraction_cache
+from travel_planner.config import ATTRACTION_MODEL
+from travel_planner.handoff import attraction_shortlist
+from travel_planner.metrics import record_model_usage, start_tool_timer, stop_tool_timer
+from travel_planner.model_tiering import agent_model
+from travel_planner.timing import start_stage_timer, stop_stage_timer
+from travel_planner.tools.attraction_index import attraction_summary, search_local_attractions
 
 attraction_agent = LlmAgent(
     name="AttractionAgent",
-    model=GEMINI_MODEL,
+    model=agent_model("AttractionAgent", ATTRACTION_MODEL),
     description="Finds top attractions for a destination using web search.",
     instruction="""You are a travel attractions expert.
-From the user's message, identify: destination, number of days, budget (as a number), and preferences (e.g. adventure, beaches, culture, budget-friendly).
+Trip details already parsed from the user's request (blank = not stated):
+- Destination: {destination?}
+- Preferences: {preferences?}
+
+If the destination is blank, identify it from the user's message; if preferences are blank, infer them (e.g. adventure, beaches, culture, budget-friendly) or search for general highlights.
 Use the google_search tool to find top attractions, things to do, and must-see places for that destination. Search for current, relevant results.
 Then produce a single structured response in this format (use clear labels so the next agent can parse):
 - Destination: <city/region>
-- Days: <number>
-- Budget: <number> (in INR if not specified)
 - Preferences: <summary>
 - Top Attractions: <numbered or bullet list of attraction names and short description>
 
 Output only this structured summary. Be concise. List at least 5–8 attractions.""",
     tools=[google_search],
     output_key="attractions_result",
+    before_agent_callback=start_stage_timer,
+    after_agent_callback=stop_stage_timer,
+    after_model_callback=record_model_usage,
+    before_tool_callback=start_tool_timer,
+    after_tool_callback=stop_tool_timer,
+)
+
+
+class CachedAttractionAgent(BaseAgent):
+    """
+    Runs the attraction agent behind the offline index and the attraction cache.
+
+    Looks up state["destination"] + state["preferences"] (written by the router)
+    before the agent (and its google_search calls) runs: first in the offline
+    attraction index, then in the cache. On a hit the summary is published as
+    attractions_result directly, on a miss the agent runs and the
+    attractions_result that run writes is stored in the cache. Without a parsed destination the
+    agent always runs uncached. Either way the parsed attraction names are
+    published as the attraction_shortlist record (None if none were found).
+
+    A fixed destination (with the agent's output_key and a shortlist_key of its
+    own) runs the stage for one city of a multi-city trip regardless of
+    state["destination"].
+    """
+
+    agent: BaseAgent
+    cache: Optional[AttractionCache] = None
+    destination: Optional[str] = None
+    output_key: str = "attractions_result"
+    shortlist_key: str = "attraction_shortlist"
+
+    def __init__(
+        self,
+        name: str,
+        agent: BaseAgent,
+        cache: Optional[AttractionCache] = None,
+        **kwargs,
+    ):
+        super().__init__(name=name, agent=agent, cache=cache, sub_agents=[agent], **kwargs)
+
+    def _published(self, ctx: InvocationContext, destination: str, summary: str) -> Event:
+        """Event publishing a ready summary and its shortlist, as the agent's run would."""
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=summary)]),
+            actions=EventActions(
+                state_delta={
+                    self.output_key: summary,
+                    self.shortlist_key: attraction_shortlist(summary, destination),
+                }
+            ),
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        destination = self.destination or state.get("destination")
+        preferences = state.get("preferences") or []
+        cache = self.cache or get_attraction_cache()
+
+        if destination:
+            local = search_local_attractions(destination, preferences)
+            if local["found"]:
+                yield self._published(ctx, destination, attraction_summary(local, preferences))
+                return
+
+        if cache is not None and destination:
+            cached = cache.get(destination, preferences)
+            if cached is not None:
+                yield self._published(ctx, destination, cached)
+                return
+
+        result = None
+        async for event in self.agent.run_async(ctx):
+            # State may still hold an earlier destination's summary; only this run's is cached
+            written = event.actions.state_delta.get(self.output_key) if event.actions else None
+            if written:
+                result = written
+            yield event
+
+        if cache is not None and destination and result:
+            cache.put(destination, preferences, result)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(
+                state_delta={self.shortlist_key: attraction_shortlist(result or "", destination)}
+            ),
+        )
+
+
+attraction_stage = CachedAttractionAgent(
+    name="AttractionStage",
+    description="Finds top attractions, serving covered destinations from the offline index and repeated requests from the attraction cache.",
+    agent=attraction_agent,
+    before_agent_callback=start_stage_timer,
+    after_agent_callback=stop_stage_timer,
 )
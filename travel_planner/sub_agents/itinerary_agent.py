@@ -1,27 +1,34 @@
 """
 Itinerary sub-agent: allocates budget and generates day-by-day itinerary.
+With STRUCTURED_HANDOFF (default) its prompt is built from the compact stage
+records (attraction_shortlist, hotel_quote, transport_quote) instead of the
+three free-text stage outputs. MultiCityItineraryAgent writes up the merged
+plan of a multi-city trip (see multi_city.py), and one ItineraryAgent_<tier>
+per hotel tier writes that tier's plan of a variants comparison (see
+variants.py).
 """
+import json
+from typing import Any, Callable
+
 from google.adk.agents import LlmAgent
+from google.adk.agents.readonly_context import ReadonlyContext
 
-from travel_planner.config import GEMINI_MODEL
+from travel_planner import config
+from travel_planner.config import ITINERARY_MODEL
+from travel_planner.metrics import record_model_usage, start_tool_timer, stop_tool_timer
+from travel_planner.model_tiering import agent_model
+from travel_planner.timing import start_stage_timer, stop_stage_timer
 from travel_planner.tools import budget_allocator, itinerary_generator
+from travel_planner.tools.hotel_cost_estimator import TIER_RATES
 
-itinerary_agent = LlmAgent(
-    name="ItineraryAgent",
-    model=GEMINI_MODEL,
-    description="Allocates budget and creates day-by-day itinerary.",
-    instruction="""You are an itinerary and budget expert.
-You have three previous outputs:
-1) Attractions: {attractions_result}
-2) Hotel estimate: {hotel_estimate}
-3) Transport estimate: {transport_estimate}
+# How each hotel tier is presented in plan variants
+TIER_LABELS = {"budget": "Budget", "mid": "Comfort (mid-range)", "luxury": "Luxury"}
 
-From these, extract: destination, days (number), total_budget (number in INR), hotel_cost (number), transport_cost (number), and a list of attraction names.
+_COORDINATES_HINT = """If you know approximate coordinates for the attractions, pass them as objects instead, e.g. {"name": "Fort Aguada", "latitude": 15.49, "longitude": 73.77, "visit_minutes": 90}, so each day is grouped by area and timed."""
 
-Step 1: Call budget_allocator(total_budget=..., hotel_cost=..., transport_cost=...) to get budget allocation.
-Step 2: Call itinerary_generator(destination=..., attractions=[list of attraction names], days=...) to get the day-by-day plan.
+_SELECTION_HINT = """If you know approximate entry costs, also pass attractions=[{"name": ..., "entry_cost": ..., "visit_minutes": ..., "score": <1-5, fit with the preferences>}, ...] and days=<days> to budget_allocator: it returns selected_attractions, the best set that fits the activities budget and the days. Then give itinerary_generator those selected_attractions instead of the full list."""
 
-Then produce the final travel plan in this exact structure:
+_PLAN_FORMAT = """Then produce the final travel plan in this exact structure:
 
 ## Estimated Costs Breakdown
 <summary of hotel + transport from tools>
@@ -35,7 +42,210 @@ Then produce the final travel plan in this exact structure:
 ## Day-by-Day Itinerary
 <output from itinerary_generator, formatted clearly>
 
-Output only this formatted plan. No extra preamble.""",
+Output only this formatted plan. No extra preamble."""
+
+# Original prompt: the model re-extracts costs and names from the stage outputs
+FREE_TEXT_INSTRUCTION = f"""You are an itinerary and budget expert.
+Trip details already parsed from the user's request (blank = not stated):
+- Destination: {{destination?}}
+- Days: {{days?}}
+- Total budget: {{budget?}} {{currency?}}
+
+You have three previous outputs:
+1) Attractions: {{attractions_result}}
+2) Hotel estimate: {{hotel_estimate}}
+3) Transport estimate: {{transport_estimate}}
+
+From these, extract: hotel_cost (number), transport_cost (number), and a list of attraction names. Only if a trip detail above is blank, take it from the previous outputs or the user's message.
+
+Step 1: Call budget_allocator(total_budget=..., hotel_cost=..., transport_cost=...) to get budget allocation. {_SELECTION_HINT}
+Step 2: Call itinerary_generator(destination=..., attractions=[list of attraction names], days=...) to get the day-by-day plan. {_COORDINATES_HINT}
+
+{_PLAN_FORMAT}"""
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def structured_instruction(context: ReadonlyContext) -> str:
+    """
+    Prompt from the stage records: only attraction names and the quote totals
+    the tools need. A stage whose record is missing falls back to its
+    free-text output.
+    """
+    state = context.state
+
+    def value(key: str) -> str:
+        found = state.get(key)
+        return "" if found is None else str(found)
+
+    shortlist = state.get("attraction_shortlist")
+    hotel, transport = state.get("hotel_quote"), state.get("transport_quote")
+    records = [
+        f"attractions: {_compact(shortlist['names'])}" if shortlist else f"attractions (text): {value('attractions_result')}",
+        f"hotel_quote: {_compact(hotel)}" if hotel else f"hotel estimate (text): {value('hotel_estimate')}",
+        f"transport_quote: {_compact(transport)}" if transport else f"transport estimate (text): {value('transport_estimate')}",
+    ]
+    records_text = "\n".join(records)
+    return f"""You are an itinerary and budget expert.
+Trip details already parsed from the user's request (blank = not stated):
+- Destination: {value('destination')}
+- Days: {value('days')}
+- Total budget: {value('budget')} {value('currency')}
+User request: {value('user_request')}
+
+Stage results:
+{records_text}
+
+Step 1: Call budget_allocator(total_budget=<total budget>, hotel_cost=<hotel_quote.total>, transport_cost=<transport_quote.total>). {_SELECTION_HINT}
+Step 2: Call itinerary_generator(destination=<destination>, attractions=<attraction names>, days=<days>). {_COORDINATES_HINT}
+
+{_PLAN_FORMAT.replace("<list from attractions_result>", "<the attraction names, one per line>")}"""
+
+
+itinerary_agent = LlmAgent(
+    name="ItineraryAgent",
+    model=agent_model("ItineraryAgent", ITINERARY_MODEL),
+    description="Allocates budget and creates day-by-day itinerary.",
+    instruction=structured_instruction if config.STRUCTURED_HANDOFF else FREE_TEXT_INSTRUCTION,
+    # The stage records carry everything needed; skip the other agents' transcripts
+    include_contents="none" if config.STRUCTURED_HANDOFF else "default",
     tools=[budget_allocator, itinerary_generator],
     output_key="final_plan",
+    before_agent_callback=start_stage_timer,
+    after_agent_callback=stop_stage_timer,
+    after_model_callback=record_model_usage,
+    before_tool_callback=start_tool_timer,
+    after_tool_callback=stop_tool_timer,
 )
+
+
+def multi_city_instruction(context: ReadonlyContext) -> str:
+    """
+    Prompt for a multi-city trip: budget_allocator and itinerary_generator
+    have already run in MultiCityStage, so the model only writes up the
+    per-city records, the legs and the merged itinerary.
+    """
+    state = context.state
+
+    def value(key: str) -> str:
+        found = state.get(key)
+        return "" if found is None else str(found)
+
+    stops, legs = state.get("city_stops") or [], state.get("trip_legs") or []
+    route = " → ".join(
+        [legs[0]["origin"]] + [f"{s['city']} ({s['days']} days)" for s in stops] + [legs[-1]["destination"]]
+    ) if legs else value("destination")
+    return f"""You are an itinerary and budget expert.
+Multi-city trip parsed from the user's request:
+- Destination: {value('destination')}
+- Route: {route}
+- Days: {value('days')}
+- Total budget: {value('budget')} {value('currency')}
+User request: {value('user_request')}
+
+Stage results:
+cities: {_compact(stops)}
+legs: {_compact(legs)}
+budget_allocation: {_compact(state.get('budget_allocation'))}
+
+Itinerary (days numbered across the whole trip):
+{value('multi_city_itinerary')}
+
+Produce the final travel plan in this exact structure:
+
+## Route
+<the cities in order with their days, and each leg's mode and fare>
+
+## Estimated Costs Breakdown
+<hotel per city, inter-city legs and local transport, with totals>
+
+## Top Attractions
+<per city, the attraction names, one per line>
+
+## Budget Allocation
+<from budget_allocation: remaining, activities, food>
+
+## Day-by-Day Itinerary
+<the itinerary above, formatted clearly, keeping its day numbering>
+
+Output only this formatted plan. No extra preamble."""
+
+
+multi_city_itinerary_agent = LlmAgent(
+    name="MultiCityItineraryAgent",
+    model=agent_model("MultiCityItineraryAgent", ITINERARY_MODEL),
+    description="Writes up the merged plan of a multi-city trip.",
+    instruction=multi_city_instruction,
+    include_contents="none",
+    output_key="final_plan",
+    before_agent_callback=start_stage_timer,
+    after_agent_callback=stop_stage_timer,
+    after_model_callback=record_model_usage,
+)
+
+
+def tier_instruction(tier: str) -> Callable[[ReadonlyContext], str]:
+    """
+    Prompt for one tier of a variants comparison: the tier's hotel quote and
+    budget allocation (state["tier_variants"]) with the shared transport
+    quote and itinerary, all computed in TierVariantsStage.
+    """
+
+    def instruction(context: ReadonlyContext) -> str:
+        state = context.state
+
+        def value(key: str) -> str:
+            found = state.get(key)
+            return "" if found is None else str(found)
+
+        variant = (state.get("tier_variants") or {}).get(tier) or {}
+        shortlist = state.get("attraction_shortlist")
+        return f"""You are an itinerary and budget expert.
+Write the {TIER_LABELS[tier]} option of this trip; other options are written separately.
+Trip details parsed from the user's request:
+- Destination: {value('destination')}
+- Days: {value('days')}
+- Total budget: {value('budget')} {value('currency')}
+User request: {value('user_request')}
+
+Stage results:
+attractions: {_compact(shortlist['names'] if shortlist else [])}
+hotel_quote: {_compact(variant.get('hotel_quote'))}
+transport_quote: {_compact(state.get('transport_quote'))}
+budget_allocation: {_compact(variant.get('budget_allocation'))}
+
+Itinerary (shared by all options):
+{value('variants_itinerary')}
+
+Produce the plan for this option in this exact structure:
+
+## Where to Stay
+<the hotel tier, nightly rate and total; what kind of stay to book at this level>
+
+## Budget Allocation
+<from budget_allocation: remaining, activities, food; say if it does not fit the budget>
+
+## Day-by-Day Itinerary
+<the itinerary above, with food and activity suggestions suited to this price level>
+
+Output only this formatted plan. No extra preamble."""
+
+    return instruction
+
+
+# One plan writer per hotel tier; plan variants run the requested ones concurrently
+tier_itinerary_agents = {
+    tier: itinerary_agent.clone(
+        update={
+            "name": f"ItineraryAgent_{tier}",
+            "description": f"Writes the {TIER_LABELS[tier]} option of a plan variants comparison.",
+            "instruction": tier_instruction(tier),
+            "include_contents": "none",
+            "tools": [],
+            "output_key": f"final_plan_{tier}",
+        }
+    )
+    for tier in TIER_RATES
+}
@@ -1,23 +1,37 @@
 """
 Transport sub-agent: estimates transport cost using custom tool.
+The tool result is also published as the structured transport_quote record.
 """
 from google.adk.agents import LlmAgent
 
-from travel_planner.config import GEMINI_MODEL
+from travel_planner import config
+from travel_planner.config import TRANSPORT_MODEL
+from travel_planner.handoff import publish_tool_record
+from travel_planner.metrics import record_model_usage, start_tool_timer, stop_tool_timer
+from travel_planner.model_tiering import agent_model
+from travel_planner.timing import start_stage_timer, stop_stage_timer
 from travel_planner.tools import transport_cost_estimator
 
 transport_agent = LlmAgent(
     name="TransportAgent",
-    model=GEMINI_MODEL,
+    model=agent_model("TransportAgent", TRANSPORT_MODEL),
     description="Estimates flight and local transport cost.",
     instruction="""You are a transport expert.
-Use the previous outputs to get destination. The user may have mentioned an origin city; if not, assume a common origin like "Mumbai" for Indian destinations.
+Trip details already parsed from the user's request (blank = not stated):
+- Origin: {origin?}
+- Destination: {destination?}
+User request: {user_request?}
 
-Previous step (attractions) mentioned destination:
-{attractions_result}
-
-Extract the destination. Use origin="Mumbai" (or the user's origin if clearly stated). Call transport_cost_estimator(origin=<origin>, destination=<destination>).
+If the destination is blank, take it from the user request. If the origin is blank, assume a common origin like "Mumbai" for Indian destinations.
+Call transport_cost_estimator(origin=<origin>, destination=<destination>).
 Summarize the transport estimate: flights and local transport, total in INR.""",
+    # Needs only the parsed trip details above, not the other agents' transcripts
+    include_contents="none" if config.STRUCTURED_HANDOFF else "default",
     tools=[transport_cost_estimator],
     output_key="transport_estimate",
+    before_agent_callback=start_stage_timer,
+    after_agent_callback=stop_stage_timer,
+    after_model_callback=record_model_usage,
+    before_tool_callback=start_tool_timer,
+    after_tool_callback=[stop_tool_timer, publish_tool_record],
 )
@@ -0,0 +1,76 @@
+"""
+Stage-level timing for the travel planning pipeline.
+Agent callbacks record wall-clock time per sub-agent so the sequential and
+parallel pipeline modes can be compared on real runs. Timings also feed the
+latency histograms and per-request records in metrics.py.
+"""
+import logging
+import time
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from travel_planner import config
+from travel_planner.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# (invocation_id, agent_name) -> perf_counter at stage start
+_stage_starts: dict[tuple[str, str], float] = {}
+# invocation_id -> {agent_name: elapsed ms}
+_stage_timings: dict[str, dict[str, float]] = {}
+
+
+def start_stage_timer(callback_context: CallbackContext) -> Optional[types.Content]:
+    """before_agent_callback: remember when this stage started."""
+    key = (callback_context.invocation_id, callback_context.agent_name)
+    _stage_starts[key] = time.perf_counter()
+    return None
+
+
+def stop_stage_timer(callback_context: CallbackContext) -> Optional[types.Content]:
+    """after_agent_callback: record how long this stage took (in ms)."""
+    key = (callback_context.invocation_id, callback_context.agent_name)
+    started = _stage_starts.pop(key, None)
+    if started is None:
+        return None
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    _stage_timings.setdefault(callback_context.invocation_id, {})[
+        callback_context.agent_name
+    ] = elapsed_ms
+    logger.info("Stage %s finished in %.1f ms", callback_context.agent_name, elapsed_ms)
+    if config.METRICS_ENABLED:
+        get_metrics().record_stage(callback_context.agent_name, elapsed_ms)
+    return None
+
+
+def publish_stage_timings(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    after_agent_callback for the pipeline itself.
+    Stops the pipeline timer and writes all stage timings of this run to
+    session state under "stage_timings"; with metrics enabled, the run's
+    per-stage tokens and tool calls go to "request_metrics" and the sinks.
+    """
+    stop_stage_timer(callback_context)
+    invocation_id = callback_context.invocation_id
+    for key in [k for k in _stage_starts if k[0] == invocation_id]:
+        del _stage_starts[key]
+    timings = _stage_timings.pop(invocation_id, {})
+    if timings:
+        callback_context.state["stage_timings"] = timings
+    if config.METRICS_ENABLED:
+        metrics = get_metrics()
+        record = metrics.finish_request(invocation_id, timings, callback_context.agent_name)
+        metrics.export(record)
+        callback_context.state["request_metrics"] = {"stages": record["stages"], "totals": record["totals"]}
+    return None
+
+
+def discard_stage_timers(invocation_id: str) -> None:
+    """Drop the timers of a run that ended without publish_stage_timings (failed or cancelled)."""
+    for key in [k for k in _stage_starts if k[0] == invocation_id]:
+        del _stage_starts[key]
+    _stage_timings.pop(invocation_id, None)
+    if config.METRICS_ENABLED:
+        get_metrics().discard_request(invocation_id)
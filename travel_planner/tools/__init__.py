@@ -1,9 +1,5 @@
-"""Custom tools for the Travel Planner."""
-from .hotel_cost_estimator import hotel_cost_estimator
-from .transport_cost_estimator import transport_cost_estimator
-from .budget_allocator import budget_allocator
-from .itinerary_generator import itinerary_generator
-from .travel_intent import get_travel_intent
+"""Custom tools for the Travel Planner, each imported on first use."""
+from travel_planner.lazy_imports import lazy_exports
 
 __all__ = [
     "hotel_cost_estimator",
@@ -11,4 +7,18 @@ __all__ = [
     "budget_allocator",
     "itinerary_generator",
     "get_travel_intent",
+    "search_local_attractions",
 ]
+
+# The router only needs get_travel_intent, which does not load NumPy
+lazy_exports(
+    __name__,
+    {
+        "hotel_cost_estimator": "hotel_cost_estimator",
+        "transport_cost_estimator": "transport_cost_estimator",
+        "budget_allocator": "budget_allocator",
+        "itinerary_generator": "itinerary_generator",
+        "get_travel_intent": "travel_intent",
+        "search_local_attractions": "attraction_index",
+    },
+)
@@ -0,0 +1,335 @@
+"""
+Offline attraction index.
+A bundled corpus of attractions (data/attractions.csv: city, name, preference
+tags, entry cost, visit time, description) is indexed into an inverted index
+with BM25 ranking. Documents are grouped by city and each term's postings are
+sorted by document, so a query only scores its city's slice. The index arrays
+are saved as .npy files under a directory keyed by INDEX_VERSION and the
+corpus fingerprint, and memory-mapped on load: a new corpus gets a new index,
+and startup reads no more than the pages a query touches. Queries take
+microseconds and make no external call.
+"""
+import csv
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from collections import Counter
+from typing import Any, List, NamedTuple, Optional
+
+import numpy as np
+
+from travel_planner import config
+
+from .rate_tables import DATA_DIR, load_rate_tables, normalize_place
+from .travel_intent import PREFERENCE_KEYWORDS
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout or the tokenizer changes
+INDEX_VERSION = 1
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+# A preference tag counts as this many occurrences of the tag term
+TAG_WEIGHT = 3
+DEFAULT_LIMIT = 8
+# Destinations with fewer indexed attractions fall back to the search agent
+MIN_RESULTS = 5
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_ARRAYS = ("doc_len", "city_offsets", "term_offsets", "post_doc", "post_tf", "idf")
+
+
+class IndexedAttraction(NamedTuple):
+    city: str
+    name: str
+    tags: tuple[str, ...]
+    entry_cost: int
+    visit_minutes: int
+    description: str
+
+
+def _stem(token: str) -> str:
+    """Plural to singular, enough for "beaches"/"beach" and "forts"/"fort" to meet."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 4 and token.endswith(("ches", "shes", "sses", "xes")):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    return [_stem(token) for token in _TOKEN_RE.findall(str(text).lower())]
+
+
+def _tag_term(tag: str) -> str:
+    return "#" + normalize_place(tag).replace(" ", "-")
+
+
+def query_terms(preferences: Optional[List[str]] = None, query: str = "") -> list[str]:
+    """
+    Query terms for preference tags and free text: a known tag expands to its
+    tag term plus the words that imply it (see PREFERENCE_KEYWORDS).
+    """
+    terms: list[str] = []
+    for preference in preferences or ():
+        tag = normalize_place(preference).replace(" ", "-")
+        terms.append(_tag_term(tag))
+        for keyword in PREFERENCE_KEYWORDS.get(tag, (preference,)):
+            terms.extend(tokenize(keyword))
+    terms.extend(tokenize(query))
+    return terms
+
+
+def load_corpus(path: str) -> list[IndexedAttraction]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            IndexedAttraction(
+                city=row["city"].strip(),
+                name=row["name"].strip(),
+                tags=tuple(t.strip() for t in (row.get("tags") or "").split("|") if t.strip()),
+                entry_cost=int(float(row.get("entry_cost") or 0)),
+                visit_minutes=int(float(row.get("visit_minutes") or 0)),
+                description=(row.get("description") or "").strip(),
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+def _fingerprint(path: str) -> str:
+    digest = hashlib.sha1(f"v{INDEX_VERSION},k1={BM25_K1},b={BM25_B},tag={TAG_WEIGHT}".encode())
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class AttractionIndex:
+    """
+    Inverted index over the attraction corpus.
+
+    Documents are sorted by city (city_offsets[c]:city_offsets[c + 1] is city
+    c's range); postings are CSR arrays (term_offsets, post_doc, post_tf) with
+    each term's documents in ascending order. search() resolves the destination
+    (corpus city, then the rate tables' names, aliases and misspellings) and
+    ranks that city's attractions by BM25 against the query terms, ties and
+    unmatched attractions in corpus order.
+    """
+
+    def __init__(self, docs: list[IndexedAttraction], cities: list[str], vocab: list[str],
+                 arrays: dict[str, np.ndarray], avg_len: float, version: str):
+        self.docs = docs
+        self.cities = cities
+        self.city_index = {normalize_place(city): i for i, city in enumerate(cities)}
+        self.terms = {term: i for i, term in enumerate(vocab)}
+        self.vocab = vocab
+        self.arrays = arrays
+        self.avg_len = avg_len
+        self.version = version
+        self._aliases: Optional[dict[str, int]] = None
+        for name, value in arrays.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def build(cls, docs: list[IndexedAttraction], version: str = "") -> "AttractionIndex":
+        docs = sorted(docs, key=lambda d: normalize_place(d.city))  # stable: corpus order within a city
+        cities = list(dict.fromkeys(d.city for d in docs))
+        city_of = {normalize_place(city): i for i, city in enumerate(cities)}
+        city_offsets = np.zeros(len(cities) + 1, dtype=np.int64)
+        for doc in docs:
+            city_offsets[city_of[normalize_place(doc.city)] + 1] += 1
+        city_offsets = np.cumsum(city_offsets)
+
+        counts = []
+        for doc in docs:
+            terms = Counter(tokenize(f"{doc.name} {doc.description}"))
+            for tag in doc.tags:
+                terms[_tag_term(tag)] += TAG_WEIGHT
+                terms.update(tokenize(tag))
+            counts.append(terms)
+        vocab = sorted({term for terms in counts for term in terms})
+        term_id = {term: i for i, term in enumerate(vocab)}
+
+        postings: list[list[tuple[int, int]]] = [[] for _ in vocab]
+        for d, terms in enumerate(counts):
+            for term, tf in terms.items():
+                postings[term_id[term]].append((d, tf))
+        term_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        term_offsets[1:] = np.cumsum([len(p) for p in postings])
+        post_doc = np.array([d for p in postings for d, _ in p], dtype=np.int32)
+        post_tf = np.array([tf for p in postings for _, tf in p], dtype=np.float32)
+        doc_len = np.array([sum(terms.values()) for terms in counts], dtype=np.float32)
+        df = np.diff(term_offsets).astype(np.float64)
+        idf = np.log(1 + (len(docs) - df + 0.5) / (df + 0.5)).astype(np.float32)
+        arrays = {
+            "doc_len": doc_len,
+            "city_offsets": city_offsets,
+            "term_offsets": term_offsets,
+            "post_doc": post_doc,
+            "post_tf": post_tf,
+            "idf": idf,
+        }
+        return cls(docs, cities, vocab, arrays, float(doc_len.mean()) if len(docs) else 0.0, version)
+
+    @classmethod
+    def load_or_build(cls, corpus_path: str, index_dir: Optional[str] = None) -> "AttractionIndex":
+        """Memory-map the index for this corpus from index_dir, building and saving it on a miss."""
+        version = _fingerprint(corpus_path)
+        path = None
+        if index_dir:
+            path = os.path.join(index_dir, f"attraction_index_v{INDEX_VERSION}_{version}")
+            if os.path.isdir(path):
+                try:
+                    return cls._load(path, version)
+                except (OSError, ValueError, KeyError):
+                    logger.warning("Ignoring unreadable attraction index %s", path)
+        index = cls.build(load_corpus(corpus_path), version)
+        if path:
+            try:
+                index._save(path)
+            except OSError:
+                logger.warning("Could not write attraction index %s", path)
+        return index
+
+    @classmethod
+    def _load(cls, path: str, version: str) -> "AttractionIndex":
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+        docs = [IndexedAttraction(d[0], d[1], tuple(d[2]), d[3], d[4], d[5]) for d in meta["docs"]]
+        return cls(docs, meta["cities"], meta["vocab"], arrays, meta["avg_len"], version)
+
+    def _save(self, path: str) -> None:
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent, prefix=".attraction_index_")
+        try:
+            for name in _ARRAYS:
+                np.save(os.path.join(staging, f"{name}.npy"), self.arrays[name])
+            with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(
+                    {"cities": self.cities, "vocab": self.vocab, "avg_len": self.avg_len,
+                     "docs": [list(doc) for doc in self.docs]},
+                    f,
+                )
+            os.rename(staging, path)  # atomic: readers see a complete index or none
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(path):  # another process won the race
+                raise
+
+    def city_slot(self, destination: str) -> Optional[int]:
+        """Corpus city for a destination name, alias or misspelling; None if not covered."""
+        key = normalize_place(destination or "")
+        if key in self.city_index:
+            return self.city_index[key]
+        if self._aliases is None:
+            tables = load_rate_tables()
+            aliases = {}
+            for city, slot in self.city_index.items():
+                resolved = tables.resolve_city(city)
+                if resolved is not None:
+                    aliases.setdefault(normalize_place(resolved.name), slot)
+            self._aliases = aliases
+        resolved = load_rate_tables().resolve_city(key)
+        return self._aliases.get(normalize_place(resolved.name)) if resolved is not None else None
+
+    def search(self, destination: str, terms: List[str], limit: int = DEFAULT_LIMIT) -> list[tuple[IndexedAttraction, float]]:
+        """Up to limit (attraction, BM25 score) pairs for the destination, best first."""
+        slot = self.city_slot(destination)
+        if slot is None or limit <= 0:
+            return []
+        lo, hi = int(self.city_offsets[slot]), int(self.city_offsets[slot + 1])
+        scores = np.zeros(hi - lo, dtype=np.float32)
+        # avg_len is 0 when every document is empty (no terms to score anyway)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[lo:hi] / (self.avg_len or 1.0))
+        for term, weight in Counter(terms).items():
+            t = self.terms.get(term)
+            if t is None:
+                continue
+            start, end = int(self.term_offsets[t]), int(self.term_offsets[t + 1])
+            docs = self.post_doc[start:end]
+            a, b = np.searchsorted(docs, (lo, hi))
+            local = docs[a:b] - lo
+            tf = self.post_tf[start + a : start + b]
+            scores[local] += weight * self.idf[t] * tf * (BM25_K1 + 1) / (tf + norm[local])
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [(self.docs[lo + i], float(scores[i])) for i in order]
+
+
+@functools.lru_cache(maxsize=None)
+def _load_index(corpus_path: str, index_dir: str) -> AttractionIndex:
+    return AttractionIndex.load_or_build(corpus_path, index_dir or None)
+
+
+def get_attraction_index() -> Optional[AttractionIndex]:
+    """Process-wide index for the configured corpus, loaded on first use (None when disabled)."""
+    if not config.ATTRACTION_INDEX_ENABLED:
+        return None
+    corpus_path = config.ATTRACTION_CORPUS_PATH or os.path.join(DATA_DIR, "attractions.csv")
+    try:
+        return _load_index(corpus_path, config.ATTRACTION_INDEX_DIR)
+    except (OSError, ValueError, KeyError):
+        logger.warning("Attraction index unavailable for %s", corpus_path)
+        return None
+
+
+def search_local_attractions(
+    destination: str, preferences: Optional[List[str]] = None, query: str = "", limit: int = DEFAULT_LIMIT
+) -> dict[str, Any]:
+    """
+    Look up top attractions for a destination in the offline attraction index.
+
+    Args:
+        destination: City or region (e.g. "Goa", "Jaipur").
+        preferences: Optional preference tags (e.g. ["beaches", "nightlife"]).
+        query: Optional free text to match against names and descriptions.
+        limit: Maximum number of attractions to return (at least 1).
+
+    Returns:
+        Dict with destination, found (False when the destination is not in
+        the index or has fewer than MIN_RESULTS attractions; search the web
+        instead), corpus_version and attractions: [{"name", "description",
+        "tags", "entry_cost", "visit_minutes", "score"}, ...], best match
+        first. score (1-5) is the match with the preferences, so the list can
+        go straight to budget_allocator.
+    """
+    limit = max(1, int(limit))
+    index = get_attraction_index()
+    hits = index.search(destination, query_terms(preferences, query), limit) if index is not None else []
+    top = max((score for _, score in hits), default=0.0)
+    return {
+        "destination": hits[0][0].city if hits else destination,
+        "found": len(hits) >= min(MIN_RESULTS, limit),
+        "corpus_version": index.version if index is not None else None,
+        "attractions": [
+            {
+                "name": doc.name,
+                "description": doc.description,
+                "tags": list(doc.tags),
+                "entry_cost": doc.entry_cost,
+                "visit_minutes": doc.visit_minutes,
+                "score": round(1 + 4 * score / top, 2) if top > 0 else 1.0,
+            }
+            for doc, score in hits
+        ],
+    }
+
+
+def attraction_summary(result: dict[str, Any], preferences: Optional[List[str]] = None) -> str:
+    """search_local_attractions result in AttractionAgent's structured summary format."""
+    lines = [
+        f"- Destination: {result['destination']}",
+        f"- Preferences: {', '.join(preferences) if preferences else 'general highlights'}",
+        "- Top Attractions:",
+    ]
+    for i, item in enumerate(result["attractions"], 1):
+        cost = f"entry ~{item['entry_cost']} INR" if item["entry_cost"] else "free entry"
+        lines.append(f"{i}. {item['name']} – {item['description']} ({cost}, ~{item['visit_minutes']} min)")
+    return "\n".join(lines)
@@ -0,0 +1,138 @@
+"""
+Budget-constrained attraction selection.
+Picks the subset of candidate attractions with the highest total preference
+score whose entry costs fit the activities budget and whose visits fit the
+trip's sightseeing hours: a 0/1 knapsack with two capacities, solved by
+dynamic programming over a (cost, time) grid in NumPy. Costs and durations
+are rounded up to grid steps sized so the grid stays within MAX_COST_STEPS x
+MAX_TIME_STEPS cells, so every selection is feasible and hundreds of
+candidates solve in milliseconds.
+"""
+import math
+from typing import Any, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .itinerary_optimizer import DAY_END, DAY_FILL, DAY_START, parse_coordinate, parse_minutes, parse_number
+
+# Grid resolution: cost and time are measured in at most this many steps
+MAX_COST_STEPS = 200
+MAX_TIME_STEPS = 100
+DEFAULT_SCORE = 1.0
+
+# Alternative spellings of the fields a normalized selected attraction carries
+_ALIASES = ("cost", "price", "duration_minutes", "preference_score", "lat", "lon", "lng")
+
+
+class Candidate(NamedTuple):
+    name: str
+    entry_cost: float
+    visit_minutes: int
+    score: float
+
+
+def candidate_from_dict(item: dict[str, Any]) -> Candidate:
+    """
+    Candidate from a tool-call dict: name, entry_cost (or cost/price),
+    visit_minutes (or duration_minutes), score. Values may be model-written
+    text: "₹500" costs 500, "free" or an unreadable cost 0, "2 hours" 120
+    minutes; an unreadable duration or score gets the default.
+    """
+    cost = item.get("entry_cost", item.get("cost", item.get("price")))
+    minutes = item.get("visit_minutes", item.get("duration_minutes"))
+    score = item.get("score", item.get("preference_score"))
+    return Candidate(
+        name=str(item.get("name") or "Attraction").strip(),
+        entry_cost=max(0.0, parse_number(cost, 0.0)),
+        visit_minutes=parse_minutes(minutes),
+        score=parse_number(score, DEFAULT_SCORE),
+    )
+
+
+def _normalized(item: dict[str, Any], candidate: Candidate) -> dict[str, Any]:
+    """
+    item with the values the selection read: numeric entry_cost, visit_minutes
+    and score under their canonical names, and latitude/longitude only when
+    they parse, so it can go straight to itinerary_generator.
+    """
+    normalized = {key: value for key, value in item.items() if key not in _ALIASES}
+    normalized.update(
+        name=candidate.name,
+        entry_cost=candidate.entry_cost,
+        visit_minutes=candidate.visit_minutes,
+        score=candidate.score,
+    )
+    normalized.pop("latitude", None)
+    normalized.pop("longitude", None)
+    lat = parse_coordinate(item.get("latitude", item.get("lat")), 90)
+    lon = parse_coordinate(item.get("longitude", item.get("lon", item.get("lng"))), 180)
+    if lat is not None and lon is not None:
+        normalized.update(latitude=lat, longitude=lon)
+    return normalized
+
+
+def sightseeing_minutes(days: int) -> float:
+    """Visiting time of a trip: each day's window, less the share DAY_FILL leaves for getting around."""
+    return days * (DAY_END - DAY_START) * DAY_FILL
+
+
+def _steps(values: np.ndarray, capacity: float, max_steps: int) -> tuple[np.ndarray, int]:
+    """Values rounded up to grid steps, and the capacity in whole steps (rounded down)."""
+    step = max(1.0, math.ceil(capacity / max_steps)) if capacity > 0 else 1.0
+    return np.ceil(values / step).astype(np.int64), int(capacity // step)
+
+
+def select_attractions(
+    attractions: Sequence[dict[str, Any]], budget: float, minutes: Optional[float] = None
+) -> dict[str, Any]:
+    """
+    Best-scoring subset of attractions within budget (entry costs) and minutes
+    (visit times; None = unlimited). Plain names are accepted as free visits
+    of DEFAULT_VISIT_MINUTES with DEFAULT_SCORE.
+
+    Returns:
+        Dict with selected (the chosen attractions, in input order, with
+        numeric entry_cost / visit_minutes / score and latitude / longitude
+        when readable; other fields such as opening hours pass through, so
+        the list can go straight to itinerary_generator),
+        skipped (names not chosen), total_cost, total_minutes and total_score.
+    """
+    attractions = [a if isinstance(a, dict) else {"name": str(a)} for a in attractions]
+    candidates = [candidate_from_dict(a) for a in attractions]
+    cost = np.array([c.entry_cost for c in candidates], dtype=np.float64)
+    visit = np.array([c.visit_minutes for c in candidates], dtype=np.float64)
+    score = np.array([c.score for c in candidates], dtype=np.float64)
+    if minutes is None:
+        minutes = float(visit.sum())
+
+    cost_steps, cost_cap = _steps(cost, max(0.0, budget), MAX_COST_STEPS)
+    time_steps, time_cap = _steps(visit, max(0.0, minutes), MAX_TIME_STEPS)
+    usable = np.flatnonzero((score > 0) & (cost_steps <= cost_cap) & (time_steps <= time_cap))
+
+    # best[c, t]: highest score using at most c cost steps and t time steps
+    best = np.zeros((cost_cap + 1, time_cap + 1))
+    taken = np.zeros((len(usable), cost_cap + 1, time_cap + 1), dtype=bool)
+    for row, i in enumerate(usable):
+        w, d = cost_steps[i], time_steps[i]
+        with_item = best[: cost_cap + 1 - w, : time_cap + 1 - d] + score[i]
+        improved = with_item > best[w:, d:]
+        taken[row, w:, d:] = improved
+        best[w:, d:] = np.where(improved, with_item, best[w:, d:])
+
+    chosen = set()
+    c, t = cost_cap, time_cap
+    for row in range(len(usable) - 1, -1, -1):
+        if taken[row, c, t]:
+            i = usable[row]
+            chosen.add(int(i))
+            c -= cost_steps[i]
+            t -= time_steps[i]
+
+    selected = [i for i in range(len(candidates)) if i in chosen]
+    return {
+        "selected": [_normalized(attractions[i], candidates[i]) for i in selected],
+        "skipped": [candidates[i].name for i in range(len(candidates)) if i not in chosen],
+        "total_cost": round(float(cost[selected].sum()), 2),
+        "total_minutes": int(visit[selected].sum()),
+        "total_score": round(float(score[selected].sum()), 4),
+    }
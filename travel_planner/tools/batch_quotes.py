@@ -0,0 +1,183 @@
+"""
+Batch quoting for "what-if" sweeps.
+Vectorized counterparts of hotel_cost_estimator, transport_cost_estimator and
+budget_allocator: each takes arrays of scenarios (scalars broadcast), resolves
+every distinct city / route once, computes tiers, rates, totals and allocations
+in NumPy, and returns a columnar result (dict of equal-length arrays) whose
+values match the scalar tools row for row.
+"""
+from typing import Any, Iterable, Sequence, Union
+
+import numpy as np
+
+from .hotel_cost_estimator import TIER_RATES
+from .rate_tables import haversine_km, load_rate_tables
+from .route_graph import get_route_matrix
+from .transport_cost_estimator import (
+    DEFAULT_FLIGHT_ONE_WAY,
+    DEFAULT_LOCAL_PER_DAY,
+    LOCAL_TRANSPORT_DAYS,
+    _distance_fare,
+    _same_place,
+)
+
+ArrayLike = Union[float, str, Sequence[Any], np.ndarray]
+
+# Tier order for np.select below: first matching condition wins
+_TIERS = ("luxury", "mid", "budget")
+
+
+def _broadcast(*columns: ArrayLike) -> list[np.ndarray]:
+    """Broadcast scalars/sequences against each other and flatten to 1-D scenario columns."""
+    arrays = [np.asarray(c, dtype=object if _is_text(c) else None) for c in columns]
+    return [a.ravel() for a in np.broadcast_arrays(*arrays)]
+
+
+def _is_text(column: ArrayLike) -> bool:
+    if isinstance(column, str):
+        return True
+    array = np.asarray(column)
+    return array.dtype.kind in "OUS"
+
+
+def _distinct(values: Iterable[Any], count: int) -> tuple[list, np.ndarray]:
+    """Distinct values in first-seen order and the index of each row into them."""
+    positions: dict[Any, int] = {}
+    inverse = np.fromiter(
+        (positions.setdefault(v, len(positions)) for v in values),
+        dtype=np.intp,
+        count=count,
+    )
+    return list(positions), inverse
+
+
+def batch_hotel_quotes(cities: ArrayLike, days: ArrayLike, budgets: ArrayLike) -> dict[str, np.ndarray]:
+    """
+    Hotel quotes for many scenarios at once (see hotel_cost_estimator).
+
+    Returns columns: city, matched_city, days, tier, estimated_per_night,
+    total_estimated_cost, rate_source.
+    """
+    cities, days, budgets = _broadcast(cities, days, budgets)
+    days = days.astype(np.int64)
+    budgets = budgets.astype(np.float64)
+
+    tables = load_rate_tables()
+    names, inverse = _distinct(cities.tolist(), len(cities))
+    matches = [tables.resolve_city(name) for name in names]
+    multipliers = np.array([m.hotel_multiplier if m else 1.0 for m in matches])[inverse]
+    matched = np.array([m.name if m else None for m in matches], dtype=object)[inverse]
+    sources = np.array(["table" if m else "default" for m in matches], dtype=object)[inverse]
+
+    per_night_budget = np.divide(budgets, days, out=np.zeros_like(budgets), where=days > 0)
+    tier_index = np.select([per_night_budget >= 6000, per_night_budget >= 2500], [0, 1], default=2)
+    base_rates = np.array([TIER_RATES[t] for t in _TIERS], dtype=np.float64)
+
+    rates = (base_rates[tier_index] * multipliers).astype(np.int64)
+    return {
+        "city": cities,
+        "matched_city": matched,
+        "days": days,
+        "tier": np.array(_TIERS, dtype=object)[tier_index],
+        "estimated_per_night": rates,
+        "total_estimated_cost": rates * days,
+        "rate_source": sources,
+    }
+
+
+def batch_transport_quotes(origins: ArrayLike, destinations: ArrayLike) -> dict[str, np.ndarray]:
+    """
+    Transport quotes for many origin/destination pairs (see transport_cost_estimator).
+    Each distinct pair is routed once over the precomputed route matrix.
+
+    Returns columns: origin, destination, mode, flight_estimate_round_trip,
+    local_transport_estimate, total_transport_estimate, legs (count), rate_source.
+    """
+    origins, destinations = _broadcast(origins, destinations)
+    tables = load_rate_tables()
+    matrix = get_route_matrix()
+
+    pairs, inverse = _distinct(zip(origins.tolist(), destinations.tolist()), len(origins))
+    one_way = np.empty(len(pairs), dtype=np.int64)
+    local_per_day = np.empty(len(pairs), dtype=np.int64)
+    leg_counts = np.zeros(len(pairs), dtype=np.int64)
+    modes, sources = [], []
+    for k, (origin, destination) in enumerate(pairs):
+        origin_city, dest_city = tables.resolve_city(origin), tables.resolve_city(destination)
+        mode = "flight"
+        if _same_place(origin, destination, origin_city, dest_city):
+            mode, one_way[k], source = "local", 0, "same_city"
+        elif origin_city and dest_city:
+            route = matrix.cheapest_route(origin_city, dest_city)
+            if route is not None:
+                mode, one_way[k], leg_counts[k] = route["mode"], route["one_way_fare"], len(route["legs"])
+                source = "table" if leg_counts[k] == 1 else "multi_leg"
+            else:
+                mode, one_way[k] = _distance_fare(haversine_km(origin_city, dest_city))
+                source = "distance_estimate"
+        else:
+            one_way[k], source = DEFAULT_FLIGHT_ONE_WAY, "default"
+        local_per_day[k] = dest_city.local_transport_per_day if dest_city else DEFAULT_LOCAL_PER_DAY
+        modes.append(mode)
+        sources.append(source)
+
+    flights = one_way[inverse] * 2  # round trip
+    local = local_per_day[inverse] * LOCAL_TRANSPORT_DAYS
+    return {
+        "origin": origins,
+        "destination": destinations,
+        "mode": np.array(modes, dtype=object)[inverse],
+        "flight_estimate_round_trip": flights,
+        "local_transport_estimate": local,
+        "total_transport_estimate": flights + local,
+        "legs": leg_counts[inverse],
+        "rate_source": np.array(sources, dtype=object)[inverse],
+    }
+
+
+def batch_budget_allocations(
+    total_budgets: ArrayLike, hotel_costs: ArrayLike, transport_costs: ArrayLike
+) -> dict[str, np.ndarray]:
+    """
+    Budget allocations for many scenarios at once (see budget_allocator).
+
+    Returns columns: total_budget, hotel_allocation, transport_allocation,
+    fixed_total, remaining_budget, suggested_activities, suggested_food,
+    within_budget.
+    """
+    totals, hotels, transports = (
+        column.astype(np.float64) for column in _broadcast(total_budgets, hotel_costs, transport_costs)
+    )
+    fixed = hotels + transports
+    remaining = np.maximum(0.0, totals - fixed)
+    return {
+        "total_budget": totals,
+        "hotel_allocation": hotels,
+        "transport_allocation": transports,
+        "fixed_total": fixed,
+        "remaining_budget": remaining,
+        "suggested_activities": np.round(remaining * 0.5, 2),
+        "suggested_food": np.round(remaining * 0.5, 2),
+        "within_budget": fixed <= totals,
+    }
+
+
+def batch_trip_quotes(
+    destinations: ArrayLike, origins: ArrayLike, days: ArrayLike, budgets: ArrayLike
+) -> dict[str, np.ndarray]:
+    """
+    Full cost sweep: hotel, transport and allocation per scenario, e.g.
+    batch_trip_quotes("Goa", ["Mumbai", "Delhi"], [[3], [5], [7]], 50_000)
+    broadcasts to 6 scenarios. Returns the columns of all three batch
+    functions in one dict, with rate_source split into hotel_rate_source and
+    transport_rate_source.
+    """
+    destinations, origins, days, budgets = _broadcast(destinations, origins, days, budgets)
+    hotel = batch_hotel_quotes(destinations, days, budgets)
+    transport = batch_transport_quotes(origins, destinations)
+    allocation = batch_budget_allocations(
+        budgets, hotel["total_estimated_cost"], transport["total_transport_estimate"]
+    )
+    hotel["hotel_rate_source"] = hotel.pop("rate_source")
+    transport["transport_rate_source"] = transport.pop("rate_source")
+    return {**hotel, **transport, **allocation}
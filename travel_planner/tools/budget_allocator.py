@@ -1,14 +1,20 @@
 """
 Budget allocator tool.
 Allocates total budget across hotel, transport, and remaining for activities/food.
+Given candidate attractions with entry costs, it also picks the best-value set
+that fits the activities budget and the trip's days (see attraction_selector).
 """
-from typing import Any
+from typing import Any, Dict, List, Optional
+
+from .attraction_selector import select_attractions, sightseeing_minutes
 
 
 def budget_allocator(
     total_budget: float,
     hotel_cost: float,
     transport_cost: float,
+    attractions: Optional[List[Dict[str, Any]]] = None,
+    days: Optional[int] = None,
 ) -> dict[str, Any]:
     """
     Allocate total budget: hotel, transport, and remainder for activities/food.
@@ -17,6 +23,15 @@ def budget_allocator(
         total_budget: Total trip budget (e.g. INR).
         hotel_cost: Estimated accommodation cost.
         transport_cost: Estimated transport cost.
+        attractions: Optional candidate attractions as objects with name,
+            entry_cost, visit_minutes and score (higher = better match for the
+            traveller's preferences); other fields such as latitude/longitude
+            are passed through. The best-scoring set whose entry costs fit the
+            activities budget and whose visits fit the days is returned as
+            selected_attractions, with those values as numbers ("₹500" -> 500,
+            "2 hours" -> 120), ready for itinerary_generator.
+        days: Number of days for the trip (limits the attractions' total
+            visiting time).
 
     Returns:
         Dict with allocation breakdown and remaining budget.
@@ -27,7 +42,7 @@ def budget_allocator(
     activities = remaining * 0.5
     food = remaining * 0.5
 
-    return {
+    result = {
         "total_budget": total_budget,
         "hotel_allocation": hotel_cost,
         "transport_allocation": transport_cost,
@@ -38,3 +53,13 @@ def budget_allocator(
         "currency": "INR",
         "within_budget": fixed <= total_budget,
     }
+    if attractions:
+        selection = select_attractions(attractions, activities, sightseeing_minutes(days) if days else None)
+        result.update(
+            selected_attractions=selection["selected"],
+            skipped_attractions=selection["skipped"],
+            attractions_cost=selection["total_cost"],
+            attractions_minutes=selection["total_minutes"],
+            activities_left=round(activities - selection["total_cost"], 2),
+        )
+    return result
@@ -2,10 +2,19 @@
 Hotel cost estimator tool.
 Estimates accommodation cost for a given city and number of nights.
 """
-from typing import Any
+from typing import Any, Optional
 
+from .rate_tables import load_rate_tables
 
-def hotel_cost_estimator(city: str, days: int, budget: float) -> dict[str, Any]:
+# Base nightly rates (INR) by tier - illustrative estimates, scaled per city
+TIER_RATES = {
+    "budget": 1500,
+    "mid": 3500,
+    "luxury": 8000,
+}
+
+
+def hotel_cost_estimator(city: str, days: int, budget: float, tier: Optional[str] = None) -> dict[str, Any]:
     """
     Estimate hotel/accommodation cost for a stay in a given city.
 
@@ -13,43 +22,44 @@ def hotel_cost_estimator(city: str, days: int, budget: float) -> dict[str, Any]:
         city: Destination city name (e.g. "Goa", "Mumbai").
         days: Number of nights of stay.
         budget: Total trip budget in currency (e.g. INR) for reference.
+        tier: Optional "budget", "mid" or "luxury" to quote that tier instead
+            of the one the budget per night suggests.
 
     Returns:
         Dict with estimated cost, tier suggestion, and breakdown.
+        rate_source is "table" when the city (or an alias/close spelling) is in
+        the rate table, "default" when base rates were used without a city
+        adjustment.
     """
-    city_lower = city.strip().lower()
-    # Base nightly rates (INR) by tier - illustrative estimates per city
-    tier_rates = {
-        "budget": 1500,
-        "mid": 3500,
-        "luxury": 8000,
-    }
-    # Slight city multipliers for popular Indian destinations
-    city_mult = 1.0
-    if "goa" in city_lower:
-        city_mult = 1.2
-    elif "mumbai" in city_lower or "delhi" in city_lower:
-        city_mult = 1.4
-    elif "jaipur" in city_lower or "udaipur" in city_lower:
-        city_mult = 1.1
+    # City multiplier from the rate table (names, aliases and misspellings)
+    match = load_rate_tables().resolve_city(city)
+    city_mult = match.hotel_multiplier if match else 1.0
 
     budget_per_night = budget / days if days > 0 else 0
     if budget_per_night >= 6000:
-        tier = "luxury"
+        suggested = "luxury"
     elif budget_per_night >= 2500:
-        tier = "mid"
+        suggested = "mid"
     else:
-        tier = "budget"
+        suggested = "budget"
+    tier = tier if tier in TIER_RATES else suggested
 
-    rate = int(tier_rates[tier] * city_mult)
+    rate = int(TIER_RATES[tier] * city_mult)
     total = rate * days
 
-    return {
+    result = {
         "city": city,
+        "matched_city": match.name if match else None,
         "days": days,
         "tier": tier,
         "estimated_per_night": rate,
         "total_estimated_cost": total,
         "currency": "INR",
+        "rate_source": "table" if match else "default",
         "breakdown": f"{tier} tier @ ~{rate} INR/night x {days} nights = {total} INR",
     }
+    if tier != suggested:
+        result["suggested_tier"] = suggested
+    if not match:
+        result["note"] = f"'{city}' is not in the rate table; base {tier} rates used without a city adjustment."
+    return result
@@ -2,12 +2,14 @@
 Itinerary generator tool.
 Creates a day-by-day plan from destination, attractions list, and number of days.
 """
-from typing import List, Union
+from typing import Any, Dict, List, Union
+
+from .itinerary_optimizer import attraction_from_dict, optimize_itinerary
 
 
 def itinerary_generator(
     destination: str,
-    attractions: Union[List[str], str],
+    attractions: Union[List[str], List[Dict[str, Any]], str],
     days: int,
 ) -> str:
     """
@@ -15,12 +17,19 @@ def itinerary_generator(
 
     Args:
         destination: Name of the destination (e.g. "Goa").
-        attractions: List of attraction names or descriptions.
+        attractions: List of attraction names or descriptions, or objects with
+            name, latitude, longitude and optionally visit_minutes, opens and
+            closes ("HH:MM") for a geo-optimized, timed plan.
         days: Number of days for the trip.
 
     Returns:
         A formatted string with day-by-day itinerary.
     """
+    if isinstance(attractions, list) and attractions and all(isinstance(a, dict) for a in attractions):
+        located = [attraction_from_dict(a) for a in attractions]
+        if all(located):
+            return _optimized_itinerary(destination, located, days)
+        attractions = [a.get("name") for a in attractions]
     if isinstance(attractions, str):
         attractions = [a.strip() for a in attractions.split(",") if a.strip()]
     if not isinstance(attractions, list):
@@ -41,3 +50,21 @@ def itinerary_generator(
             lines.append("- Free time / local exploration")
         lines.append("")
     return "\n".join(lines).strip()
+
+
+def _optimized_itinerary(destination: str, attractions: list, days: int) -> str:
+    """Days grouped by location and ordered to minimize travel, with visit times."""
+    plan = optimize_itinerary(attractions, days)
+    lines = [f"# {destination} – {days}-Day Itinerary", ""]
+    for d, stops in enumerate(plan["days"], start=1):
+        lines.append(f"## Day {d}")
+        for stop in stops:
+            travel = f" ({stop['travel_minutes']} min travel)" if stop["travel_minutes"] else ""
+            lines.append(f"- {stop['arrive']}–{stop['depart']} {stop['name']}{travel}")
+        if not stops:
+            lines.append("- Free time / local exploration")
+        lines.append("")
+    if plan["unscheduled"]:
+        lines.append("## Could not fit")
+        lines.extend(f"- {name}" for name in plan["unscheduled"])
+    return "\n".join(lines).strip()
@@ -0,0 +1,309 @@
+"""
+Geo-aware itinerary optimizer.
+Groups attractions into days by location (capacity-aware k-medoids over a
+precomputed haversine distance matrix), orders each day with nearest-neighbour
+plus 2-opt, and schedules visits against opening hours and the day's time
+window. Stops that cannot be fitted are re-inserted where they fit best or
+reported as unscheduled.
+"""
+import math
+import re
+from typing import Any, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+# Default sightseeing window (minutes from midnight) and pace
+DAY_START = 9 * 60
+DAY_END = 19 * 60
+DEFAULT_VISIT_MINUTES = 90
+# Average door-to-door speed within a city, including traffic
+CITY_SPEED_KMH = 20.0
+# Days are filled to at most this share of the window before travel time
+DAY_FILL = 0.8
+KMEANS_ITERATIONS = 10
+
+# First number in a model-written value: "₹500", "Rs. 1,200", "90 min", "2.5 hours"
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_HOURS_RE = re.compile(r"\b(?:h|hr|hrs|hour|hours)\b")
+# "15.49", "-73.7", "15.49 N", "73.77°E"
+_COORDINATE_RE = re.compile(r"^(-?\d+(?:\.\d+)?)\s*°?\s*([nsew])?$")
+
+# "9", "09:30", "09:30:00", "9.30", "9am", "9:00 AM", "9 p.m."
+_CLOCK_RE = re.compile(r"^(\d{1,2})(?:[:.](\d{2})(?::\d{2})?)?\s*(?:([ap])\.?\s*m\.?)?$")
+
+
+class Attraction(NamedTuple):
+    name: str
+    latitude: float
+    longitude: float
+    visit_minutes: int = DEFAULT_VISIT_MINUTES
+    opens: Optional[int] = None  # minutes from midnight
+    closes: Optional[int] = None
+
+
+def parse_clock(value: Union[str, int, float, None]) -> Optional[int]:
+    """"09:30" / "9:00 AM" / "9pm" / "09:30:00" / 570 -> minutes from midnight (None if blank or unreadable)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _CLOCK_RE.match(str(value).strip().lower())
+    if not match:
+        return None
+    hours, minutes, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+    if meridiem:
+        if not 1 <= hours <= 12:
+            return None
+        hours = hours % 12 + (12 if meridiem == "p" else 0)
+    if hours > 24 or minutes > 59:
+        return None
+    return hours * 60 + minutes
+
+
+def parse_number(value: Any, default: float) -> float:
+    """value as a number: numbers as is, the first number in a string ("₹1,200" -> 1200), else default."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return float(value)
+    match = _NUMBER_RE.search(value.replace(",", "")) if isinstance(value, str) else None
+    return float(match.group()) if match else default
+
+
+def parse_minutes(value: Any, default: int = DEFAULT_VISIT_MINUTES) -> int:
+    """A duration in minutes: 90 / "90 min" -> 90, "2 hours" -> 120; default if missing or unreadable."""
+    minutes = parse_number(value, math.nan)
+    if math.isnan(minutes):
+        return default
+    if isinstance(value, str) and _HOURS_RE.search(value.lower()):
+        minutes *= 60
+    return max(0, int(round(minutes)))
+
+
+def parse_coordinate(value: Any, limit: float) -> Optional[float]:
+    """A latitude (limit 90) or longitude (limit 180) in degrees: 15.49 / "15.49 N" / "73.7 W" -> -73.7; None if unreadable."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        degrees = float(value)
+    else:
+        match = _COORDINATE_RE.match(str(value or "").strip().lower())
+        if not match:
+            return None
+        degrees = float(match.group(1)) * (-1 if match.group(2) in ("s", "w") else 1)
+    return degrees if math.isfinite(degrees) and abs(degrees) <= limit else None
+
+
+def format_clock(minutes: float) -> str:
+    minutes = int(round(minutes))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def attraction_from_dict(item: dict[str, Any]) -> Optional[Attraction]:
+    """
+    Attraction from a tool-call dict (name, latitude/lat, longitude/lon/lng, ...);
+    None without readable coordinates. Values may be model-written text
+    ("15.49 N", "2 hours"); an unreadable visit time gets DEFAULT_VISIT_MINUTES.
+    """
+    lat = parse_coordinate(item.get("latitude", item.get("lat")), 90)
+    lon = parse_coordinate(item.get("longitude", item.get("lon", item.get("lng"))), 180)
+    if lat is None or lon is None:
+        return None
+    return Attraction(
+        name=str(item.get("name") or "Attraction").strip(),
+        latitude=lat,
+        longitude=lon,
+        visit_minutes=parse_minutes(item.get("visit_minutes")),
+        opens=parse_clock(item.get("opens")),
+        closes=parse_clock(item.get("closes")),
+    )
+
+
+def distance_matrix(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances in km."""
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    h = (
+        np.sin((lat[:, None] - lat[None, :]) / 2) ** 2
+        + np.cos(lat[:, None]) * np.cos(lat[None, :]) * np.sin((lon[:, None] - lon[None, :]) / 2) ** 2
+    )
+    return 2 * 6371.0 * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def _cluster(dist: np.ndarray, visit: np.ndarray, days: int, capacity: float) -> list[list[int]]:
+    """
+    Split stops into `days` groups: k-medoids for locality, then a final
+    assignment that fills each day up to `capacity` minutes, placing the stops
+    with the most to lose from a second choice first.
+    """
+    n = len(visit)
+    # Farthest-point initialisation from the most central stop
+    medoids = [int(np.argmin(dist.sum(axis=1)))]
+    while len(medoids) < days:
+        medoids.append(int(np.argmax(dist[:, medoids].min(axis=1))))
+    medoids = np.array(medoids)
+    for _ in range(KMEANS_ITERATIONS):
+        labels = np.argmin(dist[:, medoids], axis=1)
+        updated = medoids.copy()
+        for c in range(days):
+            members = np.flatnonzero(labels == c)
+            if len(members):
+                updated[c] = members[np.argmin(dist[np.ix_(members, members)].sum(axis=1))]
+        if np.array_equal(updated, medoids):
+            break
+        medoids = updated
+
+    to_medoid = dist[:, medoids]
+    ranked = np.sort(to_medoid, axis=1)
+    regret = ranked[:, 1] - ranked[:, 0] if days > 1 else np.zeros(n)
+    load = np.zeros(days)
+    groups: list[list[int]] = [[] for _ in range(days)]
+    for i in np.argsort(-regret, kind="stable"):
+        for c in np.argsort(to_medoid[i], kind="stable"):
+            if load[c] + visit[i] <= capacity or not groups[c]:
+                break
+        else:
+            c = int(np.argmin(load))
+        groups[c].append(int(i))
+        load[c] += visit[i]
+    return groups
+
+
+def _two_opt(route: list[int], dist: np.ndarray) -> list[int]:
+    """Improve an open path with 2-opt segment reversals until no move helps."""
+    path = np.array(route)
+    n = len(path)
+    improved = n > 3
+    while improved:
+        improved = False
+        for i in range(n - 2):
+            a, b = path[i], path[i + 1]
+            js = np.arange(i + 2, n)
+            c, after = path[js], path[np.minimum(js + 1, n - 1)]
+            has_next = js + 1 < n  # the path is open: the last stop has no successor
+            removed = dist[a, b] + np.where(has_next, dist[c, after], 0.0)
+            added = dist[a, c] + np.where(has_next, dist[b, after], 0.0)
+            delta = added - removed
+            k = int(np.argmin(delta))
+            if delta[k] < -1e-9:
+                j = int(js[k])
+                path[i + 1 : j + 1] = path[i + 1 : j + 1][::-1]
+                improved = True
+    return path.tolist()
+
+
+def _order(group: list[int], dist: np.ndarray, closes: np.ndarray) -> list[int]:
+    """Nearest-neighbour tour starting at the stop that closes earliest (else the outermost one), then 2-opt."""
+    if len(group) <= 2:
+        return sorted(group, key=lambda i: closes[i])
+    members = np.array(group)
+    sub = dist[np.ix_(members, members)]
+    if np.isfinite(closes[members]).any():
+        start = int(np.argmin(closes[members]))
+    else:
+        start = int(np.argmax(sub.sum(axis=1)))
+    route, left = [start], set(range(len(members))) - {start}
+    while left:
+        last = route[-1]
+        nxt = min(left, key=lambda j: sub[last, j])
+        route.append(nxt)
+        left.remove(nxt)
+    return [int(members[i]) for i in _two_opt(route, sub)]
+
+
+def _schedule(
+    route: list[int],
+    travel: np.ndarray,
+    visit: np.ndarray,
+    opens: np.ndarray,
+    closes: np.ndarray,
+    day_start: int,
+    day_end: int,
+) -> tuple[list[dict[str, Any]], list[int]]:
+    """Walk a route in order; stops that would miss their window or the day's end are skipped."""
+    stops, skipped = [], []
+    clock, previous = float(day_start), None
+    for i in route:
+        leg = travel[previous, i] if previous is not None else 0.0
+        arrive = max(clock + leg, opens[i])
+        depart = arrive + visit[i]
+        if depart > min(closes[i], day_end):
+            skipped.append(i)
+            continue
+        stops.append({"index": i, "arrive": arrive, "depart": depart, "travel_minutes": leg})
+        clock, previous = depart, i
+    return stops, skipped
+
+
+def optimize_itinerary(
+    attractions: Sequence[Attraction],
+    days: int,
+    day_start: int = DAY_START,
+    day_end: int = DAY_END,
+    speed_kmh: float = CITY_SPEED_KMH,
+) -> dict[str, Any]:
+    """
+    Plan attractions into `days` geo-compact, time-feasible days.
+
+    Returns:
+        Dict with days: [[{name, arrive, depart, travel_minutes}, ...], ...]
+        (times as "HH:MM"), unscheduled: [names], travel_km: total km between
+        consecutive stops.
+    """
+    days = max(1, int(days))
+    if not attractions:
+        return {"days": [[] for _ in range(days)], "unscheduled": [], "travel_km": 0.0}
+
+    dist = distance_matrix([a.latitude for a in attractions], [a.longitude for a in attractions])
+    travel = dist / speed_kmh * 60.0
+    visit = np.array([a.visit_minutes for a in attractions], dtype=np.float64)
+    opens = np.array([a.opens if a.opens is not None else -math.inf for a in attractions])
+    closes = np.array([a.closes if a.closes is not None else math.inf for a in attractions])
+
+    capacity = (day_end - day_start) * DAY_FILL
+    groups = _cluster(dist, visit, min(days, len(attractions)), capacity)
+    groups += [[] for _ in range(days - len(groups))]
+
+    plans, leftovers = [], []
+    for group in groups:
+        stops, skipped = _schedule(_order(group, dist, closes), travel, visit, opens, closes, day_start, day_end)
+        plans.append(stops)
+        leftovers.extend(skipped)
+
+    # Cheapest feasible insertion of leftovers into any day
+    unscheduled = []
+    for i in sorted(leftovers, key=lambda i: closes[i]):
+        best = None
+        for d, stops in enumerate(plans):
+            # Inserting never shortens the busy time (visits + travel), so skip full days
+            busy = sum(visit[s["index"]] + s["travel_minutes"] for s in stops)
+            if busy + visit[i] > day_end - day_start:
+                continue
+            route = [s["index"] for s in stops]
+            for pos in range(len(route) + 1):
+                candidate = route[:pos] + [i] + route[pos:]
+                scheduled, skipped = _schedule(candidate, travel, visit, opens, closes, day_start, day_end)
+                if not skipped:
+                    cost = sum(s["travel_minutes"] for s in scheduled)
+                    if best is None or cost < best[0]:
+                        best = (cost, d, scheduled)
+        if best is None:
+            unscheduled.append(i)
+        else:
+            plans[best[1]] = best[2]
+
+    travel_km = sum(
+        float(dist[a["index"], b["index"]]) for stops in plans for a, b in zip(stops, stops[1:])
+    )
+    return {
+        "days": [
+            [
+                {
+                    "name": attractions[s["index"]].name,
+                    "arrive": format_clock(s["arrive"]),
+                    "depart": format_clock(s["depart"]),
+                    "travel_minutes": int(round(s["travel_minutes"])),
+                }
+                for s in stops
+            ]
+            for stops in plans
+        ],
+        "unscheduled": [attractions[i].name for i in unscheduled],
+        "travel_km": round(travel_km, 2),
+    }
@@ -0,0 +1,174 @@
+"""
+Rate tables for the cost estimator tools.
+City and route tables (CSV) are parsed once per tables directory into indexed
+in-memory structures: names and aliases resolve through a dict, misspellings
+through a precomputed trigram index, and routes through a (origin, destination)
+dict, so lookups stay O(1) as coverage grows.
+"""
+import csv
+import functools
+import math
+import os
+import re
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+from travel_planner import config
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Minimum trigram (Dice) similarity for a fuzzy city match
+FUZZY_MATCH_THRESHOLD = 0.6
+
+
+class City(NamedTuple):
+    name: str
+    country: str
+    latitude: float
+    longitude: float
+    hotel_multiplier: float
+    local_transport_per_day: int
+
+
+class Route(NamedTuple):
+    origin: str
+    destination: str
+    mode: str
+    one_way_fare: int
+    duration_minutes: int
+
+
+def normalize_place(name: str) -> str:
+    """Lower-case, drop punctuation and collapse spaces ("Port-Blair " -> "port blair")."""
+    return " ".join(re.sub(r"[^\w\s]", " ", str(name).lower()).split())
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def haversine_km(a: City, b: City) -> float:
+    """Great-circle distance between two cities in km."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a.latitude, a.longitude, b.latitude, b.longitude))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * 6371.0 * math.asin(math.sqrt(h))
+
+
+class RateTables:
+    """
+    Indexed city and route tables.
+
+    resolve_city() tries, in order: exact name/alias, then the best trigram
+    match above FUZZY_MATCH_THRESHOLD; results are memoized per input string.
+    route() looks up a direct route in either direction.
+    """
+
+    def __init__(self, cities: list[City], aliases: dict[str, str], routes: list[Route]):
+        self.cities = {normalize_place(c.name): c for c in cities}
+        self._names: dict[str, City] = dict(self.cities)
+        for alias, canonical in aliases.items():
+            city = self.cities.get(normalize_place(canonical))
+            if city is not None:
+                self._names.setdefault(normalize_place(alias), city)
+
+        self._trigram_index: dict[str, list[str]] = defaultdict(list)
+        self._trigram_counts: dict[str, int] = {}
+        for key in self._names:
+            grams = _trigrams(key)
+            self._trigram_counts[key] = len(grams)
+            for gram in grams:
+                self._trigram_index[gram].append(key)
+
+        self.routes: dict[tuple[str, str], Route] = {}
+        for route in routes:
+            self.routes[(normalize_place(route.origin), normalize_place(route.destination))] = route
+        for (origin, destination), route in list(self.routes.items()):
+            self.routes.setdefault(
+                (destination, origin),
+                route._replace(origin=route.destination, destination=route.origin),
+            )
+
+        self._resolved: dict[str, Optional[City]] = {}
+
+    @classmethod
+    def from_directory(cls, data_dir: str) -> "RateTables":
+        """Load cities.csv and routes.csv from data_dir."""
+        cities, aliases, routes = [], {}, []
+        with open(os.path.join(data_dir, "cities.csv"), newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                cities.append(
+                    City(
+                        name=row["city"].strip(),
+                        country=row["country"].strip(),
+                        latitude=float(row["latitude"]),
+                        longitude=float(row["longitude"]),
+                        hotel_multiplier=float(row["hotel_multiplier"]),
+                        local_transport_per_day=int(row["local_transport_per_day"]),
+                    )
+                )
+                for alias in (row.get("aliases") or "").split("|"):
+                    if alias.strip():
+                        aliases[alias.strip()] = row["city"].strip()
+        with open(os.path.join(data_dir, "routes.csv"), newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                routes.append(
+                    Route(
+                        origin=row["origin"].strip(),
+                        destination=row["destination"].strip(),
+                        mode=row["mode"].strip(),
+                        one_way_fare=int(row["one_way_fare"]),
+                        duration_minutes=int(row["duration_minutes"]),
+                    )
+                )
+        return cls(cities, aliases, routes)
+
+    def resolve_city(self, name: str) -> Optional[City]:
+        """
+        City record for a name, alias or close misspelling; None if unknown.
+        A comma-qualified name ("Goa, India", "Panaji, Goa") resolves to its
+        first part that names a listed city, else to a close misspelling of
+        its first part.
+        """
+        key = normalize_place(name or "")
+        if key in self._resolved:
+            return self._resolved[key]
+        parts = [part for part in (normalize_place(p) for p in str(name or "").split(",")) if part]
+        city = self._names.get(key)
+        if city is None and len(parts) > 1:
+            city = next((self._names[part] for part in parts if part in self._names), None)
+        fuzzy_key = parts[0] if parts else key
+        if city is None and len(fuzzy_key) >= 4:
+            city = self._fuzzy_match(fuzzy_key)
+        if len(self._resolved) > 10_000:
+            self._resolved.clear()
+        self._resolved[key] = city
+        return city
+
+    def _fuzzy_match(self, key: str) -> Optional[City]:
+        grams = _trigrams(key)
+        shared: dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self._trigram_index.get(gram, ()):
+                shared[candidate] += 1
+        best_key, best_score = None, 0.0
+        for candidate, count in shared.items():
+            score = 2 * count / (len(grams) + self._trigram_counts[candidate])
+            if score > best_score:
+                best_key, best_score = candidate, score
+        if best_key is None or best_score < FUZZY_MATCH_THRESHOLD:
+            return None
+        return self._names[best_key]
+
+    def route(self, origin: City, destination: City) -> Optional[Route]:
+        """Direct route between two resolved cities, in either direction."""
+        return self.routes.get((normalize_place(origin.name), normalize_place(destination.name)))
+
+
+@functools.lru_cache(maxsize=None)
+def load_rate_tables(data_dir: Optional[str] = None) -> RateTables:
+    """Parsed tables for data_dir (default: RATE_TABLES_DIR or the bundled data), loaded once."""
+    return RateTables.from_directory(data_dir or config.RATE_TABLES_DIR or DATA_DIR)
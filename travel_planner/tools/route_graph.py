@@ -0,0 +1,152 @@
+"""
+Multi-leg route cost engine for the transport estimator.
+Cities from the rate tables are graph nodes and listed routes are fare/duration
+edges. An all-pairs cheapest-route matrix (with next-hop table) is precomputed
+with a vectorized Floyd–Warshall in NumPy and cached to disk, so any
+origin/destination pair is answered in constant time with its leg breakdown.
+"""
+import functools
+import hashlib
+import logging
+import os
+from typing import Any, Optional
+
+import numpy as np
+
+from travel_planner import config
+
+from .rate_tables import City, RateTables, load_rate_tables, normalize_place
+
+logger = logging.getLogger(__name__)
+
+# Search weight of a leg = fare + TRANSFER_PENALTY + TIME_VALUE_PER_MINUTE * duration,
+# so a chain of cheap but slow legs (long bus rides) does not beat a sensible
+# connection just on fare. Reported fares are the plain sum of leg fares.
+TRANSFER_PENALTY = 750  # INR per leg
+TIME_VALUE_PER_MINUTE = 10  # INR
+# Longest route reported as reachable (legs)
+MAX_LEGS = 4
+
+
+def _fingerprint(tables: RateTables) -> str:
+    digest = hashlib.sha1()
+    digest.update(f"penalty={TRANSFER_PENALTY},time={TIME_VALUE_PER_MINUTE}".encode())
+    for key in sorted(tables.cities):
+        digest.update(key.encode())
+    for (origin, destination), route in sorted(tables.routes.items()):
+        digest.update(f"{origin}>{destination}:{route.one_way_fare}:{route.duration_minutes}".encode())
+    return digest.hexdigest()[:16]
+
+
+def _floyd_warshall(weight: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    All-pairs cheapest paths. weight[i, j] is the edge weight (inf if none).
+    Returns (cost, next_hop) where next_hop[i, j] is the node after i on the
+    cheapest i -> j path (-1 if unreachable).
+    """
+    n = weight.shape[0]
+    cost = weight.copy()
+    np.fill_diagonal(cost, 0.0)
+    next_hop = np.where(np.isfinite(cost), np.arange(n)[None, :], -1).astype(np.int32)
+    for k in range(n):
+        via = cost[:, k, None] + cost[None, k, :]
+        better = via < cost
+        cost = np.where(better, via, cost)
+        next_hop = np.where(better, next_hop[:, k, None], next_hop)
+    return cost, next_hop
+
+
+class RouteMatrix:
+    """Precomputed cheapest routes between every pair of cities in the rate tables."""
+
+    def __init__(self, tables: RateTables, nodes: list[str], cost: np.ndarray, next_hop: np.ndarray):
+        self.tables = tables
+        self.nodes = nodes
+        self.index = {key: i for i, key in enumerate(nodes)}
+        self.cost = cost
+        self.next_hop = next_hop
+
+    @classmethod
+    def build(cls, tables: RateTables) -> "RouteMatrix":
+        nodes = sorted(tables.cities)
+        index = {key: i for i, key in enumerate(nodes)}
+        weight = np.full((len(nodes), len(nodes)), np.inf)
+        for (origin, destination), route in tables.routes.items():
+            i, j = index.get(origin), index.get(destination)
+            if i is not None and j is not None:
+                leg_weight = (
+                    route.one_way_fare
+                    + TRANSFER_PENALTY
+                    + TIME_VALUE_PER_MINUTE * route.duration_minutes
+                )
+                weight[i, j] = min(weight[i, j], leg_weight)
+        cost, next_hop = _floyd_warshall(weight)
+        return cls(tables, nodes, cost, next_hop)
+
+    @classmethod
+    def load_or_build(cls, tables: RateTables, cache_dir: Optional[str] = None) -> "RouteMatrix":
+        """Load the matrix for these tables from cache_dir, building and saving it on a miss."""
+        path = None
+        if cache_dir:
+            path = os.path.join(cache_dir, f"route_matrix_{_fingerprint(tables)}.npz")
+            if os.path.exists(path):
+                try:
+                    with np.load(path) as data:
+                        nodes = [str(n) for n in data["nodes"]]
+                        if nodes == sorted(tables.cities):
+                            return cls(tables, nodes, data["cost"], data["next_hop"])
+                except (OSError, ValueError, KeyError):
+                    logger.warning("Ignoring unreadable route matrix cache %s", path)
+        matrix = cls.build(tables)
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                np.savez_compressed(path, nodes=np.array(matrix.nodes), cost=matrix.cost, next_hop=matrix.next_hop)
+            except OSError:
+                logger.warning("Could not write route matrix cache %s", path)
+        return matrix
+
+    def cheapest_route(self, origin: City, destination: City) -> Optional[dict[str, Any]]:
+        """
+        Cheapest route between two resolved cities.
+        A listed direct route is always used as is; otherwise the precomputed
+        cheapest connection is expanded into its legs.
+
+        Returns None if unreachable (or longer than MAX_LEGS), else a dict with
+        one_way_fare, duration_minutes, mode ("flight", "road", "flight+road", ...)
+        and legs: [{"from", "to", "mode", "fare", "duration_minutes"}, ...].
+        """
+        i = self.index.get(normalize_place(origin.name))
+        j = self.index.get(normalize_place(destination.name))
+        if i is None or j is None or i == j or not np.isfinite(self.cost[i, j]):
+            return None
+        legs = []
+        while i != j:
+            direct = self.tables.routes.get((self.nodes[i], self.nodes[j]))
+            nxt = j if direct is not None and not legs else int(self.next_hop[i, j])
+            route = self.tables.routes[(self.nodes[i], self.nodes[nxt])]
+            legs.append(
+                {
+                    "from": route.origin,
+                    "to": route.destination,
+                    "mode": route.mode,
+                    "fare": route.one_way_fare,
+                    "duration_minutes": route.duration_minutes,
+                }
+            )
+            if len(legs) > MAX_LEGS:
+                return None
+            i = nxt
+        modes = list(dict.fromkeys(leg["mode"] for leg in legs))
+        return {
+            "one_way_fare": sum(leg["fare"] for leg in legs),
+            "duration_minutes": sum(leg["duration_minutes"] for leg in legs),
+            "mode": "+".join(modes),
+            "legs": legs,
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def get_route_matrix(data_dir: Optional[str] = None) -> RouteMatrix:
+    """Route matrix for the rate tables in data_dir, loaded from the disk cache when possible."""
+    return RouteMatrix.load_or_build(load_rate_tables(data_dir), config.ROUTE_MATRIX_CACHE_DIR)
@@ -2,7 +2,30 @@
 Transport cost estimator tool.
 Estimates flight and local transport cost between origin and destination.
 """
-from typing import Any
+from typing import Any, Optional
+
+from .rate_tables import City, haversine_km, load_rate_tables, normalize_place
+from .route_graph import get_route_matrix
+
+# Fallbacks when a city is not in the rate table
+DEFAULT_FLIGHT_ONE_WAY = 5000
+DEFAULT_LOCAL_PER_DAY = 1500
+# Local transport (cabs, bikes, etc.) is estimated for a typical trip length
+LOCAL_TRANSPORT_DAYS = 4
+
+
+def _distance_fare(km: float) -> tuple[str, int]:
+    """Rough one-way fare for a pair the route graph cannot connect: road below 300 km, else flight."""
+    if km < 300:
+        return "road", max(500, int(round(km * 12, -2)))
+    return "flight", int(round(2500 + km * 4.5, -2))
+
+
+def _same_place(origin: str, destination: str, origin_city: Optional[City], dest_city: Optional[City]) -> bool:
+    """Whether origin and destination are one place: the same listed city, or the same unlisted name."""
+    if origin_city is not None or dest_city is not None:
+        return origin_city is dest_city
+    return bool(normalize_place(origin or "")) and normalize_place(origin or "") == normalize_place(destination or "")
 
 
 def transport_cost_estimator(origin: str, destination: str) -> dict[str, Any]:
@@ -15,41 +38,62 @@ def transport_cost_estimator(origin: str, destination: str) -> dict[str, Any]:
 
     Returns:
         Dict with flight estimate, local transport estimate, and total.
+        rate_source is "table" for a listed direct route, "multi_leg" for the
+        cheapest connection over several listed routes (see legs),
+        "distance_estimate" when both cities are known but not connected,
+        "same_city" (mode "local", no fare) when origin and destination are
+        the same place, and "default" when a city is not in the rate table.
     """
-    origin_lower = origin.strip().lower()
-    dest_lower = destination.strip().lower()
-
-    # Illustrative one-way flight estimates (INR) for common Indian routes
-    route_estimates = {
-        ("mumbai", "goa"): 4500,
-        ("delhi", "goa"): 6500,
-        ("bangalore", "goa"): 4000,
-        ("mumbai", "kerala"): 5500,
-        ("delhi", "kerala"): 7000,
-        ("goa", "mumbai"): 4500,
-        ("goa", "delhi"): 6500,
-        ("kerala", "mumbai"): 5500,
-    }
-    key = (origin_lower, dest_lower)
-    if key in route_estimates:
-        flight_one_way = route_estimates[key]
+    tables = load_rate_tables()
+    origin_city = tables.resolve_city(origin)
+    dest_city = tables.resolve_city(destination)
+
+    mode = "flight"
+    legs = []
+    note = None
+    if _same_place(origin, destination, origin_city, dest_city):
+        mode, flight_one_way, rate_source = "local", 0, "same_city"
+        note = "Origin and destination are the same city; only local transport is estimated."
+    elif origin_city and dest_city:
+        route = get_route_matrix().cheapest_route(origin_city, dest_city)
+        if route is not None:
+            mode, flight_one_way, legs = route["mode"], route["one_way_fare"], route["legs"]
+            rate_source = "table" if len(legs) == 1 else "multi_leg"
+        else:
+            mode, flight_one_way = _distance_fare(haversine_km(origin_city, dest_city))
+            rate_source = "distance_estimate"
     else:
-        # Default by distance proxy
-        flight_one_way = 5000
+        flight_one_way, rate_source = DEFAULT_FLIGHT_ONE_WAY, "default"
+        unknown = [name for name, city in ((origin, origin_city), (destination, dest_city)) if not city]
+        note = f"Not in the rate table: {', '.join(unknown)}; flat default fare used."
 
     flight_total = flight_one_way * 2  # round trip
-    # Local transport (cabs, bikes, etc.) per day estimate
-    local_per_day = 1500
-    local_total = local_per_day * 4  # assume 4 days typical
+    local_per_day = dest_city.local_transport_per_day if dest_city else DEFAULT_LOCAL_PER_DAY
+    local_total = local_per_day * LOCAL_TRANSPORT_DAYS
 
     total = flight_total + local_total
 
-    return {
+    result = {
         "origin": origin,
         "destination": destination,
+        "matched_origin": origin_city.name if origin_city else None,
+        "matched_destination": dest_city.name if dest_city else None,
+        "mode": mode,
         "flight_estimate_round_trip": flight_total,
         "local_transport_estimate": local_total,
         "total_transport_estimate": total,
         "currency": "INR",
+        "rate_source": rate_source,
         "breakdown": f"Flights: {flight_total} INR, Local: {local_total} INR",
     }
+    if len(legs) > 1:
+        result["legs"] = legs
+        result["route"] = " → ".join(
+            [legs[0]["from"]] + [f"{leg['to']} ({leg['mode']})" for leg in legs]
+        )
+        result["breakdown"] = (
+            f"Travel ({result['route']}): {flight_total} INR round trip, Local: {local_total} INR"
+        )
+    if note:
+        result["note"] = note
+    return result
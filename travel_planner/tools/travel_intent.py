@@ -1,9 +1,16 @@
 """
 Rule-based intent detection for the Smart Travel Planner root agent.
 Detects: greeting, incomplete request, or complete request (ready for orchestration).
+
+All patterns are compiled once at import. Each message is lower-cased and
+stripped once; keyword lists (place gazetteer, preference words, months) are
+compiled into single trie-shaped regexes so a message is scanned once per slot
+instead of once per keyword.
 """
 import re
-from typing import Any
+import string
+from datetime import date
+from typing import Any, Iterable, Optional
 
 
 # Greeting phrases (case-insensitive match after strip)
@@ -22,13 +29,263 @@ GREETING_PHRASES = {
     "hello there",
 }
 
+# Words a greeting may be addressed to ("Hey travel planner", "Hi team")
+GREETING_ADDRESSEES = ("there", "travel planner", "planner", "team", "bot", "everyone")
+
+GREETING_RESPONSE = (
+    "Hello! I'm your Smart Travel Planner ✈️\n"
+    "Please tell me your destination, travel dates, budget, and preferences."
+)
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10,
+    "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11,
+    "twelve": 12, "fourteen": 14, "fifteen": 15,
+}
+
+# Amount multipliers for Indian/English shorthand (50k, 1.5 lakh, 2 cr)
+AMOUNT_UNITS = {
+    "k": 1_000, "thousand": 1_000,
+    "l": 100_000, "lakh": 100_000, "lakhs": 100_000, "lac": 100_000, "lacs": 100_000,
+    "cr": 10_000_000, "crore": 10_000_000, "crores": 10_000_000,
+}
+
+CURRENCY_WORDS = {
+    "₹": "INR", "rs": "INR", "rs.": "INR", "inr": "INR", "rupee": "INR", "rupees": "INR",
+    "$": "USD", "usd": "USD", "dollar": "USD", "dollars": "USD",
+    "€": "EUR", "eur": "EUR", "euro": "EUR", "euros": "EUR",
+}
+
+# Preference tags and the words that imply them
+PREFERENCE_KEYWORDS = {
+    "adventure": ("adventure", "adventurous", "trek", "trekking", "hiking", "rafting",
+                  "paragliding", "scuba", "diving", "thrill"),
+    "beaches": ("beach", "beaches", "coast", "island", "islands"),
+    "culture": ("culture", "cultural", "heritage", "history", "historical", "temple",
+                "temples", "museum", "museums", "fort", "forts", "palace", "palaces"),
+    "nature": ("nature", "mountain", "mountains", "hills", "wildlife", "forest",
+               "lake", "lakes", "waterfall", "waterfalls", "scenic"),
+    "nightlife": ("nightlife", "party", "parties", "clubs", "pubs", "bars"),
+    "food": ("food", "foodie", "cuisine", "cafes", "street food"),
+    "shopping": ("shopping", "markets", "market"),
+    "relaxation": ("relax", "relaxing", "relaxation", "spa", "peaceful", "leisure"),
+    "budget-friendly": ("budget-friendly", "budget friendly", "cheap", "affordable",
+                        "backpacking"),
+    "luxury": ("luxury", "luxurious", "premium"),
+    "romantic": ("romantic", "honeymoon", "couple"),
+    "family": ("family", "kids", "children"),
+    "spiritual": ("spiritual", "pilgrimage", "yoga", "meditation"),
+}
+
+# Hotel tiers a message can ask to compare ("cheap vs comfortable"), in tier order
+TIER_KEYWORDS = {
+    "budget": ("cheap", "cheapest", "cheaper", "budget option", "budget options", "budget-friendly",
+               "budget friendly", "economy", "affordable", "backpacker"),
+    "mid": ("comfortable", "comfort", "mid-range", "midrange", "mid range", "mid-tier", "standard",
+            "moderate"),
+    "luxury": ("luxury", "luxurious", "premium", "lavish", "5-star", "five star"),
+}
+
+# Common Indian destinations recognised even without "trip to"/"in"
+PLACES = (
+    "goa", "mumbai", "delhi", "kerala", "rajasthan", "jaipur", "udaipur",
+    "bangalore", "chennai", "hyderabad", "kolkata", "manali", "rishikesh",
+    "andaman", "darjeeling", "shimla", "agra", "varanasi", "ladakh",
+)
 
-def get_travel_intent(user_message: str) -> dict[str, Any]:
+# Words that end a place name ("Goa with budget ...", "Delhi for 3 days")
+_PLACE_BOUNDARY_WORDS = {
+    "with", "for", "from", "on", "in", "under", "budget", "and", "during", "by",
+    "at", "of", "around", "within", "next", "this", "starting", "trip", "travel",
+    "tour", "vacation", "holiday", "to", "between", "via", "is", "are", "please", "then",
+}
+
+# Words that can never be a place name on their own
+_NOT_A_PLACE = _PLACE_BOUNDARY_WORDS | set(MONTHS) | set(NUMBER_WORDS) | {
+    "the", "my", "our", "me", "us", "i", "we", "you", "your", "day", "days", "night",
+    "nights", "week", "weeks", "weekend", "plan", "planning", "cheap", "luxury",
+    "family", "solo", "road", "long", "short", "quick", "business", "honeymoon",
+    "go", "going", "visit", "see", "travelling", "traveling", "help", "want", "like",
+    "need", "hey", "hi", "hello", "planner", "good", "nice", "great", "total",
+    "person", "people", "friends", "rupees", "inr", "lakh", "thousand", "dates",
+    "date", "month", "year", "somewhere", "there", "here", "it", "some",
+    "be", "have", "spend", "book", "make", "get", "take", "fly", "head", "stay",
+    "back", "return",
+}
+
+
+def _keyword_alternation(keywords: Iterable[str]) -> str:
+    """
+    Build a regex alternation for keywords shaped as a prefix trie
+    (e.g. "beach", "beaches" -> "beach(?:es)?"), so the regex engine walks each
+    shared prefix once instead of trying every keyword in turn.
+    """
+    trie: dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(branches) + ")?"
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+def _keyword_regex(keywords: Iterable[str]) -> re.Pattern[str]:
+    """Compile keywords into one word-bounded pattern capturing the keyword found."""
+    return re.compile(r"\b(" + _keyword_alternation(keywords) + r")\b")
+
+
+# Compiled patterns -------------------------------------------------------------
+
+_GREETING_RE = re.compile(
+    r"(?:" + _keyword_alternation(GREETING_PHRASES) + r")"
+    r"(?:[\s,]+(?:" + _keyword_alternation(GREETING_ADDRESSEES) + r"))?"
+    r"[\s\!\?\.\,]*"
+)
+
+_WORD = r"[a-z\u0900-\u097f]+"
+_PLACE_CANDIDATE = rf"({_WORD}(?:\s+{_WORD}){{0,2}})"
+
+# Ordered from most to least specific; the first valid candidate wins.
+_DESTINATION_RES = tuple(
+    re.compile(pattern)
+    for pattern in (
+        rf"\b(?:trip|travel|vacation|holiday|getaway|tour|journey)\s+to\s+{_PLACE_CANDIDATE}",
+        rf"\b(?:go|going|fly|flying|travel|travelling|traveling|head|heading)\s+to\s+{_PLACE_CANDIDATE}",
+        rf"\bvisit(?:ing)?\s+{_PLACE_CANDIDATE}",
+        rf"\b(?:destination|place|city)\s*(?:is|:)?\s*{_PLACE_CANDIDATE}",
+        rf"\bto\s+{_PLACE_CANDIDATE}",
+        rf"\bin\s+{_PLACE_CANDIDATE}",
+        rf"\b((?:{_WORD}\s+)?{_WORD})\s+(?:trip|travel|tour|vacation|holiday)\b",
+    )
+)
+_ORIGIN_RE = re.compile(rf"\bfrom\s+{_PLACE_CANDIDATE}")
+# Between the places of a multi-city list: "jaipur, udaipur and delhi", "goa & kerala", "agra -> delhi"
+# Countries that, right after a comma, qualify the place before them ("goa, india") rather than add a city
+_COUNTRY_QUALIFIERS = {
+    "india", "france", "italy", "japan", "thailand", "indonesia", "malaysia", "nepal",
+    "usa", "us", "uk", "united kingdom", "united states", "uae", "turkey", "spain",
+}
+_PLACE_LIST_SEP_RE = re.compile(r"\s*,\s*(?:(?:and|then)\s+)?|\s+(?:and|then)\s+|\s*(?:&|\+|->|→)\s*")
+_PLACE_CANDIDATE_RE = re.compile(_PLACE_CANDIDATE)
+_PLACES_RE = _keyword_regex(PLACES)
+
+_PREFERENCE_TAGS = {
+    keyword: tag for tag, keywords in PREFERENCE_KEYWORDS.items() for keyword in keywords
+}
+_PREFERENCE_RE = _keyword_regex(_PREFERENCE_TAGS)
+
+_TIER_TAGS = {keyword: tier for tier, keywords in TIER_KEYWORDS.items() for keyword in keywords}
+_TIER_RE = _keyword_regex(_TIER_TAGS)
+# Two tiers only ask for variants when compared ("cheap vs comfortable", not "cheap but comfortable")
+_COMPARE_RE = re.compile(
+    r"\b(?:vs|versus|or|compare|comparison|options?|variants?|alternatives?|side by side)\b"
+)
+# "budget" is only a tier next to another option ("budget or premium"), not in "budget 50000"
+_BUDGET_TIER_RE = re.compile(r"\bbudget\s+(?:vs|versus|or|and)\s|\b(?:vs|versus|or|and)\s+budget\b(?![\s:]*\d)")
+_ALL_TIERS_RE = re.compile(
+    r"\b(?:all|each|every|different|three|3)\s+(?:tiers|price levels|price ranges|budget levels|options|variants)\b"
+)
+
+_NUMBER = r"(\d+|" + _keyword_alternation(NUMBER_WORDS) + r")"
+_DURATION_RE = re.compile(rf"\b{_NUMBER}\s*-?\s*(day|night|week)s?\b")
+# Preferred duration unit when a message mentions several ("3 nights 4 days")
+_DURATION_PRIORITY = {"day": 0, "night": 1, "week": 2}
+
+_MONTH = r"(" + _keyword_alternation(MONTHS) + r")\b\.?"
+_RANGE_SEP = r"\s*(?:-|–|to|till|until)\s*"
+_ORDINAL = r"(?:st|nd|rd|th)?"
+# "12/03/2026 to 15/03/2026" (day first)
+_NUMERIC_RANGE_RE = re.compile(
+    rf"\b(\d{{1,2}})[/-](\d{{1,2}})[/-](\d{{2,4}}){_RANGE_SEP}(\d{{1,2}})[/-](\d{{1,2}})[/-](\d{{2,4}})\b"
+)
+# "28 dec to 2 jan", "20 to 25 december", "20-25 dec"
+_DAY_MONTH_RANGE_RE = re.compile(
+    rf"\b(\d{{1,2}}){_ORDINAL}(?:\s+{_MONTH})?{_RANGE_SEP}(\d{{1,2}}){_ORDINAL}\s+{_MONTH}"
+)
+# "dec 20 to 25", "dec 28 - jan 2"
+_MONTH_DAY_RANGE_RE = re.compile(
+    rf"\b{_MONTH}\s*(\d{{1,2}}){_ORDINAL}{_RANGE_SEP}(?:{_MONTH}\s*)?(\d{{1,2}}){_ORDINAL}\b"
+)
+_DATE_HINT_RE = re.compile(
+    r"\b(next week|next month|this weekend|next weekend|travel dates|dates?"
+    r"|january|february|march|april|may|june|july|august|september|october"
+    r"|november|december|\d{1,2}[-/]\d{1,2}[-/]\d{2,4})\b"
+)
+
+# One pass over every number in the message; the groups around it decide
+# whether it is an amount: "budget ₹50,000", "Rs. 1.5 lakh", "50k", "2000 dollars".
+_AMOUNT_RE = re.compile(
+    r"(?P<kw>\bbudget\s*(?:of|is|:|around|about|~|upto|up to|under|within)?\s*)?"
+    r"(?P<sym>₹|\$|€|\brs\b\.?|\binr\b|\busd\b|\beur\b)?\s*"
+    r"(?<![\d/-])(?P<num>\d[\d,]*(?:\.\d+)?)(?![\d/])"
+    r"(?:\s*(?P<unit>" + _keyword_alternation(AMOUNT_UNITS) + r")\b)?"
+    r"(?:\s*(?P<word>rupees?|inr|rs\b\.?|usd|dollars?|euros?|eur)\b)?"
+)
+
+# A plain 19xx/20xx right after "in", a month or a day of the month is a year, not a budget:
+# "goa in 2024", "december 2025", "march 15, 2026"
+_YEAR_RE = re.compile(r"(?:19|20)\d\d")
+_BEFORE_YEAR_RE = re.compile(
+    r"(?:\b(?:in|of|year|since|by|during|until|till)|\b" + _MONTH + r"|\b\d{1,2}" + _ORDINAL + r",?)\s*$"
+)
+
+
+def _result(
+    intent: str,
+    slots: dict[str, Any],
+    missing: Optional[list[str]] = None,
+    suggestion: str = "",
+) -> dict[str, Any]:
+    result = {
+        "intent": intent,
+        "missing_fields": missing or [],
+        "clarifying_suggestion": suggestion,
+        "has_destination": slots["destination"] is not None,
+        "has_days_or_dates": (
+            slots["days"] is not None
+            or slots["start_date"] is not None
+            or slots["date_hint"] is not None
+        ),
+        "has_budget": slots["budget"] is not None,
+        "slots": slots,
+    }
+    if intent == "greeting":
+        result = {"intent": intent, "greeting_response": GREETING_RESPONSE, **result}
+    return result
+
+
+def get_travel_intent(user_message: str, previous_slots: Optional[dict[str, Any]] = None) -> dict[str, Any]:
     """
     Rule-based intent detection. Use this before triggering the travel planning pipeline.
 
     Args:
         user_message: The user's latest message (e.g. from the conversation).
+        previous_slots: Slots of the trip already under discussion: details
+            accumulated from earlier turns, or the last planned trip. When the
+            message mentions any trip detail it is merged onto them (see
+            merge_slots), so "Goa trip", "5 days", "40k" is complete on the
+            third turn and "make it 4 days instead" after a plan is complete
+            too. While the earlier details are still incomplete they are kept
+            even if the message adds nothing, so the clarifying question only
+            asks for what is still missing.
 
     Returns:
         Dict with:
@@ -37,90 +294,40 @@ def get_travel_intent(user_message: str) -> dict[str, Any]:
         - missing_fields: (if incomplete) list of missing required fields
         - clarifying_suggestion: (if incomplete) suggested question to ask
         - has_destination, has_days_or_dates, has_budget: booleans for validation
+        - slots: parsed, normalized values (see extract_slots) so downstream agents
+          do not have to re-extract destination, days and budget from free text
     """
     if not user_message or not isinstance(user_message, str):
-        return {
-            "intent": "incomplete",
-            "missing_fields": ["destination", "number of days or dates", "budget"],
-            "clarifying_suggestion": "Please tell me where you want to go, for how many days (or which dates), and your budget.",
-            "has_destination": False,
-            "has_days_or_dates": False,
-            "has_budget": False,
-        }
+        return _result(
+            "incomplete",
+            _empty_slots(),
+            ["destination", "number of days or dates", "budget"],
+            "Please tell me where you want to go, for how many days (or which dates), and your budget.",
+        )
 
     text = user_message.strip().lower()
-    if len(text) > 200:
-        text_for_greeting = text[:200]
-    else:
-        text_for_greeting = text
 
     # 1) Greeting detection: short message that is only a greeting
-    text_normalized = re.sub(r"[\!\?\.\,]+$", "", text).strip()
-    if len(text.split()) <= 4:
-        if text in GREETING_PHRASES or text_for_greeting in GREETING_PHRASES:
-            return {
-                "intent": "greeting",
-                "greeting_response": (
-                    "Hello! I'm your Smart Travel Planner ✈️\n"
-                    "Please tell me your destination, travel dates, budget, and preferences."
-                ),
-                "missing_fields": [],
-                "clarifying_suggestion": "",
-                "has_destination": False,
-                "has_days_or_dates": False,
-                "has_budget": False,
-            }
-        if text_normalized in GREETING_PHRASES:
-            return {
-                "intent": "greeting",
-                "greeting_response": (
-                    "Hello! I'm your Smart Travel Planner ✈️\n"
-                    "Please tell me your destination, travel dates, budget, and preferences."
-                ),
-                "missing_fields": [],
-                "clarifying_suggestion": "",
-                "has_destination": False,
-                "has_days_or_dates": False,
-                "has_budget": False,
-            }
-        # Single word that looks like greeting
-        if text_normalized in ("hi", "hey", "hello"):
-            return {
-                "intent": "greeting",
-                "greeting_response": (
-                    "Hello! I'm your Smart Travel Planner ✈️\n"
-                    "Please tell me your destination, travel dates, budget, and preferences."
-                ),
-                "missing_fields": [],
-                "clarifying_suggestion": "",
-                "has_destination": False,
-                "has_days_or_dates": False,
-                "has_budget": False,
-            }
+    if len(text) <= 40 and _GREETING_RE.fullmatch(text):
+        return _result("greeting", _empty_slots())
 
     # 2) Extract required fields (simple rule-based)
-    has_destination = _has_destination(text, user_message)
-    has_days_or_dates = _has_days_or_dates(text, user_message)
-    has_budget = _has_budget(text, user_message)
+    slots = _extract_slots_normalized(text)
+    if previous_slots and (has_slot_values(slots) or not _is_complete(previous_slots)):
+        slots = merge_slots(previous_slots, slots)
+    result = _result("complete", slots)
 
     # 3) Complete: all required fields present
-    if has_destination and has_days_or_dates and has_budget:
-        return {
-            "intent": "complete",
-            "missing_fields": [],
-            "clarifying_suggestion": "",
-            "has_destination": True,
-            "has_days_or_dates": True,
-            "has_budget": True,
-        }
+    if result["has_destination"] and result["has_days_or_dates"] and result["has_budget"]:
+        return result
 
     # 4) Incomplete: build missing list and suggestion
     missing = []
-    if not has_destination:
+    if not result["has_destination"]:
         missing.append("destination (e.g. city or region)")
-    if not has_days_or_dates:
+    if not result["has_days_or_dates"]:
         missing.append("number of days or travel dates")
-    if not has_budget:
+    if not result["has_budget"]:
         missing.append("budget (e.g. in INR or your currency)")
 
     suggestion = (
@@ -128,70 +335,360 @@ def get_travel_intent(user_message: str) -> dict[str, Any]:
         + "; ".join(missing)
         + ". Please share these so I can create your itinerary."
     )
+    return _result("incomplete", slots, missing, suggestion)
+
+
+def classify_many(messages: Iterable[str]) -> list[dict[str, Any]]:
+    """
+    Classify a batch of messages (e.g. a bulk transcript import).
+
+    Identical messages (after strip/lower-casing) are classified once; every
+    entry in the returned list is still an independent dict, in input order.
+    """
+    seen: dict[Any, dict[str, Any]] = {}
+    results = []
+    for message in messages:
+        key = message.strip().lower() if isinstance(message, str) else None
+        cached = seen.get(key)
+        if cached is None:
+            cached = seen[key] = get_travel_intent(message)
+        results.append(_copy_result(cached))
+    return results
+
+
+def _copy_result(result: dict[str, Any]) -> dict[str, Any]:
+    slots = dict(
+        result["slots"],
+        destinations=list(result["slots"]["destinations"]),
+        preferences=list(result["slots"]["preferences"]),
+        variants=list(result["slots"]["variants"]),
+    )
+    return dict(result, missing_fields=list(result["missing_fields"]), slots=slots)
 
+
+# Slot extraction ------------------------------------------------------------
+
+def _empty_slots() -> dict[str, Any]:
     return {
-        "intent": "incomplete",
-        "missing_fields": missing,
-        "clarifying_suggestion": suggestion,
-        "has_destination": has_destination,
-        "has_days_or_dates": has_days_or_dates,
-        "has_budget": has_budget,
+        "destination": None,
+        "destinations": [],
+        "origin": None,
+        "days": None,
+        "nights": None,
+        "start_date": None,
+        "end_date": None,
+        "date_hint": None,
+        "budget": None,
+        "currency": None,
+        "preferences": [],
+        "variants": [],
     }
 
 
-def _has_destination(text_lower: str, original: str) -> bool:
+# Slots that change together: a new duration replaces the old dates and vice versa
+_SLOT_GROUPS = (
+    ("destination", "destinations"),
+    ("origin",),
+    ("days", "nights", "start_date", "end_date", "date_hint"),
+    ("budget", "currency"),
+    ("preferences",),
+    ("variants",),
+)
+
+
+def has_slot_values(slots: dict[str, Any]) -> bool:
+    """True if any trip detail is set."""
+    return any(slots.get(key) for group in _SLOT_GROUPS for key in group)
+
+
+def _is_complete(slots: dict[str, Any]) -> bool:
+    return bool(
+        slots.get("destination")
+        and (slots.get("days") or slots.get("start_date") or slots.get("date_hint"))
+        and slots.get("budget")
+    )
+
+
+def merge_slots(previous: Optional[dict[str, Any]], new: dict[str, Any]) -> dict[str, Any]:
+    """
+    Apply the slots of a follow-up message on top of earlier ones. Each group
+    of related slots the new message mentions (destination, origin, duration
+    or dates, budget and currency, preferences) replaces the earlier group as
+    a whole; the rest is kept. A new destination also drops the earlier
+    preferences, which were about the other place.
+    """
+    merged = {**_empty_slots(), **(previous or {})}
+    if new.get("destination") and new["destination"] != merged["destination"]:
+        merged["preferences"] = []
+    for group in _SLOT_GROUPS:
+        if any(new.get(key) for key in group):
+            merged.update({key: new.get(key) for key in group})
+    merged["destinations"] = list(merged["destinations"] or [])
+    merged["preferences"] = list(merged["preferences"] or [])
+    merged["variants"] = list(merged["variants"] or [])
+    return merged
+
+
+def extract_slots(user_message: str) -> dict[str, Any]:
+    """
+    Parse trip details from a free-text message into normalized values.
+
+    Returns a dict with:
+        destination / origin: title-cased place names or None
+        destinations: the cities of a multi-city trip in visiting order
+            ("Jaipur, Udaipur and Delhi" -> ["Jaipur", "Udaipur", "Delhi"],
+            destination "Jaipur, Udaipur, Delhi"); [] for a single destination
+        days / nights: ints or None ("3 nights" -> nights=3, days=4)
+        start_date / end_date: ISO dates when a date range is given, else None
+        date_hint: loose timing phrase ("next week", "january") or None
+        budget: amount as a float (e.g. "1.5 lakh" -> 150000.0) or None
+        currency: "INR" | "USD" | "EUR" (INR when not stated) or None
+        preferences: sorted list of preference tags (e.g. ["adventure", "beaches"])
+        variants: hotel tiers to plan side by side ("cheap vs comfortable" ->
+            ["budget", "mid"], "all tiers" -> ["budget", "mid", "luxury"]);
+            one tier ("luxury") or [] for a single plan
+    """
+    if not user_message or not isinstance(user_message, str):
+        return _empty_slots()
+    return _extract_slots_normalized(user_message.strip().lower())
+
+
+def _extract_slots_normalized(text: str) -> dict[str, Any]:
+    """extract_slots for text that is already stripped and lower-cased."""
+    slots = _empty_slots()
+    slots["origin"] = _extract_origin(text)
+    slots["destination"] = _extract_destination(text, slots["origin"])
+    if slots["destination"]:
+        cities = _extract_destinations(text, slots["destination"], slots["origin"])
+        if len(cities) > 1:
+            slots["destinations"] = cities
+            slots["destination"] = ", ".join(cities)
+
+    days, nights = _extract_duration(text)
+    start, end = _extract_date_range(text)
+    if start and end:
+        slots["start_date"], slots["end_date"] = start.isoformat(), end.isoformat()
+        if days is None:
+            days = (end - start).days + 1
+            nights = days - 1
+    slots["days"], slots["nights"] = days, nights
+    if days is None and start is None:
+        match = _DATE_HINT_RE.search(text)
+        slots["date_hint"] = match.group(1) if match else None
+
+    slots["budget"], slots["currency"] = _extract_budget(text, has_duration=days is not None)
+    slots["preferences"] = sorted(
+        {_PREFERENCE_TAGS[m.group(1)] for m in _PREFERENCE_RE.finditer(text)}
+    )
+    slots["variants"] = _extract_variants(text)
+    return slots
+
+
+def _extract_variants(text_lower: str) -> list[str]:
+    """
+    Tiers to compare: two or more tiers named with a comparison word, or "all
+    tiers". A single tier ("make it luxury") is returned on its own, so as a
+    follow-up it replaces an earlier comparison with a single plan.
+    """
+    tiers = {_TIER_TAGS[m.group(1)] for m in _TIER_RE.finditer(text_lower)}
+    if _BUDGET_TIER_RE.search(text_lower):
+        tiers.add("budget")
+    if _ALL_TIERS_RE.search(text_lower):
+        return list(TIER_KEYWORDS)
+    if len(tiers) == 1 or (tiers and _COMPARE_RE.search(text_lower)):
+        return [tier for tier in TIER_KEYWORDS if tier in tiers]
+    return []
+
+
+def _clean_place(candidate: str) -> Optional[str]:
+    """Trim a captured phrase to the place name, or None if it is not one."""
+    words = []
+    for word in candidate.split():
+        if word in _PLACE_BOUNDARY_WORDS:
+            break
+        words.append(word)
+    while words and words[0] in _NOT_A_PLACE:
+        words.pop(0)
+    if not words or words[-1] in _NOT_A_PLACE or len(words[0]) < 2:
+        return None
+    return string.capwords(" ".join(words))
+
+
+def _extract_destination(text_lower: str, origin: Optional[str] = None) -> Optional[str]:
     """Heuristic: trip to X, in X, X trip, visit X, destination X, goa, mumbai, etc."""
-    # "trip to Goa", "go to Kerala", "visit Mumbai", "in Goa", "Goa trip", "destination: Delhi"
-    if re.search(r"\b(trip to|go to|visit|in|to)\s+[a-z\u0900-\u097f]+", text_lower):
-        return True
-    if re.search(r"\b(destination|place|city)\s*[:\s]*[a-z\u0900-\u097f]+", text_lower):
-        return True
+    for pattern in _DESTINATION_RES:
+        for match in pattern.finditer(text_lower):
+            place = _clean_place(match.group(1))
+            if place and place != origin:
+                return place
     # Standalone place names (common Indian destinations)
-    places = (
-        "goa", "mumbai", "delhi", "kerala", "rajasthan", "jaipur", "udaipur",
-        "bangalore", "chennai", "hyderabad", "kolkata", "manali", "rishikesh",
-        "andaman", "darjeeling", "shimla", "agra", "varanasi", "ladakh",
-    )
-    for p in places:
-        if p in text_lower:
-            return True
-    # "X trip" or "X travel" where X is a place name (at least 3 chars, not stopwords)
-    if re.search(r"\b([a-z\u0900-\u097f]{3,})\s+(trip|travel)\b", text_lower):
-        return True
-    return False
-
-
-def _has_days_or_dates(text_lower: str, original: str) -> bool:
-    """Heuristic: N day(s), N-day, for N days, dates, next week, etc."""
-    # "4 days", "4-day", "for 5 days", "3 nights"
-    if re.search(r"\b(\d+)\s*[-]?\s*(day|night)s?\b", text_lower):
-        return True
-    if re.search(r"\b(for|of)\s+\d+\s+(day|night)", text_lower):
-        return True
-    # "dec 25", "next week", "january", "dates"
-    if re.search(r"\b(next week|next month|dates?|travel dates)\b", text_lower):
-        return True
-    if re.search(r"\b(january|february|march|april|may|june|july|august|september|october|november|december)\b", text_lower):
-        return True
-    if re.search(r"\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b", original):
-        return True
-    return False
-
-
-def _has_budget(text_lower: str, original: str) -> bool:
-    """Heuristic: ₹X, INR X, Rs. X, X budget, X rupees."""
-    # ₹50000, Rs. 50000, INR 50000, 50k, 50,000
-    if re.search(r"[₹rs\.\s]*(inr)?\s*[\d,]+(\s*(k|thousand|lakh|lac|rupees?|inr))?", text_lower):
-        return True
-    if re.search(r"\bbudget\s*[:\s]*[\d,]+", text_lower):
-        return True
-    if re.search(r"[\d,]+\s*(k|thousand|lakh|lac|rupees?|inr)\b", text_lower):
-        return True
-    # Plain number that looks like budget (e.g. 50000)
-    if re.search(r"\b(\d{4,6})\b", original.replace(",", "")):
-        # Could be budget if context suggests (e.g. "50,000" near "trip")
-        if "budget" in text_lower or "rupee" in text_lower or "inr" in text_lower or "₹" in original or "rs" in text_lower:
-            return True
-        if re.search(r"\d+\s*(day|night)", text_lower) and re.search(r"\b\d{4,}\b", original.replace(",", "")):
-            return True
-    return False
+    for match in _PLACES_RE.finditer(text_lower):
+        place = match.group(1).title()
+        if place != origin:
+            return place
+    return None
+
+
+def _extract_destinations(text_lower: str, first: str, origin: Optional[str] = None) -> list[str]:
+    """
+    The places listed right after the destination ("jaipur, udaipur and
+    delhi", "goa & kerala"), starting with it. A listed word that is a
+    preference ("goa and beaches") or the origin ends the list, and so does a
+    country after a comma ("goa, india" is Goa).
+    """
+    best = [first]
+    for match in re.finditer(rf"\b{re.escape(first.lower())}\b", text_lower):
+        cities, pos = [first], match.end()
+        while True:
+            sep = _PLACE_LIST_SEP_RE.match(text_lower, pos)
+            candidate = _PLACE_CANDIDATE_RE.match(text_lower, sep.end()) if sep else None
+            place = _clean_place(candidate.group(1)) if candidate else None
+            if not place or place == origin or place in cities:
+                break
+            if sep.group().strip().startswith(",") and place.lower() in _COUNTRY_QUALIFIERS:
+                break
+            words = place.lower().split()
+            while words and words[-1] in _PREFERENCE_TAGS:
+                words.pop()  # "kerala beaches"
+            if not words or not text_lower.startswith(" ".join(words), candidate.start()):
+                break
+            cities.append(string.capwords(" ".join(words)))
+            pos = candidate.start() + len(" ".join(words))
+        if len(cities) > len(best):
+            best = cities
+    return best
+
+
+def _extract_origin(text_lower: str) -> Optional[str]:
+    """Heuristic: "from Delhi", "starting from Mumbai"."""
+    for match in _ORIGIN_RE.finditer(text_lower):
+        place = _clean_place(match.group(1))
+        if place:
+            return place
+    return None
+
+
+def _to_int(token: str) -> Optional[int]:
+    if token.isdigit():
+        return int(token)
+    return NUMBER_WORDS.get(token)
+
+
+def _extract_duration(text_lower: str) -> tuple[Optional[int], Optional[int]]:
+    """Heuristic: N day(s), N-day, N nights, a week. Returns (days, nights)."""
+    best: Optional[tuple[int, str, int]] = None
+    for match in _DURATION_RE.finditer(text_lower):
+        count = _to_int(match.group(1))
+        unit = match.group(2)
+        if count and (best is None or _DURATION_PRIORITY[unit] < best[0]):
+            best = (_DURATION_PRIORITY[unit], unit, count)
+    if best is None:
+        return None, None
+    _, unit, count = best
+    if unit == "day":
+        return count, count - 1
+    if unit == "night":
+        return count + 1, count
+    return count * 7, count * 7 - 1
+
+
+def _make_date(day: int, month: int, year: Optional[int]) -> Optional[date]:
+    """Build a date; without a year, use the next occurrence from today."""
+    today = date.today()
+    try:
+        if year is not None:
+            return date(year + 2000 if year < 100 else year, month, day)
+        candidate = date(today.year, month, day)
+        return candidate if candidate >= today else date(today.year + 1, month, day)
+    except ValueError:
+        return None
+
+
+def _extract_date_range(text_lower: str) -> tuple[Optional[date], Optional[date]]:
+    """
+    Heuristic date ranges: "12/03/2026 to 15/03/2026" (day first), "20-25 dec",
+    "28 dec to 2 jan", "dec 20 to 25", "dec 28 - jan 2".
+    """
+    if not any(ch.isdigit() for ch in text_lower):
+        return None, None
+
+    match = _NUMERIC_RANGE_RE.search(text_lower)
+    if match:
+        d1, m1, y1, d2, m2, y2 = (int(g) for g in match.groups())
+        start, end = _make_date(d1, m1, y1), _make_date(d2, m2, y2)
+        if start and end and end >= start:
+            return start, end
+
+    match = _DAY_MONTH_RANGE_RE.search(text_lower)
+    if match:
+        d1, m1, d2, m2 = match.groups()
+        return _date_pair(int(d1), MONTHS[m1 or m2], int(d2), MONTHS[m2])
+
+    match = _MONTH_DAY_RANGE_RE.search(text_lower)
+    if match:
+        m1, d1, m2, d2 = match.groups()
+        return _date_pair(int(d1), MONTHS[m1], int(d2), MONTHS[m2 or m1])
+    return None, None
+
+
+def _date_pair(d1: int, m1: int, d2: int, m2: int) -> tuple[Optional[date], Optional[date]]:
+    start = _make_date(d1, m1, None)
+    if start is None:
+        return None, None
+    end = _make_date(d2, m2, start.year)
+    if end is not None and end < start:
+        # Range crosses the new year ("28 dec to 2 jan")
+        end = _make_date(d2, m2, start.year + 1)
+    if end is None:
+        return None, None
+    return start, end
+
+
+def _parse_amount(number: str, unit: Optional[str]) -> Optional[float]:
+    try:
+        value = float(number.replace(",", ""))
+    except ValueError:
+        return None
+    if unit:
+        value *= AMOUNT_UNITS[unit]
+    return value if value > 0 else None
+
+
+def _extract_budget(
+    text_lower: str, has_duration: bool = False
+) -> tuple[Optional[float], Optional[str]]:
+    """
+    Heuristic: ₹50,000, Rs. 50000, INR 50000, 50k, 1.5 lakh, 50000 rupees,
+    budget 20000, $2000. Returns (amount, currency); currency defaults to INR.
+
+    Preference when several numbers qualify: currency symbol/code before the
+    amount, then a multiplier or currency word after it, then "budget N", then
+    (only next to a trip duration) a plain 4-6 digit number that is not a year
+    ("in 2024", "december 2025").
+    """
+    best: Optional[tuple[int, float, str]] = None
+    for match in _AMOUNT_RE.finditer(text_lower):
+        symbol, unit, word = match.group("sym"), match.group("unit"), match.group("word")
+        if symbol:
+            rank = 0
+        elif unit or word:
+            rank = 1
+        elif match.group("kw"):
+            rank = 2
+        elif has_duration and 4 <= len(match.group("num").replace(",", "")) <= 6:
+            if _YEAR_RE.fullmatch(match.group("num")) and _BEFORE_YEAR_RE.search(text_lower, 0, match.start("num")):
+                continue
+            rank = 3
+        else:
+            continue
+        if best is not None and best[0] <= rank:
+            continue
+        amount = _parse_amount(match.group("num"), unit)
+        if amount:
+            currency = CURRENCY_WORDS.get((symbol or word or "").strip(), "INR")
+            best = (rank, amount, currency)
+            if rank == 0:
+                break
+    if best is None:
+        return None, None
+    return best[1], best[2]
@@ -0,0 +1,152 @@
+"""
+Plan variants: one trip at several hotel tiers, side by side.
+For "cheap vs comfortable" requests (slots["variants"]) the attractions are
+found once and shared. Accommodation (hotel_cost_estimator at each tier),
+budget allocation and the itinerary write-up then run per tier, and the tiers
+are merged into one comparison. The cost tools are local and instant and the
+per-tier write-ups run concurrently, so a comparison takes about as long as a
+single plan instead of one pipeline run per tier.
+"""
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from travel_planner.handoff import hotel_quote_record, transport_quote_record
+from travel_planner.multi_city import DEFAULT_ORIGIN
+from travel_planner.replanning import inputs_key
+from travel_planner.sub_agents.itinerary_agent import TIER_LABELS
+from travel_planner.timing import start_stage_timer, stop_stage_timer
+from travel_planner.tools import budget_allocator, hotel_cost_estimator, itinerary_generator, transport_cost_estimator
+
+# Days assumed when the request gives only a loose date ("next month")
+DEFAULT_DAYS = 3
+
+
+def quote_variants(
+    destination: str, days: int, budget: float, tiers: list[str], origin: Optional[str] = None
+) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """
+    The shared transport_quote record and, per tier, its hotel_quote record
+    and budget_allocator result against the same transport cost.
+    """
+    transport = transport_quote_record(transport_cost_estimator(origin or DEFAULT_ORIGIN, destination))
+    variants = {}
+    for tier in tiers:
+        hotel = hotel_quote_record(hotel_cost_estimator(destination, days, budget, tier=tier))
+        variants[tier] = {
+            "hotel_quote": hotel.model_dump(exclude_none=True),
+            "budget_allocation": budget_allocator(budget, hotel.total, transport.total),
+        }
+    return transport.model_dump(exclude_none=True), variants
+
+
+def comparison_table(transport: dict[str, Any], variants: dict[str, dict[str, Any]]) -> str:
+    """Markdown table of the tiers' costs, one column per tier."""
+    tiers = list(variants)
+
+    def row(label: str, cell) -> str:
+        return f"| {label} | " + " | ".join(cell(variants[tier]) for tier in tiers) + " |"
+
+    currency = transport.get("currency", "INR")
+    lines = [
+        "| | " + " | ".join(TIER_LABELS[tier] for tier in tiers) + " |",
+        "| --- |" + " --- |" * len(tiers),
+        row("Hotel per night", lambda v: f"~{v['hotel_quote']['per_night']} {currency}"),
+        row("Hotel total", lambda v: f"{v['hotel_quote']['total']} {currency}"),
+        row("Transport", lambda v: f"{transport['total']} {currency}"),
+        row("Left for activities & food", lambda v: f"{round(v['budget_allocation']['remaining_budget'])} {currency}"),
+        row("Within budget", lambda v: "Yes" if v["budget_allocation"]["within_budget"] else "No"),
+    ]
+    return "\n".join(lines)
+
+
+class TierPlanStage(BaseAgent):
+    """Runs one tier's plan writer when that tier was requested (state["variants"])."""
+
+    agent: BaseAgent
+    tier: str
+
+    def __init__(self, agent: BaseAgent, tier: str, **kwargs):
+        super().__init__(name=f"TierPlan_{tier}", agent=agent, tier=tier, sub_agents=[agent], **kwargs)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        if self.tier not in (ctx.session.state.get("variants") or ()):
+            return
+        async for event in self.agent.run_async(ctx):
+            yield event
+
+
+class TierVariantsStage(BaseAgent):
+    """
+    Plans the tiers of state["variants"] against the shared attraction stage.
+
+    Publishes the tiers' quotes first (tier_variants, transport_quote,
+    hotel_estimate / transport_estimate text and the variants_itinerary every
+    tier shares), then runs the requested tier plan writers concurrently and
+    publishes final_plan: the comparison table followed by each tier's plan.
+
+    The single-plan fingerprints of the outputs it overwrites are cleared so
+    a later single-plan follow-up never reuses them (see replanning.py).
+    """
+
+    fan_out: BaseAgent
+
+    def __init__(self, name: str, tier_agents: dict[str, LlmAgent], **kwargs):
+        fan_out = ParallelAgent(
+            name="TierFanOut",
+            description="Writes each requested tier's plan concurrently.",
+            sub_agents=[TierPlanStage(agent, tier) for tier, agent in tier_agents.items()],
+            before_agent_callback=start_stage_timer,
+            after_agent_callback=stop_stage_timer,
+        )
+        super().__init__(name=name, fan_out=fan_out, sub_agents=[fan_out], **kwargs)
+
+    def _event(self, ctx: InvocationContext, state_delta: dict[str, Any], text: Optional[str] = None) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]) if text else None,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        tiers = [tier for tier in TIER_LABELS if tier in (state.get("variants") or ())]
+        destination = state.get("destination") or ""
+        days = int(state.get("days") or DEFAULT_DAYS)
+        budget = float(state.get("budget") or 0)
+        transport, variants = quote_variants(destination, days, budget, tiers, state.get("origin"))
+        shortlist = state.get("attraction_shortlist")
+        itinerary = itinerary_generator(destination, shortlist["names"] if shortlist else [], days)
+
+        stale = {inputs_key(key): None for key in ("hotel_estimate", "transport_estimate", "final_plan")}
+        yield self._event(
+            ctx,
+            {
+                **stale,
+                "hotel_quote": None,
+                "transport_quote": transport,
+                "tier_variants": variants,
+                "variants_itinerary": itinerary,
+                "hotel_estimate": "\n".join(
+                    f"{TIER_LABELS[tier]}: {v['hotel_quote']['tier']} tier @ ~{v['hotel_quote']['per_night']} "
+                    f"INR/night x {days} nights = {v['hotel_quote']['total']} INR"
+                    for tier, v in variants.items()
+                ),
+                "transport_estimate": f"{transport['origin']} → {transport['destination']} ({transport['mode']}): "
+                f"{transport['round_trip']} INR round trip, local {transport['local']} INR, total {transport['total']} INR",
+            },
+        )
+
+        async for event in self.fan_out.run_async(ctx):
+            yield event
+
+        state = ctx.session.state
+        sections = [f"## Options compared\n\n{comparison_table(transport, variants)}"]
+        sections += [f"# {TIER_LABELS[tier]}\n\n{state.get(f'final_plan_{tier}') or ''}".strip() for tier in tiers]
+        plan = "\n\n".join(sections)
+        yield self._event(ctx, {"final_plan": plan}, text=plan)